@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import (
+    CinemaDailySales,
+    CinemaSeatDemand,
+    CityDailySales,
+    MovieDailySales,
+    SlotSales,
+)
+
+admin.site.register(SlotSales)
+admin.site.register(CinemaDailySales)
+admin.site.register(MovieDailySales)
+admin.site.register(CityDailySales)
+admin.site.register(CinemaSeatDemand)
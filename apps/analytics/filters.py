@@ -0,0 +1,42 @@
+from django_filters import rest_framework as filters
+
+from .models import CinemaDailySales, CityDailySales, MovieDailySales, SlotSales
+
+
+class SalesRollupFilter(filters.FilterSet):
+    start = filters.DateFilter(field_name="date", lookup_expr="gte")
+    end = filters.DateFilter(field_name="date", lookup_expr="lte")
+
+
+class SlotSalesFilter(SalesRollupFilter):
+    cinema = filters.NumberFilter(field_name="cinema_id")
+    movie = filters.NumberFilter(field_name="movie_id")
+    city = filters.NumberFilter(field_name="city_id")
+
+    class Meta:
+        model = SlotSales
+        fields = ["start", "end", "cinema", "movie", "city"]
+
+
+class CinemaDailySalesFilter(SalesRollupFilter):
+    cinema = filters.NumberFilter(field_name="cinema_id")
+
+    class Meta:
+        model = CinemaDailySales
+        fields = ["start", "end", "cinema"]
+
+
+class MovieDailySalesFilter(SalesRollupFilter):
+    movie = filters.NumberFilter(field_name="movie_id")
+
+    class Meta:
+        model = MovieDailySales
+        fields = ["start", "end", "movie"]
+
+
+class CityDailySalesFilter(SalesRollupFilter):
+    city = filters.NumberFilter(field_name="city_id")
+
+    class Meta:
+        model = CityDailySales
+        fields = ["start", "end", "city"]
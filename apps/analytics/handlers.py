@@ -0,0 +1,30 @@
+from apps.base.outbox import handles
+
+from .heatmap import record_seat_demand
+from .rollups import record_booking, record_cancellation
+
+
+@handles("booking.created")
+def record_booking_sales(payload):
+    """
+    Adds a new booking to the sales rollups and seat demand of its slot.
+    """
+    seats = [tuple(seat) for seat in payload["seats"]]
+
+    record_booking(payload["slot_id"], len(seats), payload["price"])
+    record_seat_demand(payload["slot_id"], seats)
+
+
+@handles("booking.cancelled")
+def record_cancellation_sales(payload):
+    """
+    Moves cancelled bookings of a slot from its sales to its cancellations
+    and removes their seats from the seat demand. Keyed by slot, so always
+    delivered after the events of the bookings it cancels.
+    """
+    seats = [tuple(seat) for seat in payload["seats"]]
+
+    record_cancellation(
+        payload["slot_id"], len(seats), payload["price"], len(payload["booking_ids"])
+    )
+    record_seat_demand(payload["slot_id"], seats, -1)
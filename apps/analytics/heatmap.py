@@ -0,0 +1,186 @@
+import sys
+from array import array
+from datetime import datetime, time, timedelta
+from itertools import chain
+from operator import add
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.bookings.models import ArchivedSeat, Booking, Seat
+from apps.slots.models import Slot
+
+from .models import CinemaSeatDemand
+
+# Unsigned 32 bit counters, stored as 4 bytes each whatever the platform's
+# int and long sizes
+COUNT_TYPECODE = next(
+    (typecode for typecode in ("I", "L") if array(typecode).itemsize == 4), None
+)
+if COUNT_TYPECODE is None:
+    raise ImportError("No 4 byte unsigned array typecode on this platform")
+
+
+def unpack_counts(data):
+    counts = array(COUNT_TYPECODE)
+    counts.frombytes(bytes(data))
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return counts
+
+
+def pack_counts(counts):
+    if sys.byteorder == "big":
+        counts = array(COUNT_TYPECODE, counts)
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def empty_counts(rows, seats_per_row):
+    return array(COUNT_TYPECODE, [0]) * (rows * seats_per_row)
+
+
+def reshape_counts(counts, rows, seats_per_row, new_rows, new_seats_per_row):
+    """
+    Moves counts to a new cinema layout, keeping the seats present in both.
+    """
+    if (rows, seats_per_row) == (new_rows, new_seats_per_row):
+        return counts
+
+    reshaped = empty_counts(new_rows, new_seats_per_row)
+    width = min(seats_per_row, new_seats_per_row)
+
+    for row in range(min(rows, new_rows)):
+        start, new_start = row * seats_per_row, row * new_seats_per_row
+        reshaped[new_start : new_start + width] = counts[start : start + width]
+
+    return reshaped
+
+
+def record_seat_demand(slot_id, seats, delta=1):
+    """
+    Adds `delta` to the demand count of each `(row, number)` seat of a slot.
+    Call once the booking (delta 1) or cancellation (delta -1) has committed.
+    """
+    slot = (
+        Slot.objects.filter(pk=slot_id)
+        .values("date_time", "cinema_id", "cinema__rows", "cinema__seats_per_row")
+        .first()
+    )
+    if slot is None:
+        return
+
+    rows, seats_per_row = slot["cinema__rows"], slot["cinema__seats_per_row"]
+
+    with transaction.atomic():
+        demand, _ = CinemaSeatDemand.objects.select_for_update().get_or_create(
+            cinema_id=slot["cinema_id"],
+            date=timezone.localdate(slot["date_time"]),
+            defaults={
+                "rows": rows,
+                "seats_per_row": seats_per_row,
+                "counts": pack_counts(empty_counts(rows, seats_per_row)),
+            },
+        )
+
+        counts = reshape_counts(
+            unpack_counts(demand.counts),
+            demand.rows,
+            demand.seats_per_row,
+            rows,
+            seats_per_row,
+        )
+
+        for row, number in seats:
+            if 1 <= row <= rows and 1 <= number <= seats_per_row:
+                index = (row - 1) * seats_per_row + number - 1
+                counts[index] = max(counts[index] + delta, 0)
+
+        CinemaSeatDemand.objects.filter(pk=demand.pk).update(
+            rows=rows,
+            seats_per_row=seats_per_row,
+            counts=pack_counts(counts),
+            updated_at=timezone.now(),
+        )
+
+
+def rebuild_day_demand(day):
+    """
+    Recomputes the seat demand of the shows on `day` from the bookings,
+    live and archived.
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min))
+
+    seat_fields = [
+        "booking__slot__cinema_id",
+        "booking__slot__cinema__rows",
+        "booking__slot__cinema__seats_per_row",
+        "row",
+        "number",
+    ]
+    live_seats = Seat.objects.filter(
+        booking__status=Booking.Status.BOOKED,
+        booking__slot__date_time__gte=start,
+        booking__slot__date_time__lt=start + timedelta(days=1),
+    )
+    # Bounded by the partition key, so only the day's month is scanned
+    archived_seats = ArchivedSeat.objects.filter(
+        show_date=day, booking__status=Booking.Status.BOOKED
+    )
+
+    seat_counts = chain.from_iterable(
+        seats.values_list(*seat_fields).annotate(sold=Count("id")).order_by()
+        for seats in (live_seats, archived_seats)
+    )
+
+    layouts, counts = {}, {}
+
+    for cinema_id, rows, seats_per_row, row, number, sold in seat_counts:
+        if cinema_id not in counts:
+            layouts[cinema_id] = (rows, seats_per_row)
+            counts[cinema_id] = empty_counts(rows, seats_per_row)
+
+        if 1 <= row <= rows and 1 <= number <= seats_per_row:
+            counts[cinema_id][(row - 1) * seats_per_row + number - 1] += sold
+
+    with transaction.atomic():
+        CinemaSeatDemand.objects.filter(date=day).delete()
+        CinemaSeatDemand.objects.bulk_create(
+            CinemaSeatDemand(
+                cinema_id=cinema_id,
+                date=day,
+                rows=layouts[cinema_id][0],
+                seats_per_row=layouts[cinema_id][1],
+                counts=pack_counts(cinema_counts),
+            )
+            for cinema_id, cinema_counts in counts.items()
+        )
+
+
+def build_heatmap(cinema, start_date, end_date):
+    """
+    Sums the seat demand of a cinema over a date range into a
+    `rows x seats_per_row` matrix.
+
+    The stored daily counts are added element wise in memory, so the cost
+    is one pass over the cinema's seats per day instead of a query over
+    every seat booked.
+    """
+    rows, seats_per_row = cinema.rows, cinema.seats_per_row
+    totals = empty_counts(rows, seats_per_row)
+
+    days = CinemaSeatDemand.objects.filter(
+        cinema=cinema, date__range=(start_date, end_date)
+    ).values_list("rows", "seats_per_row", "counts")
+
+    for day_rows, day_seats_per_row, data in days.iterator():
+        counts = reshape_counts(
+            unpack_counts(data), day_rows, day_seats_per_row, rows, seats_per_row
+        )
+        totals = array(COUNT_TYPECODE, map(add, totals, counts))
+
+    return [
+        totals[start : start + seats_per_row].tolist()
+        for start in range(0, len(totals), seats_per_row)
+    ]
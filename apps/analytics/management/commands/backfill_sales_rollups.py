@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.analytics.heatmap import rebuild_day_demand
+from apps.analytics.rollups import rebuild_day
+from apps.slots.models import ArchivedSlot, Slot
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the sales rollups and seat demand from the bookings, live and "
+        "archived, one show date per transaction. Defaults to every date with slots."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        start, end = options["start"], options["end"]
+
+        if start is None or end is None:
+            bounds = [
+                bound
+                for model in (Slot, ArchivedSlot)
+                for bound in model.objects.aggregate(
+                    first=Min("date_time"), last=Max("date_time")
+                ).values()
+                if bound is not None
+            ]
+            if not bounds:
+                self.stdout.write("No slots to backfill")
+                return
+
+            start = start or timezone.localdate(min(bounds))
+            end = end or timezone.localdate(max(bounds))
+
+        if start > end:
+            raise CommandError("--start must not be after --end")
+
+        day = start
+        slots = 0
+
+        while day <= end:
+            slots += rebuild_day(day, batch_size=options["batch_size"])
+            rebuild_day_demand(day)
+            day += timedelta(days=1)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled sales of {slots} slot(s) from {start} to {end}"
+            )
+        )
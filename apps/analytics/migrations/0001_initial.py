@@ -0,0 +1,101 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('base', '0001_initial'),
+        ('cinemas', '0003_cinema_slug'),
+        ('movies', '0004_movie_poster_variants'),
+        ('slots', '0002_remove_slot_end_time_slot_language'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CinemaDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('capacity', models.IntegerField(default=0)),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('bookings', models.IntegerField(default=0)),
+                ('cancellations', models.IntegerField(default=0)),
+                ('cancelled_tickets', models.IntegerField(default=0)),
+                ('date', models.DateField()),
+                ('cinema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='cinemas.cinema')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='analytics_c_date_8c05b8_idx')],
+                'constraints': [models.UniqueConstraint(fields=('cinema', 'date'), name='unique_cinema_daily_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CityDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('capacity', models.IntegerField(default=0)),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('bookings', models.IntegerField(default=0)),
+                ('cancellations', models.IntegerField(default=0)),
+                ('cancelled_tickets', models.IntegerField(default=0)),
+                ('date', models.DateField()),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='base.city')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='analytics_c_date_65587d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('city', 'date'), name='unique_city_daily_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('capacity', models.IntegerField(default=0)),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('bookings', models.IntegerField(default=0)),
+                ('cancellations', models.IntegerField(default=0)),
+                ('cancelled_tickets', models.IntegerField(default=0)),
+                ('date', models.DateField()),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='analytics_m_date_42b092_idx')],
+                'constraints': [models.UniqueConstraint(fields=('movie', 'date'), name='unique_movie_daily_sales')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SlotSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('capacity', models.IntegerField(default=0)),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('bookings', models.IntegerField(default=0)),
+                ('cancellations', models.IntegerField(default=0)),
+                ('cancelled_tickets', models.IntegerField(default=0)),
+                ('date', models.DateField()),
+                ('cinema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinemas.cinema')),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='base.city')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+                ('slot', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='sales', to='slots.slot')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='analytics_s_date_c9e1d0_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('cinemas', '0003_cinema_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CinemaSeatDemand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('rows', models.PositiveIntegerField()),
+                ('seats_per_row', models.PositiveIntegerField()),
+                ('counts', models.BinaryField()),
+                ('cinema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_demand', to='cinemas.cinema')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('cinema', 'date'), name='unique_cinema_seat_demand')],
+            },
+        ),
+    ]
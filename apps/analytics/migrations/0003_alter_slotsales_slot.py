@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_cinemaseatdemand'),
+        ('slots', '0002_remove_slot_end_time_slot_language'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='slotsales',
+            name='slot',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='sales', to='slots.slot'),
+        ),
+    ]
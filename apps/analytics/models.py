@@ -0,0 +1,188 @@
+from django.db import models
+
+from apps.base.models import City, TimeStampModel
+from apps.cinemas.models import Cinema
+from apps.movies.models import Movie
+from apps.slots.models import Slot
+
+
+class SalesRollup(TimeStampModel):
+    """
+    Abstract base model for pre-aggregated sales counters.
+
+    Counters are updated in place as bookings are made and cancelled (see
+    `apps.analytics.rollups`) and can be recomputed with the
+    `backfill_sales_rollups` command.
+
+    Fields:
+        capacity:
+            Seats offered by the slots counted in the rollup.
+
+        tickets_sold:
+            Seats of active bookings.
+
+        revenue:
+            Price of the tickets sold, at the slot price.
+
+        bookings:
+            Active bookings.
+
+        cancellations:
+            Cancelled bookings.
+
+        cancelled_tickets:
+            Seats of cancelled bookings.
+    """
+
+    capacity = models.IntegerField(default=0)
+    tickets_sold = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    bookings = models.IntegerField(default=0)
+    cancellations = models.IntegerField(default=0)
+    cancelled_tickets = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def occupancy(self):
+        if not self.capacity:
+            return 0.0
+        return self.tickets_sold / self.capacity
+
+
+class SlotSales(SalesRollup):
+    """
+    Sales of a single slot.
+
+    Fields:
+        slot:
+            Slot the sales belong to.
+
+        date:
+            Local date of the show.
+
+        cinema, movie, city:
+            Copied from the slot, so day rollups can be rebuilt from slot
+            rollups without joins.
+    """
+
+    # Kept once the slot is archived
+    slot = models.OneToOneField(
+        Slot,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="sales",
+    )
+    date = models.DateField()
+    cinema = models.ForeignKey(Cinema, on_delete=models.CASCADE, related_name="+")
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="+")
+    city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        indexes = [models.Index(fields=["date"])]
+
+    def __str__(self):
+        return f"Sales of slot #{self.slot_id}"
+
+
+class CinemaDailySales(SalesRollup):
+    """
+    Sales of all the shows of a cinema on a date.
+    """
+
+    cinema = models.ForeignKey(
+        Cinema, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    date = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cinema", "date"], name="unique_cinema_daily_sales"
+            )
+        ]
+        indexes = [models.Index(fields=["date"])]
+
+    def __str__(self):
+        return f"Sales of cinema #{self.cinema_id} on {self.date}"
+
+
+class MovieDailySales(SalesRollup):
+    """
+    Sales of all the shows of a movie on a date.
+    """
+
+    movie = models.ForeignKey(
+        Movie, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    date = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["movie", "date"], name="unique_movie_daily_sales"
+            )
+        ]
+        indexes = [models.Index(fields=["date"])]
+
+    def __str__(self):
+        return f"Sales of movie #{self.movie_id} on {self.date}"
+
+
+class CityDailySales(SalesRollup):
+    """
+    Sales of all the shows in a city on a date.
+    """
+
+    city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="daily_sales")
+    date = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["city", "date"], name="unique_city_daily_sales"
+            )
+        ]
+        indexes = [models.Index(fields=["date"])]
+
+    def __str__(self):
+        return f"Sales of city #{self.city_id} on {self.date}"
+
+
+class CinemaSeatDemand(TimeStampModel):
+    """
+    Seats sold per seat of a cinema, for the shows on a date.
+
+    Fields:
+        cinema:
+            Cinema the seats belong to.
+
+        date:
+            Local date of the shows.
+
+        rows, seats_per_row:
+            Layout of the cinema when the counts were started.
+
+        counts:
+            Packed little endian unsigned 32 bit counts, one per seat in
+            row major order (see `apps.analytics.heatmap`).
+    """
+
+    cinema = models.ForeignKey(
+        Cinema, on_delete=models.CASCADE, related_name="seat_demand"
+    )
+    date = models.DateField()
+    rows = models.PositiveIntegerField()
+    seats_per_row = models.PositiveIntegerField()
+    counts = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cinema", "date"], name="unique_cinema_seat_demand"
+            )
+        ]
+
+    def __str__(self):
+        return f"Seat demand of cinema #{self.cinema_id} on {self.date}"
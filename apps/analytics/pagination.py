@@ -0,0 +1,5 @@
+from apps.base.pagination import BaseCursorPagination
+
+
+class SalesCursorPagination(BaseCursorPagination):
+    ordering = ("-date", "-id")
@@ -0,0 +1,214 @@
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.slots.models import ArchivedSlot, Slot
+
+from .models import CinemaDailySales, CityDailySales, MovieDailySales, SlotSales
+
+COUNTERS = [
+    "capacity",
+    "tickets_sold",
+    "revenue",
+    "bookings",
+    "cancellations",
+    "cancelled_tickets",
+]
+
+# Day rollups and the slot rollup field they are keyed by
+DAILY_ROLLUPS = [
+    (CinemaDailySales, "cinema_id"),
+    (MovieDailySales, "movie_id"),
+    (CityDailySales, "city_id"),
+]
+
+
+def _increment(model, keys, deltas, defaults=None):
+    """
+    Adds `deltas` to the counters of the row matching `keys` in a single
+    UPDATE, creating the row (with `defaults`) when missing.
+
+    Returns whether the row was created.
+    """
+    rows = model.objects.filter(**keys)
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+
+    if rows.update(**updates) if updates else rows.exists():
+        return False
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **(defaults or {}), **deltas)
+            return True
+    except IntegrityError:
+        # Created concurrently
+        if updates:
+            rows.update(**updates)
+        return False
+
+
+def _record(slot_id, **deltas):
+    slot = (
+        Slot.objects.filter(pk=slot_id)
+        .values(
+            "date_time",
+            "cinema_id",
+            "movie_id",
+            "cinema__city_id",
+            "cinema__rows",
+            "cinema__seats_per_row",
+        )
+        .first()
+    )
+    if slot is None:
+        return
+
+    capacity = slot["cinema__rows"] * slot["cinema__seats_per_row"]
+    slot_keys = {
+        "date": timezone.localdate(slot["date_time"]),
+        "cinema_id": slot["cinema_id"],
+        "movie_id": slot["movie_id"],
+        "city_id": slot["cinema__city_id"],
+    }
+
+    with transaction.atomic():
+        created = _increment(
+            SlotSales,
+            {"slot_id": slot_id},
+            deltas,
+            defaults={**slot_keys, "capacity": capacity},
+        )
+
+        # Seats of a slot count in the day capacity once, with its first event
+        if created:
+            deltas = {**deltas, "capacity": capacity}
+
+        for model, field in DAILY_ROLLUPS:
+            _increment(
+                model, {field: slot_keys[field], "date": slot_keys["date"]}, deltas
+            )
+
+
+def record_slot_scheduled(slot_id):
+    """
+    Adds the seats of a new slot to the capacity of its rollups.
+    """
+    _record(slot_id)
+
+
+def record_booking(slot_id, seat_count, price):
+    """
+    Adds a booking of `seat_count` seats at `price` to the rollups of its
+    slot. Call once the booking has committed.
+    """
+    _record(
+        slot_id,
+        tickets_sold=seat_count,
+        revenue=seat_count * price,
+        bookings=1,
+    )
+
+
+def record_cancellation(slot_id, seat_count, price, booking_count=1):
+    """
+    Moves cancelled bookings, `seat_count` seats in total, from the sales
+    to the cancellations of the rollups of their slot. Call in the
+    cancelling transaction, or once it has committed.
+    """
+    _record(
+        slot_id,
+        tickets_sold=-seat_count,
+        revenue=-seat_count * price,
+        bookings=-booking_count,
+        cancellations=booking_count,
+        cancelled_tickets=seat_count,
+    )
+
+
+def rebuild_day(day, batch_size=1000):
+    """
+    Recomputes the rollups of the shows on `day` from the bookings, live
+    and archived, in a single transaction.
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    booked = Q(bookings__status=Booking.Status.BOOKED)
+    cancelled = Q(bookings__status=Booking.Status.CANCELLED)
+
+    slots = chain.from_iterable(
+        model.objects.filter(date_time__gte=start, date_time__lt=start + timedelta(1))
+        .annotate(
+            seats_sold=Count("bookings__seats", filter=booked),
+            seats_cancelled=Count("bookings__seats", filter=cancelled),
+            active_bookings=Count("bookings", filter=booked, distinct=True),
+            cancelled_bookings=Count("bookings", filter=cancelled, distinct=True),
+        )
+        .values_list(
+            "id",
+            "price",
+            "cinema_id",
+            "movie_id",
+            "cinema__city_id",
+            "cinema__rows",
+            "cinema__seats_per_row",
+            "seats_sold",
+            "seats_cancelled",
+            "active_bookings",
+            "cancelled_bookings",
+        )
+        # Archived slots share the relation names of live ones
+        for model in (Slot, ArchivedSlot)
+    )
+
+    slot_sales = [
+        SlotSales(
+            slot_id=slot_id,
+            date=day,
+            cinema_id=cinema_id,
+            movie_id=movie_id,
+            city_id=city_id,
+            capacity=rows * seats_per_row,
+            tickets_sold=seats_sold,
+            revenue=seats_sold * price,
+            bookings=active_bookings,
+            cancellations=cancelled_bookings,
+            cancelled_tickets=seats_cancelled,
+        )
+        for (
+            slot_id,
+            price,
+            cinema_id,
+            movie_id,
+            city_id,
+            rows,
+            seats_per_row,
+            seats_sold,
+            seats_cancelled,
+            active_bookings,
+            cancelled_bookings,
+        ) in slots
+    ]
+
+    with transaction.atomic():
+        SlotSales.objects.filter(date=day).delete()
+        SlotSales.objects.bulk_create(slot_sales, batch_size=batch_size)
+
+        totals = {counter: Sum(counter) for counter in COUNTERS}
+
+        for model, field in DAILY_ROLLUPS:
+            model.objects.filter(date=day).delete()
+
+            rows = (
+                SlotSales.objects.filter(date=day)
+                .values(field)
+                .annotate(**totals)
+                .order_by()
+            )
+            model.objects.bulk_create(
+                [model(date=day, **row) for row in rows], batch_size=batch_size
+            )
+
+    return len(slot_sales)
@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import CinemaDailySales, CityDailySales, MovieDailySales, SlotSales
+
+ROLLUP_FIELDS = [
+    "date",
+    "capacity",
+    "tickets_sold",
+    "occupancy",
+    "revenue",
+    "bookings",
+    "cancellations",
+    "cancelled_tickets",
+]
+
+
+class SalesRollupSerializer(serializers.ModelSerializer):
+    """
+    Base serializer for sales rollups
+
+    Fields:
+        "date": date,
+        "capacity": int,
+        "tickets_sold": int,
+        "occupancy": float (tickets sold / capacity),
+        "revenue": int,
+        "bookings": int,
+        "cancellations": int,
+        "cancelled_tickets": int
+    """
+
+    occupancy = serializers.FloatField(read_only=True)
+
+
+class SlotSalesSerializer(SalesRollupSerializer):
+    """
+    Serializer for SlotSales model
+
+    Fields:
+        "slot_id": int,
+        "cinema_id": int,
+        "movie_id": int,
+        "city_id": int,
+        ...rollup fields
+    """
+
+    class Meta:
+        model = SlotSales
+        fields = ["slot_id", "cinema_id", "movie_id", "city_id", *ROLLUP_FIELDS]
+
+
+class CinemaDailySalesSerializer(SalesRollupSerializer):
+    """
+    Serializer for CinemaDailySales model
+
+    Fields:
+        "cinema_id": int,
+        ...rollup fields
+    """
+
+    class Meta:
+        model = CinemaDailySales
+        fields = ["cinema_id", *ROLLUP_FIELDS]
+
+
+class MovieDailySalesSerializer(SalesRollupSerializer):
+    """
+    Serializer for MovieDailySales model
+
+    Fields:
+        "movie_id": int,
+        ...rollup fields
+    """
+
+    class Meta:
+        model = MovieDailySales
+        fields = ["movie_id", *ROLLUP_FIELDS]
+
+
+class CityDailySalesSerializer(SalesRollupSerializer):
+    """
+    Serializer for CityDailySales model
+
+    Fields:
+        "city_id": int,
+        ...rollup fields
+    """
+
+    class Meta:
+        model = CityDailySales
+        fields = ["city_id", *ROLLUP_FIELDS]
+
+
+class DateRangeSerializer(serializers.Serializer):
+    """
+    Serializer for report date range query params
+
+    Fields:
+        "start": date (defaults to 30 days before end),
+        "end": date (defaults to today)
+    """
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault("end", timezone.localdate())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=30))
+
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("Start date must not be after end date")
+
+        return attrs
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.slots.models import Slot
+
+from .rollups import record_slot_scheduled
+
+
+@receiver(post_save, sender=Slot, dispatch_uid="analytics_slot_scheduled")
+def slot_scheduled(sender, instance, created, raw=False, **kwargs):
+    """
+    Counts the seats of new slots in the capacity of their rollups.
+    """
+    if created and not raw:
+        slot_id = instance.pk
+        transaction.on_commit(lambda: record_slot_scheduled(slot_id), robust=True)
@@ -0,0 +1,240 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.analytics.heatmap import unpack_counts
+from apps.analytics.models import (
+    CinemaDailySales,
+    CinemaSeatDemand,
+    CityDailySales,
+    MovieDailySales,
+    SlotSales,
+)
+from apps.base.models import City, Genre, Language
+from apps.base.outbox import drain
+from apps.bookings.archive import archive_slots
+from apps.cinemas.models import Cinema
+from apps.movies.models import Movie
+from apps.slots.models import Slot
+
+User = get_user_model()
+
+
+class TestSalesRollups(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.city = City.objects.create(name="Test city")
+        cls.genre = Genre.objects.create(name="Action")
+        cls.language = Language.objects.create(name="English")
+
+        cls.cinema = Cinema.objects.create(
+            name="Test Cinema",
+            location="location",
+            rows=10,
+            seats_per_row=10,
+            city=cls.city,
+        )
+
+        cls.movie = Movie.objects.create(
+            name="Test movie",
+            description="Sample Movie for testing",
+            duration=timedelta(hours=3),
+            release_date=timezone.localdate(),
+        )
+        cls.movie.genre.add(cls.genre)
+        cls.movie.language.add(cls.language)
+
+        cls.user = User.objects.create_user(
+            email="user1@gmail.com",
+            password="user@123",
+            first_name="user1",
+            last_name="A",
+            phone_number="9876543210",
+        )
+
+        cls.staff = User.objects.create_user(
+            email="staff@gmail.com",
+            password="user@123",
+            first_name="staff",
+            last_name="A",
+            phone_number="9876543211",
+            is_staff=True,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.slot = Slot.objects.create(
+                date_time=timezone.localtime() + timedelta(days=1),
+                price=200,
+                movie=self.movie,
+                cinema=self.cinema,
+                language=self.language,
+            )
+
+        self.date = timezone.localdate(self.slot.date_time)
+
+    def authenticate(self, user):
+        res = self.client.post(
+            "/api/auth/login", {"email": user.email, "password": "user@123"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def book(self, seats):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                "/api/bookings",
+                {"slot_id": self.slot.id, "seats": seats},
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        drain()
+        return res.data["id"]
+
+    def assertRollups(self, **counters):
+        rollups = [
+            SlotSales.objects.get(slot=self.slot),
+            CinemaDailySales.objects.get(cinema=self.cinema, date=self.date),
+            MovieDailySales.objects.get(movie=self.movie, date=self.date),
+            CityDailySales.objects.get(city=self.city, date=self.date),
+        ]
+        for rollup in rollups:
+            for counter, value in counters.items():
+                self.assertEqual(getattr(rollup, counter), value, counter)
+
+    def test_new_slot_adds_capacity(self):
+        self.assertRollups(capacity=100, tickets_sold=0, revenue=0)
+
+    def test_bookings_and_cancellations_update_rollups(self):
+        self.authenticate(self.user)
+        booking_id = self.book([{"row": 1, "number": 1}, {"row": 1, "number": 2}])
+        self.book([{"row": 2, "number": 1}])
+
+        self.assertRollups(tickets_sold=3, revenue=600, bookings=2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(f"/api/bookings/{booking_id}/cancel")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        drain()
+
+        self.assertRollups(
+            capacity=100,
+            tickets_sold=1,
+            revenue=200,
+            bookings=1,
+            cancellations=1,
+            cancelled_tickets=2,
+        )
+
+    def test_cancellation_delivered_after_its_booking(self):
+        self.authenticate(self.user)
+
+        # Cancelled before the booking event is delivered
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                "/api/bookings",
+                {"slot_id": self.slot.id, "seats": [{"row": 3, "number": 3}]},
+                format="json",
+            )
+            self.client.patch(f"/api/bookings/{res.data['id']}/cancel")
+        drain()
+
+        self.assertRollups(tickets_sold=0, bookings=0, cancellations=1)
+        demand = CinemaSeatDemand.objects.get(cinema=self.cinema, date=self.date)
+        self.assertEqual(sum(unpack_counts(demand.counts)), 0)
+
+    def test_backfill_matches_incremental_rollups(self):
+        self.authenticate(self.user)
+        self.book([{"row": 1, "number": 1}, {"row": 1, "number": 2}])
+
+        SlotSales.objects.all().delete()
+        CinemaDailySales.objects.all().delete()
+
+        call_command("backfill_sales_rollups", stdout=StringIO())
+
+        self.assertRollups(capacity=100, tickets_sold=2, revenue=400, bookings=1)
+
+    def test_backfill_includes_archived_slots(self):
+        self.authenticate(self.user)
+        self.book([{"row": 1, "number": 1}, {"row": 1, "number": 2}])
+        archive_slots(cutoff=self.slot.date_time + timedelta(minutes=1))
+
+        SlotSales.objects.all().delete()
+        CinemaDailySales.objects.all().delete()
+        CinemaSeatDemand.objects.all().delete()
+
+        call_command("backfill_sales_rollups", stdout=StringIO())
+
+        self.assertRollups(capacity=100, tickets_sold=2, revenue=400, bookings=1)
+        demand = CinemaSeatDemand.objects.get(cinema=self.cinema, date=self.date)
+        self.assertEqual(sum(unpack_counts(demand.counts)), 2)
+
+    def test_staff_sales_report(self):
+        self.authenticate(self.user)
+        self.book([{"row": 1, "number": 1}])
+
+        self.authenticate(self.staff)
+        res = self.client.get(
+            "/api/analytics/sales/cinemas",
+            {"start": self.date, "end": self.date, "cinema": self.cinema.id},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]["tickets_sold"], 1)
+        self.assertEqual(res.data["results"][0]["occupancy"], 0.01)
+
+    def test_sales_report_requires_staff(self):
+        self.authenticate(self.user)
+
+        res = self.client.get("/api/analytics/sales/slots")
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_seat_heatmap(self):
+        self.authenticate(self.user)
+        self.book([{"row": 1, "number": 1}, {"row": 2, "number": 3}])
+        booking_id = self.book([{"row": 5, "number": 10}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/bookings/{booking_id}/cancel")
+        drain()
+
+        self.authenticate(self.staff)
+        res = self.client.get(
+            f"/api/analytics/cinemas/{self.cinema.id}/heatmap",
+            {"start": self.date, "end": self.date},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        heatmap = res.data["heatmap"]
+        self.assertEqual(len(heatmap), 10)
+        self.assertEqual(len(heatmap[0]), 10)
+        self.assertEqual(heatmap[0][0], 1)
+        self.assertEqual(heatmap[1][2], 1)
+        self.assertEqual(heatmap[4][9], 0)
+        self.assertEqual(sum(map(sum, heatmap)), 2)
+
+        CinemaSeatDemand.objects.all().delete()
+        call_command("backfill_sales_rollups", stdout=StringIO())
+
+        res = self.client.get(
+            f"/api/analytics/cinemas/{self.cinema.id}/heatmap",
+            {"start": self.date, "end": self.date},
+        )
+        self.assertEqual(res.data["heatmap"], heatmap)
+
+    def test_seat_heatmap_invalid_range(self):
+        self.authenticate(self.staff)
+
+        res = self.client.get(
+            f"/api/analytics/cinemas/{self.cinema.id}/heatmap",
+            {"start": self.date, "end": self.date - timedelta(days=1)},
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,33 @@
+from django.urls import path
+
+from .views import (
+    CinemaDailySalesListView,
+    CinemaSeatHeatmapView,
+    CityDailySalesListView,
+    MovieDailySalesListView,
+    SlotSalesListView,
+)
+
+urlpatterns = [
+    path("analytics/sales/slots", SlotSalesListView.as_view(), name="slot_sales"),
+    path(
+        "analytics/sales/cinemas",
+        CinemaDailySalesListView.as_view(),
+        name="cinema_daily_sales",
+    ),
+    path(
+        "analytics/sales/movies",
+        MovieDailySalesListView.as_view(),
+        name="movie_daily_sales",
+    ),
+    path(
+        "analytics/sales/cities",
+        CityDailySalesListView.as_view(),
+        name="city_daily_sales",
+    ),
+    path(
+        "analytics/cinemas/<int:pk>/heatmap",
+        CinemaSeatHeatmapView.as_view(),
+        name="cinema_seat_heatmap",
+    ),
+]
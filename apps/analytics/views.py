@@ -0,0 +1,224 @@
+from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.cinemas.models import Cinema
+
+from .filters import (
+    CinemaDailySalesFilter,
+    CityDailySalesFilter,
+    MovieDailySalesFilter,
+    SlotSalesFilter,
+)
+from .heatmap import build_heatmap
+from .models import CinemaDailySales, CityDailySales, MovieDailySales, SlotSales
+from .pagination import SalesCursorPagination
+from .serializers import (
+    CinemaDailySalesSerializer,
+    CityDailySalesSerializer,
+    DateRangeSerializer,
+    MovieDailySalesSerializer,
+    SlotSalesSerializer,
+)
+
+
+class SalesRollupListView(ListAPIView):
+    """
+    Base view for staff sales reports, served from the pre-aggregated
+    rollups instead of scanning bookings.
+
+    Query Params:
+        - start: first show date (YYYY-MM-DD)
+        - end: last show date, inclusive (YYYY-MM-DD)
+
+    Response:
+        200 OK
+        {
+            "next": null,
+            "previous": null,
+            "results": [
+                {
+                    "date": date,
+                    "capacity": int,
+                    "tickets_sold": int,
+                    "occupancy": float,
+                    "revenue": int,
+                    "bookings": int,
+                    "cancellations": int,
+                    "cancelled_tickets": int
+                }
+            ]
+        }
+
+    Errors:
+        403 Forbidden:
+            - User is not staff
+    """
+
+    permission_classes = [IsAdminUser]
+    throttle_scope = "listing"
+    filter_backends = [DjangoFilterBackend]
+    pagination_class = SalesCursorPagination
+
+
+class SlotSalesListView(SalesRollupListView):
+    """
+    API Endpoint for sales per slot
+
+    Endpoint:
+        - GET /api/analytics/sales/slots
+
+    Permissions:
+        - IsAdminUser
+
+    Query Params:
+        - start, end: show date range
+        - cinema, movie, city: ids to filter by
+
+    Response:
+        Rollup fields, with "slot_id", "cinema_id", "movie_id" and "city_id"
+    """
+
+    queryset = SlotSales.objects.all()
+    serializer_class = SlotSalesSerializer
+    filterset_class = SlotSalesFilter
+
+
+class CinemaDailySalesListView(SalesRollupListView):
+    """
+    API Endpoint for sales per cinema and day
+
+    Endpoint:
+        - GET /api/analytics/sales/cinemas
+
+    Permissions:
+        - IsAdminUser
+
+    Query Params:
+        - start, end: show date range
+        - cinema: id to filter by
+
+    Response:
+        Rollup fields, with "cinema_id"
+    """
+
+    queryset = CinemaDailySales.objects.all()
+    serializer_class = CinemaDailySalesSerializer
+    filterset_class = CinemaDailySalesFilter
+
+
+class MovieDailySalesListView(SalesRollupListView):
+    """
+    API Endpoint for sales per movie and day
+
+    Endpoint:
+        - GET /api/analytics/sales/movies
+
+    Permissions:
+        - IsAdminUser
+
+    Query Params:
+        - start, end: show date range
+        - movie: id to filter by
+
+    Response:
+        Rollup fields, with "movie_id"
+    """
+
+    queryset = MovieDailySales.objects.all()
+    serializer_class = MovieDailySalesSerializer
+    filterset_class = MovieDailySalesFilter
+
+
+class CityDailySalesListView(SalesRollupListView):
+    """
+    API Endpoint for sales per city and day
+
+    Endpoint:
+        - GET /api/analytics/sales/cities
+
+    Permissions:
+        - IsAdminUser
+
+    Query Params:
+        - start, end: show date range
+        - city: id to filter by
+
+    Response:
+        Rollup fields, with "city_id"
+    """
+
+    queryset = CityDailySales.objects.all()
+    serializer_class = CityDailySalesSerializer
+    filterset_class = CityDailySalesFilter
+
+
+class CinemaSeatHeatmapView(APIView):
+    """
+    API Endpoint for the seat demand heatmap of a cinema
+
+    Endpoint:
+        - GET /api/analytics/cinemas/<int:pk>/heatmap?start=YYYY-MM-DD&end=YYYY-MM-DD
+
+    Permissions:
+        - IsAdminUser
+
+    Description:
+        - Counts how often each seat was sold for the shows in the range
+          (defaults to the last 30 days), cancelled bookings excluded
+        - Served from the per day seat demand counts of the cinema
+
+    Response:
+        200 OK
+        {
+            "cinema_id": int,
+            "start": date,
+            "end": date,
+            "rows": int,
+            "seats_per_row": int,
+            "max": int,
+            "heatmap": [[int]] (rows x seats_per_row)
+        }
+
+    Errors:
+        400 Bad Request:
+            - Invalid date range
+
+        403 Forbidden:
+            - User is not staff
+
+        404 Not Found:
+            - Cinema not found
+    """
+
+    permission_classes = [IsAdminUser]
+    throttle_scope = "listing"
+
+    def get(self, request, pk):
+        cinema = get_object_or_404(
+            Cinema.objects.only("id", "rows", "seats_per_row"), pk=pk
+        )
+
+        date_range = DateRangeSerializer(data=request.query_params)
+        date_range.is_valid(raise_exception=True)
+        start, end = (
+            date_range.validated_data["start"],
+            date_range.validated_data["end"],
+        )
+
+        heatmap = build_heatmap(cinema, start, end)
+
+        return Response(
+            {
+                "cinema_id": cinema.id,
+                "start": start,
+                "end": end,
+                "rows": cinema.rows,
+                "seats_per_row": cinema.seats_per_row,
+                "max": max(map(max, heatmap), default=0),
+                "heatmap": heatmap,
+            }
+        )
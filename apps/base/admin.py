@@ -1,7 +1,8 @@
 from django.contrib import admin
 
-from .models import City, Genre, Language
+from .models import City, Genre, Language, OutboxEvent
 
 admin.site.register(Language)
 admin.site.register(Genre)
 admin.site.register(City)
+admin.site.register(OutboxEvent)
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class BaseConfig(AppConfig):
     name = "apps.base"
+
+    def ready(self):
+        from .conditional import track_versions
+        from .models import City, Genre, Language
+
+        for model in (City, Genre, Language):
+            track_versions(model)
@@ -0,0 +1,156 @@
+import hashlib
+import secrets
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+def version_key(scope):
+    """
+    Key of the version counter of a model, or of a narrower scope such as
+    "slot:<id>" given as a string.
+    """
+    if isinstance(scope, str):
+        return f"version:{scope}"
+    return f"version:{scope._meta.label_lower}"
+
+
+def new_version():
+    # Counters evicted from the cache restart from a random value, so ETags
+    # issued before are not matched again
+    return secrets.randbits(62)
+
+
+def get_versions(scopes):
+    """
+    Returns the version counters of models or scopes, without any query.
+    """
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, new_version(), None)
+        versions.update(cache.get_many(missing))
+
+    return [versions.get(key) for key in keys]
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, new_version(), None)
+
+
+def bump_version(*scopes):
+    """
+    Bumps the version counters of models or scopes, once the current
+    transaction commits (readers could otherwise cache data older than the
+    version).
+    """
+    keys = [version_key(scope) for scope in scopes]
+    transaction.on_commit(partial(_bump, keys), robust=True)
+
+
+def track_versions(model, deletes=True):
+    """
+    Bumps the version of a model whenever an instance is saved, deleted
+    (unless `deletes` is False, e.g. for tables emptied in bulk) or one of
+    its many-to-many relations changes.
+
+    Bulk updates do not send signals and must call `bump_version`.
+    """
+
+    def changed(sender, raw=False, **kwargs):
+        if not raw:
+            bump_version(model)
+
+    uid = f"track_versions:{model._meta.label_lower}"
+    post_save.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+    if deletes:
+        post_delete.connect(changed, sender=model, weak=False, dispatch_uid=uid)
+
+    for field in model._meta.local_many_to_many:
+        m2m_changed.connect(
+            changed, sender=field.remote_field.through, weak=False, dispatch_uid=uid
+        )
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """
+    Validates GET requests with an ETag derived from the version counters
+    of `etag_models` and of the scopes returned by `get_etag_scopes()`,
+    computed before the view queries anything.
+
+    - Responses carry the ETag, requests whose `If-None-Match` matches it
+      get a 304 without a body
+    - The ETag also depends on the host, the full path and the `Accept`
+      header, and on `get_etag_parts()` for views depending on more than
+      their models
+    - With `etag_period` (seconds) set, ETags also change every period,
+      for responses depending on the current time
+    - Only for responses that are the same for every user
+    """
+
+    etag_models = ()
+    etag_period = None
+
+    def get_etag_scopes(self, request):
+        return []
+
+    def get_etag_parts(self, request):
+        return [int(time.time() // self.etag_period)] if self.etag_period else []
+
+    def get_etag(self, request):
+        if request.method not in ("GET", "HEAD") or not self.etag_models:
+            return None
+
+        parts = (
+            request.get_host(),
+            request.get_full_path(),
+            request.headers.get("Accept", ""),
+            get_versions([*self.etag_models, *self.get_etag_scopes(request)]),
+            self.get_etag_parts(request),
+        )
+        return quote_etag(hashlib.sha256(repr(parts).encode()).hexdigest()[:32])
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.etag = self.get_etag(request)
+
+        # Weak comparison, as If-None-Match requires
+        if_none_match = {
+            etag.removeprefix("W/")
+            for etag in parse_etags(request.headers.get("If-None-Match", ""))
+        }
+        if self.etag and (self.etag in if_none_match or "*" in if_none_match):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        etag = getattr(self, "etag", None)
+        if etag and response.status_code in (200, 304):
+            response["ETag"] = etag
+
+        return response
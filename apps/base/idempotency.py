@@ -0,0 +1,111 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+MAX_KEY_LENGTH = 255
+
+
+def idempotency_store_key(request, key):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"idempotency:{request.user.pk}:{digest}"
+
+
+def request_fingerprint(request):
+    """
+    Hash of what makes a request distinct, a key reused for a different
+    request is rejected.
+    """
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{request.method}:{request.path}:{body}".encode()
+    ).hexdigest()
+
+
+def idempotent(handler):
+    """
+    Makes a view handler safe to retry with an `Idempotency-Key` header.
+
+    - The first request with a key locks it and runs the handler; a
+      successful response is stored for `IDEMPOTENCY_KEY_TTL` seconds
+    - Retries with the same key and body get the stored response back,
+      with an `Idempotent-Replayed` header, without running the handler
+    - Retries while the first request is still running get 409 Conflict
+    - Reusing a key for a different request gets 422 Unprocessable Entity
+    - Failed requests release the key, so they can be retried
+
+    Requests without the header are handled as usual. Keys are scoped to
+    the authenticated user.
+    """
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return handler(self, request, *args, **kwargs)
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {
+                    "detail": f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        store_key = idempotency_store_key(request, key)
+        fingerprint = request_fingerprint(request)
+
+        locked = cache.add(
+            store_key, {"fingerprint": fingerprint}, settings.IDEMPOTENCY_LOCK_TIMEOUT
+        )
+        if not locked:
+            return replay(cache.get(store_key), fingerprint)
+
+        try:
+            response = handler(self, request, *args, **kwargs)
+        except BaseException:
+            cache.delete(store_key)
+            raise
+
+        if status.is_success(response.status_code):
+            cache.set(
+                store_key,
+                {
+                    "fingerprint": fingerprint,
+                    "status": response.status_code,
+                    "data": response.data,
+                },
+                settings.IDEMPOTENCY_KEY_TTL,
+            )
+        else:
+            cache.delete(store_key)
+
+        return response
+
+    return wrapper
+
+
+def replay(record, fingerprint):
+    if record is not None and record["fingerprint"] != fingerprint:
+        return Response(
+            {"detail": f"{IDEMPOTENCY_HEADER} was used for a different request"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    if record is None or "status" not in record:
+        return Response(
+            {"detail": "A request with this idempotency key is in progress"},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    return Response(
+        record["data"],
+        status=record["status"],
+        headers={"Idempotent-Replayed": "true"},
+    )
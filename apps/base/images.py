@@ -0,0 +1,88 @@
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .conditional import bump_version
+from .taskqueue import task
+
+
+def variants_field_name(field_name):
+    return f"{field_name}_variants"
+
+
+def build_variants(image_file, directory):
+    """
+    Resizes an image to each of `IMAGE_VARIANT_WIDTHS` (never upscaling)
+    and stores the WebP encoded variants under `<directory>/variants/`,
+    the storage names them after their content.
+
+    Returns a map of width -> stored file name.
+    """
+    with Image.open(image_file) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    variants = {}
+
+    for width in sorted(settings.IMAGE_VARIANT_WIDTHS):
+        if width > image.width and variants:
+            break
+
+        variant = image.copy()
+        variant.thumbnail((width, image.height))
+
+        buffer = BytesIO()
+        variant.save(
+            buffer, format="WEBP", quality=settings.IMAGE_VARIANT_QUALITY, method=4
+        )
+        name = posixpath.join(directory, "variants", f"{variant.width}w.webp")
+
+        # Identical content is already stored under the same name
+        variants[str(variant.width)] = default_storage.save(
+            name, ContentFile(buffer.getvalue())
+        )
+
+    return variants
+
+
+@task
+def process_image_variants(model_label, pk, field_name):
+    """
+    Builds the variants of an instance's image field and stores their map
+    in the `<field_name>_variants` field.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    image = getattr(instance, field_name, None)
+
+    if not image:
+        return
+
+    with image.open("rb") as image_file:
+        directory = posixpath.dirname(image.name)
+        variants = build_variants(image_file, directory)
+
+    # Unless the image was replaced in the meantime
+    model.objects.filter(pk=pk, **{field_name: image.name}).update(
+        **{variants_field_name(field_name): variants}
+    )
+    bump_version(model)
+
+    if model._meta.label == settings.AUTH_USER_MODEL:
+        # Imported here, the users app depends on this module
+        from apps.users.authentication import forget_cached_user
+
+        forget_cached_user(pk)
+
+
+def schedule_image_variants(instance, field_name):
+    """
+    Builds the variants of an instance's image field in a background task,
+    enqueued in the transaction saving the instance.
+    """
+    process_image_variants.enqueue(instance._meta.label, instance.pk, field_name)
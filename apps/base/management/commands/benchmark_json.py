@@ -0,0 +1,88 @@
+import timeit
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.base.renderers import ORJSONRenderer, orjson
+
+
+def build_payload(movies, cinemas, slots):
+    """
+    Builds a payload shaped like the movie listing with slots per cinema,
+    with the datetime, Decimal and timedelta values the renderers encode.
+    """
+    now = timezone.now()
+
+    return [
+        {
+            "id": movie,
+            "name": f"Movie {movie}",
+            "description": "A movie " * 20,
+            "duration": timedelta(hours=2, minutes=movie % 60),
+            "release_date": now.date(),
+            "poster_srcset": {"160": "poster-160.webp", "320": "poster-320.webp"},
+            "cinemas": [
+                {
+                    "id": cinema,
+                    "name": f"Cinema {cinema}",
+                    "address": f"{cinema} Main street",
+                    "slots": [
+                        {
+                            "id": slot,
+                            "date_time": now + timedelta(hours=slot),
+                            "price": Decimal("180.00"),
+                            "available_seats": 120,
+                        }
+                        for slot in range(slots)
+                    ],
+                }
+                for cinema in range(cinemas)
+            ],
+        }
+        for movie in range(movies)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the rendering time of DRF's JSONRenderer and the orjson "
+        "renderer on a listing shaped payload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--movies", type=int, default=20)
+        parser.add_argument("--cinemas", type=int, default=10)
+        parser.add_argument("--slots", type=int, default=8)
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING("orjson is not installed, both use json")
+            )
+
+        payload = build_payload(options["movies"], options["cinemas"], options["slots"])
+        iterations = options["iterations"]
+        timings = {}
+
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            size = len(renderer.render(payload))
+            seconds = min(
+                timeit.repeat(
+                    lambda renderer=renderer: renderer.render(payload),
+                    number=iterations,
+                    repeat=3,
+                )
+            )
+            timings[type(renderer).__name__] = seconds
+
+            self.stdout.write(
+                f"{type(renderer).__name__}: {seconds / iterations * 1000:.2f} "
+                f"ms per render, {size} bytes"
+            )
+
+        speedup = timings["JSONRenderer"] / timings["ORJSONRenderer"]
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {speedup:.1f}x"))
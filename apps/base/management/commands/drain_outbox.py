@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.base.outbox import dispatch_batch, drain, purge_delivered
+
+
+class Command(BaseCommand):
+    help = (
+        "Delivers pending outbox events to their handlers. Several "
+        "dispatchers can run side by side. With --loop, keeps polling for "
+        "new events. With --purge, deletes the events delivered over "
+        "OUTBOX_RETENTION_DAYS ago instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument("--purge", action="store_true")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.OUTBOX_POLL_INTERVAL,
+            help="Seconds to wait when no event is deliverable (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        if options["purge"]:
+            deleted = purge_delivered(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Purged {deleted} event(s)"))
+            return
+
+        if not options["loop"]:
+            delivered = drain(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Delivered {delivered} event(s)"))
+            return
+
+        while True:
+            if not dispatch_batch(options["batch_size"]):
+                time.sleep(options["interval"])
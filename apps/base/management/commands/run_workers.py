@@ -0,0 +1,69 @@
+import multiprocessing
+import os
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _work():
+    # Spawned processes (non fork platforms) start without Django set up
+    django.setup()
+
+    from apps.base.taskqueue import work
+
+    work()
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs background task workers. Workers claim tasks with SKIP LOCKED, "
+        "so any number of them can run on any number of hosts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.TASK_WORKER_CONCURRENCY,
+            help="Worker processes, defaults to TASK_WORKER_CONCURRENCY",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Run the due tasks in this process and exit",
+        )
+
+    def handle(self, *args, **options):
+        from apps.base.taskqueue import work
+
+        if options["burst"]:
+            ran = work(burst=True)
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} task(s)"))
+            return
+
+        if options["concurrency"] <= 1:
+            work()
+            return
+
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+
+        # Children must not share the parent's database connections
+        connections.close_all()
+
+        processes = [
+            multiprocessing.Process(target=_work, name=f"task-worker-{index}")
+            for index in range(options["concurrency"])
+        ]
+        for process in processes:
+            process.start()
+
+        self.stdout.write(f"Started {len(processes)} workers")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
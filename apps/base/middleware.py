@@ -0,0 +1,32 @@
+from django.conf import settings
+
+from .routers import get_request_user_id, pin_to_primary, read_only
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadOnlyRequestMiddleware:
+    """
+    Runs safe (GET, HEAD, OPTIONS) requests inside a read-only block so
+    their queries can be routed to a read replica.
+
+    After a successful write the user is pinned to the primary for a short
+    window, so e.g. a new booking shows up in their booking history.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in SAFE_METHODS:
+            with read_only(request):
+                return self.get_response(request)
+
+        response = self.get_response(request)
+
+        if settings.REPLICA_DATABASES and response.status_code < 400:
+            user_id = get_request_user_id(request)
+            if user_id is not None:
+                pin_to_primary(user_id)
+
+        return response
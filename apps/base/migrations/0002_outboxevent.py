@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('topic', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.IntegerField(choices=[(0, 'Pending'), (1, 'Delivered'), (2, 'Failed')], default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 0)), fields=['id'], name='outbox_pending_idx'), models.Index(condition=models.Q(('status', 0)), fields=['key', 'id'], name='outbox_pending_key_idx')],
+            },
+        ),
+    ]
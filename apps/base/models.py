@@ -1,5 +1,6 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 
 
 class TimeStampModel(models.Model):
@@ -104,3 +105,132 @@ class City(TimeStampModel):
 
     def __str__(self):
         return self.name
+
+
+class OutboxEvent(TimeStampModel):
+    """
+    Event written in the same transaction as the change it describes, and
+    delivered to in-process handlers by the `drain_outbox` command (see
+    `apps.base.outbox`).
+
+    Fields:
+        topic:
+            Kind of event, e.g. "booking.created".
+
+        key:
+            Ordering key, events with the same key are delivered in order.
+
+        payload:
+            JSON data of the event.
+
+        status:
+            PENDING until delivered (DELIVERED) or out of attempts (FAILED).
+
+        attempts:
+            Deliveries attempted so far.
+
+        available_at:
+            Earliest time of the next delivery attempt.
+
+        last_error:
+            Error of the last failed attempt.
+    """
+
+    class Status(models.IntegerChoices):
+        PENDING = 0
+        DELIVERED = 1
+        FAILED = 2
+
+    topic = models.CharField(max_length=100)
+    key = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.IntegerField(choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status=0),
+                name="outbox_pending_idx",
+            ),
+            models.Index(
+                fields=["key", "id"],
+                condition=models.Q(status=0),
+                name="outbox_pending_key_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.id}"
+
+
+class Task(TimeStampModel):
+    """
+    Deferred function call, run by the `run_workers` command (see
+    `apps.base.taskqueue`).
+
+    Fields:
+        name:
+            Dotted path of the task function.
+
+        args, kwargs:
+            JSON arguments of the call.
+
+        status:
+            PENDING until claimed by a worker (RUNNING), then DONE, or
+            FAILED once out of attempts.
+
+        run_at:
+            Earliest time to run the task (next attempt after a failure).
+
+        attempts, max_attempts:
+            Runs started so far, and allowed.
+
+        locked_by, locked_at:
+            Worker running the task, and since when.
+
+        unique_key:
+            Optional, a task is enqueued at most once per key (used for
+            periodic tasks).
+
+        last_error:
+            Error of the last failed run.
+    """
+
+    class Status(models.IntegerChoices):
+        PENDING = 0
+        RUNNING = 1
+        DONE = 2
+        FAILED = 3
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.IntegerField(choices=Status.choices, default=Status.PENDING)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    unique_key = models.CharField(max_length=250, null=True, blank=True, unique=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["run_at", "id"],
+                condition=models.Q(status=0),
+                name="task_pending_idx",
+            ),
+            models.Index(
+                fields=["locked_at"],
+                condition=models.Q(status=1),
+                name="task_running_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id}"
@@ -0,0 +1,194 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# Seconds before retrying a failed delivery, doubled on every attempt
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 60 * 60
+
+_handlers = defaultdict(list)
+
+
+def handles(topic):
+    """
+    Registers the decorated function as a handler of the events of a topic,
+    called with the event payload.
+
+    Handlers run in the dispatching transaction, so their database writes
+    commit together with the delivery. Other side effects (cache, network)
+    may be repeated if a dispatcher dies mid batch, and must tolerate it.
+    """
+
+    def decorator(handler):
+        _handlers[topic].append(handler)
+        return handler
+
+    return decorator
+
+
+def publish(topic, key, payload):
+    """
+    Writes an event to the outbox. Call in the transaction making the change
+    the event describes, so the event exists if and only if it commits.
+    """
+    return OutboxEvent.objects.create(topic=topic, key=key, payload=payload)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_DELAY**attempts, RETRY_MAX_DELAY))
+
+
+def _deliver(event):
+    """
+    Runs the handlers of an event, in a savepoint so a failing handler
+    leaves no partial writes. Returns whether all succeeded.
+    """
+    try:
+        with transaction.atomic():
+            for handler in _handlers[event.topic]:
+                handler(event.payload)
+    except Exception as e:
+        event.attempts += 1
+        event.last_error = repr(e)
+
+        if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            event.status = OutboxEvent.Status.FAILED
+            logger.exception(
+                "Outbox event failed, giving up",
+                extra={"event_id": event.id, "topic": event.topic},
+            )
+        else:
+            event.available_at = timezone.now() + retry_delay(event.attempts)
+            logger.warning(
+                "Outbox event failed, will retry",
+                extra={"event_id": event.id, "topic": event.topic},
+            )
+
+        event.save(
+            update_fields=[
+                "attempts",
+                "last_error",
+                "status",
+                "available_at",
+                "updated_at",
+            ]
+        )
+        return False
+
+    event.attempts += 1
+    event.status = OutboxEvent.Status.DELIVERED
+    event.save(update_fields=["attempts", "status", "updated_at"])
+    return True
+
+
+def dispatch_batch(batch_size=None):
+    """
+    Claims up to `batch_size` pending events with `SELECT ... FOR UPDATE
+    SKIP LOCKED`, so concurrent dispatchers never deliver the same event,
+    and delivers them in a single transaction.
+
+    Events with the same key are delivered in id order: a key's events are
+    skipped from the first one that is not next in line (its predecessor is
+    claimed by another dispatcher or waiting for a retry) or that fails.
+
+    Returns the number of events delivered.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+
+    now = timezone.now()
+
+    # Events queued behind a retry would only fill the batch
+    waiting_for_retry = OutboxEvent.objects.filter(
+        status=OutboxEvent.Status.PENDING,
+        key=OuterRef("key"),
+        id__lt=OuterRef("id"),
+        available_at__gt=now,
+    )
+
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEvent.Status.PENDING, available_at__lte=now)
+            .exclude(Exists(waiting_for_retry))
+            .order_by("id")[:batch_size]
+        )
+        if not events:
+            return 0
+
+        # Pending events of the batch's keys up to the end of the batch,
+        # including those claimed elsewhere or not yet due
+        pending = defaultdict(list)
+        for key, event_id in (
+            OutboxEvent.objects.filter(
+                status=OutboxEvent.Status.PENDING,
+                key__in={event.key for event in events},
+                id__lte=events[-1].id,
+            )
+            .order_by("id")
+            .values_list("key", "id")
+        ):
+            pending[key].append(event_id)
+
+        claimed = defaultdict(list)
+        for event in events:
+            claimed[event.key].append(event)
+
+        delivered = 0
+
+        for key, key_events in claimed.items():
+            for event, next_id in zip(key_events, pending[key], strict=False):
+                if event.id != next_id or not _deliver(event):
+                    break
+                delivered += 1
+
+        return delivered
+
+
+def drain(batch_size=None):
+    """
+    Dispatches batches until no deliverable event is left.
+    Returns the number of events delivered.
+    """
+    total = 0
+
+    while delivered := dispatch_batch(batch_size):
+        total += delivered
+
+    return total
+
+
+def purge_delivered(batch_size=None, now=None):
+    """
+    Deletes events delivered over `OUTBOX_RETENTION_DAYS` ago, batch by
+    batch in short transactions. Failed events are kept for inspection.
+
+    Returns the number of events deleted.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    cutoff = (now or timezone.now()) - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    deleted = 0
+
+    while True:
+        with transaction.atomic():
+            ids = list(
+                OutboxEvent.objects.filter(
+                    status=OutboxEvent.Status.DELIVERED, updated_at__lt=cutoff
+                )
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+
+            OutboxEvent.objects.filter(id__in=ids).delete()
+
+        deleted += len(ids)
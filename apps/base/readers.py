@@ -0,0 +1,122 @@
+from collections import defaultdict
+
+from django.utils.duration import duration_string
+from rest_framework.response import Response
+
+
+class ValuesReader:
+    """
+    Read only serialization of list endpoints from `values()` rows,
+    building the plain dicts a `ModelSerializer` would return without
+    instantiating fields per row.
+
+    The view keeps the `ModelSerializer` as its `serializer_class`, which
+    documents the schema, and `ValuesListMixin` lists through the reader.
+
+    Subclasses set `fields`, the columns read with `values()`, and
+    implement `to_representation(row)`. `prepare(rows)` runs once per
+    page, e.g. to load the related names of the rows.
+    """
+
+    fields = ()
+
+    def __init__(self, request=None):
+        self.request = request
+
+    def represent(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        return [self.to_representation(row) for row in rows]
+
+    def prepare(self, rows):
+        pass
+
+    def absolute_url(self, url):
+        return self.request.build_absolute_uri(url) if self.request else url
+
+    def file_url(self, field, name):
+        """
+        URL of a stored file, as `FileField` serializes it.
+        """
+        return self.absolute_url(field.storage.url(name)) if name else None
+
+    def srcset(self, storage, variants):
+        """
+        Map of width -> URL of image variants, as `ImageVariantsField`
+        serializes it.
+        """
+        return {
+            width: self.absolute_url(storage.url(name))
+            for width, name in (variants or {}).items()
+        }
+
+
+def related_names(relation, ids):
+    """
+    Returns the names of the objects related through a many-to-many
+    relation (e.g. `Movie.language`) to each of `ids`, as
+    {id: [{"name": name}]} ready for a nested `fields = ["name"]`
+    serializer, in two queries: the links, and an id -> name map.
+    """
+    through = relation.through
+    source = relation.field.m2m_field_name()
+    target = relation.field.m2m_reverse_field_name()
+
+    links = list(
+        through.objects.filter(**{f"{source}_id__in": ids})
+        .order_by("pk")
+        .values_list(f"{source}_id", f"{target}_id")
+    )
+    names = dict(
+        relation.field.related_model.objects.filter(
+            pk__in={target_id for _, target_id in links}
+        ).values_list("pk", "name")
+    )
+
+    related = defaultdict(list)
+    for source_id, target_id in links:
+        related[source_id].append({"name": names[target_id]})
+
+    return related
+
+
+def format_duration(value):
+    return None if value is None else duration_string(value)
+
+
+class ValuesListMixin:
+    """
+    Lists `values()` rows through `reader_class` instead of building
+    instances and passing them to `serializer_class`. Filtering and
+    pagination are unchanged, the rows also hold the columns the
+    paginator orders by (e.g. the cursor position).
+    """
+
+    reader_class = None
+
+    def get_reader(self):
+        return self.reader_class(self.request)
+
+    def get_values_fields(self, reader):
+        ordering = getattr(self.paginator, "ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        ordering_fields = [field.lstrip("-") for field in ordering]
+        return list(dict.fromkeys([*reader.fields, *ordering_fields]))
+
+    def read(self, queryset):
+        reader = self.get_reader()
+        return reader.represent(queryset.values(*self.get_values_fields(reader)))
+
+    def list(self, request, *args, **kwargs):
+        reader = self.get_reader()
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *self.get_values_fields(reader)
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(reader.represent(queryset))
+
+        return self.get_paginated_response(reader.represent(page))
@@ -0,0 +1,51 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Line and paragraph separators are valid JSON but not valid JavaScript,
+# `JSONRenderer` escapes them as well
+UNSAFE_SEPARATORS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with orjson, with the output of `JSONRenderer`:
+    compact, UTF-8, and types orjson does not handle natively (Decimal,
+    timedelta, lazy strings, querysets...) or encodes differently
+    (datetime, date, time) go through DRF's `JSONEncoder`.
+
+    Falls back to `JSONRenderer` when orjson is not installed, or for
+    indented output other than the 2 spaces orjson supports.
+    """
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent not in (None, 2):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        options = self.options | (orjson.OPT_INDENT_2 if indent else 0)
+        ret = orjson.dumps(data, default=self.default, option=options)
+
+        for separator, escaped in UNSAFE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+
+        return ret
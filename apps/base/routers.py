@@ -0,0 +1,159 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.functional import SimpleLazyObject, empty
+
+# Request (or marker object) of the read-only block currently running
+_read_only_request = ContextVar("read_only_request", default=None)
+
+# alias -> (healthy, checked_at) of the replicas seen by this process
+_replica_health = {}
+
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+@contextmanager
+def read_only(request=None):
+    """
+    Marks the enclosed block as read-only so its queries may be served
+    by a replica. Passing the request lets the router keep users that
+    just wrote something on the primary.
+    """
+    token = _read_only_request.set(request if request is not None else object())
+    try:
+        yield
+    finally:
+        _read_only_request.reset(token)
+
+
+def get_request_user_id(request):
+    """
+    Returns the id of the authenticated user of the request, if known.
+
+    DRF assigns the authenticated user on the underlying request. The lazy
+    session user set by `AuthenticationMiddleware` is only used once it has
+    been resolved, since resolving it here would query the database from
+    inside the router.
+    """
+    user = getattr(request, "__dict__", {}).get("user")
+
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+
+    if user is None or not user.is_authenticated:
+        return None
+
+    return user.pk
+
+
+def primary_pin_key(user_id):
+    return f"db:primary-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """
+    Keeps the user's reads on the primary for `REPLICA_PIN_SECONDS`, so
+    their own writes are visible even if the replicas lag behind.
+    """
+    cache.set(primary_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(request):
+    if hasattr(request, "_pinned_to_primary"):
+        return request._pinned_to_primary
+
+    user_id = get_request_user_id(request)
+    if user_id is None:
+        # Not memoized, the user may not have been authenticated yet
+        return False
+
+    request._pinned_to_primary = bool(cache.get(primary_pin_key(user_id)))
+    return request._pinned_to_primary
+
+
+def check_replica(alias):
+    """
+    Returns whether the replica accepts connections and, for postgres,
+    replays WAL within `REPLICA_MAX_LAG_SECONDS` of the primary.
+    """
+    connection = connections[alias]
+
+    try:
+        connection.ensure_connection()
+
+        if connection.vendor != "postgresql":
+            return True
+
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_QUERY)
+            (lag,) = cursor.fetchone()
+    except DatabaseError:
+        return False
+
+    return lag is None or lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+def is_replica_healthy(alias):
+    """
+    Cached result of `check_replica`, refreshed at most once every
+    `REPLICA_HEALTH_CHECK_INTERVAL` seconds.
+    """
+    now = time.monotonic()
+    healthy, checked_at = _replica_health.get(alias, (True, None))
+
+    if checked_at is None or now - checked_at >= settings.REPLICA_HEALTH_CHECK_INTERVAL:
+        healthy = check_replica(alias)
+        _replica_health[alias] = (healthy, now)
+
+    return healthy
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router splitting reads between the primary and the replicas.
+
+    - Writes always go to the primary (`default`)
+    - Reads go to a random healthy replica only inside a read-only block
+      and outside of a transaction, so `select_for_update` and
+      read-your-writes inside booking transactions always hit the primary
+    - Users that wrote something in the last `REPLICA_PIN_SECONDS` read
+      from the primary
+    - Falls back to the primary when no replica is healthy
+    - Migrations only run on the primary
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, "REPLICA_DATABASES", [])
+        request = _read_only_request.get()
+
+        if not replicas or request is None:
+            return DEFAULT_DB_ALIAS
+
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        if is_pinned_to_primary(request):
+            return DEFAULT_DB_ALIAS
+
+        healthy = [alias for alias in replicas if is_replica_healthy(alias)]
+
+        return random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -1,3 +1,5 @@
+from django.core.files.storage import default_storage
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from .models import City, Genre, Language
@@ -19,3 +21,23 @@ class CitySerializer(serializers.ModelSerializer):
     class Meta:
         model = City
         fields = ["name"]
+
+
+@extend_schema_field(
+    {"type": "object", "additionalProperties": {"type": "string", "format": "uri"}}
+)
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Serializes the resized variants of an image field as a `srcset` style
+    map of width -> URL, e.g. {"160": url, "320": url}
+    """
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        srcset = {}
+
+        for width, name in (value or {}).items():
+            url = default_storage.url(name)
+            srcset[width] = request.build_absolute_uri(url) if request else url
+
+        return srcset
@@ -0,0 +1,14 @@
+def unique_slug(queryset, base):
+    """
+    Returns `base`, or `base-<n>` with the smallest n not taken in
+    `queryset`, looking up the taken slugs in a single query.
+    """
+    taken = set(queryset.filter(slug__startswith=base).values_list("slug", flat=True))
+
+    slug = base
+    i = 1
+    while slug in taken:
+        slug = f"{base}-{i}"
+        i += 1
+
+    return slug
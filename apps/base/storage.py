@@ -0,0 +1,48 @@
+import hashlib
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+# `name.<hash>.ext`, or a bare `<hash>.ext` as earlier image variants
+HASHED_NAME_RE = re.compile(r"(^|[./])[0-9a-f]{16,}\.\w+$")
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.search(posixpath.basename(name)))
+
+
+class ContentHashedStorage(FileSystemStorage):
+    """
+    File storage naming uploads after their content, e.g.
+    `movie_posters/leo.3f2a9c0d1b7e6a54.jpg`.
+
+    - A stored file never changes, so its URL can be cached forever
+    - Uploading identical content again reuses the stored file
+    - Names are always hashed, whatever the given name looks like, so an
+      upload can never be resolved to another file
+    """
+
+    def hashed_name(self, name, content):
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        content.seek(0)
+
+        root, ext = posixpath.splitext(name)
+        return f"{root}.{sha256.hexdigest()[:16]}{ext}"
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        name = self.hashed_name(name, content)
+
+        if self.exists(name):
+            return name
+
+        return super().save(name, content, max_length=max_length)
@@ -0,0 +1,222 @@
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(func=None, *, max_attempts=None):
+    """
+    Registers a function as a task, run by a worker once enqueued with
+    `func.enqueue(*args, **kwargs)`. Arguments must be JSON serializable.
+
+    Enqueue in the transaction of the change the task depends on, the task
+    is only visible to workers once it commits.
+
+    A failed task is retried with exponential backoff, up to `max_attempts`
+    runs (defaults to `TASK_MAX_ATTEMPTS`). Tasks may run more than once
+    (e.g. when a worker dies mid task), and must tolerate it.
+    """
+
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        _registry[name] = (func, max_attempts)
+        func.task_name = name
+        func.enqueue = partial(enqueue, name)
+        return func
+
+    return decorator(func) if func is not None else decorator
+
+
+def get_task(name):
+    if name not in _registry:
+        # Registered when its module is first imported
+        import_string(name)
+    return _registry[name]
+
+
+def enqueue(name, *args, run_at=None, unique_key=None, **kwargs):
+    """
+    Adds a call of the task `name` to the queue, to run as soon as
+    possible or at `run_at`.
+    """
+    _, max_attempts = get_task(name)
+
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+        unique_key=unique_key,
+    )
+
+
+def enqueue_periodic(now=None):
+    """
+    Enqueues the current run of each of `PERIODIC_TASKS` (task name ->
+    interval in seconds), unless already enqueued. Safe to call from every
+    worker, each run is keyed by its interval window.
+    """
+    now = now or timezone.now()
+    tasks = []
+
+    for name, interval in settings.PERIODIC_TASKS.items():
+        _, max_attempts = get_task(name)
+        window = int(now.timestamp() // interval)
+
+        tasks.append(
+            Task(
+                name=name,
+                run_at=now,
+                max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+                unique_key=f"{name}@{window}",
+            )
+        )
+
+    Task.objects.bulk_create(tasks, ignore_conflicts=True)
+
+
+def claim(worker_id):
+    """
+    Claims the next due task with `SELECT ... FOR UPDATE SKIP LOCKED`, so
+    workers never claim the same task. Returns None when none is due.
+    """
+    with transaction.atomic():
+        claimed = (
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.Status.PENDING, run_at__lte=timezone.now())
+            .order_by("run_at", "id")
+            .first()
+        )
+        if claimed is None:
+            return None
+
+        claimed.status = Task.Status.RUNNING
+        claimed.attempts += 1
+        claimed.locked_by = worker_id
+        claimed.locked_at = timezone.now()
+        claimed.save(
+            update_fields=["status", "attempts", "locked_by", "locked_at", "updated_at"]
+        )
+
+    return claimed
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.TASK_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def execute(claimed):
+    """
+    Runs a claimed task and records the outcome. Returns whether it
+    succeeded.
+    """
+    try:
+        func, _ = get_task(claimed.name)
+        func(*claimed.args, **claimed.kwargs)
+    except Exception as e:
+        if claimed.attempts < claimed.max_attempts:
+            status, run_at = Task.Status.PENDING, timezone.now()
+            run_at += retry_delay(claimed.attempts)
+            logger.warning(
+                "Task failed, will retry",
+                extra={"task_id": claimed.id, "task": claimed.name},
+            )
+        else:
+            status, run_at = Task.Status.FAILED, claimed.run_at
+            logger.exception(
+                "Task failed, giving up",
+                extra={"task_id": claimed.id, "task": claimed.name},
+            )
+
+        Task.objects.filter(pk=claimed.pk).update(
+            status=status,
+            run_at=run_at,
+            last_error=repr(e),
+            locked_by="",
+            locked_at=None,
+            updated_at=timezone.now(),
+        )
+        return False
+    finally:
+        close_old_connections()
+
+    Task.objects.filter(pk=claimed.pk).update(
+        status=Task.Status.DONE, locked_at=None, updated_at=timezone.now()
+    )
+    return True
+
+
+def housekeeping():
+    """
+    Enqueues due periodic tasks, puts back tasks of workers that died
+    (running for over `TASK_TIMEOUT` seconds) and deletes finished tasks
+    older than `TASK_RETENTION_DAYS`.
+    """
+    now = timezone.now()
+
+    enqueue_periodic(now)
+
+    stale = Task.objects.filter(
+        status=Task.Status.RUNNING,
+        locked_at__lt=now - timedelta(seconds=settings.TASK_TIMEOUT),
+    )
+    stale.filter(attempts__lt=F("max_attempts")).update(
+        status=Task.Status.PENDING,
+        run_at=now,
+        locked_by="",
+        locked_at=None,
+        updated_at=now,
+    )
+    stale.update(
+        status=Task.Status.FAILED,
+        last_error="Worker timed out",
+        locked_at=None,
+        updated_at=now,
+    )
+
+    Task.objects.filter(
+        status__in=[Task.Status.DONE, Task.Status.FAILED],
+        updated_at__lt=now - timedelta(days=settings.TASK_RETENTION_DAYS),
+    ).delete()
+
+
+def work(burst=False, poll_interval=None):
+    """
+    Worker loop: runs due tasks one at a time, polling when idle. With
+    `burst`, returns once no task is due. Returns the number of tasks run.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    poll_interval = poll_interval or settings.TASK_POLL_INTERVAL
+    housekept_at = 0
+    ran = 0
+
+    while True:
+        if time.monotonic() - housekept_at >= settings.TASK_HOUSEKEEPING_INTERVAL:
+            housekeeping()
+            housekept_at = time.monotonic()
+
+        claimed = claim(worker_id)
+
+        if claimed is None:
+            if burst:
+                return ran
+            time.sleep(poll_interval)
+            continue
+
+        execute(claimed)
+        ran += 1
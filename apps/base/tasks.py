@@ -0,0 +1,11 @@
+from .outbox import purge_delivered
+from .taskqueue import task
+
+
+@task
+def purge_outbox_events():
+    """
+    Deletes old delivered outbox events, run periodically (see
+    `PERIODIC_TASKS`).
+    """
+    purge_delivered()
@@ -1 +1,442 @@
-# Create your tests here.
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from apps.base import outbox, taskqueue, throttling
+from apps.base.images import build_variants
+from apps.base.models import City, Language, OutboxEvent, Task
+from apps.base.parsers import ORJSONParser
+from apps.base.renderers import ORJSONRenderer
+from apps.base.routers import PrimaryReplicaRouter, pin_to_primary, read_only
+from apps.base.taskqueue import task
+from apps.base.throttling import get_rejection_count
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=["replica_1", "replica_2"])
+class TestPrimaryReplicaRouter(SimpleTestCase):
+    # Unlike TestCase, tests are not wrapped in a transaction which would
+    # keep every read on the primary
+    databases = {"default"}
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.user = User(pk=1, email="user1@gmail.com", first_name="user1")
+        self.request = RequestFactory().get("/api/user/history")
+        self.request.user = self.user
+
+        patcher = mock.patch(
+            "apps.base.routers.is_replica_healthy", side_effect=lambda alias: True
+        )
+        self.is_replica_healthy = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_writes_go_to_primary(self):
+        with read_only(self.request):
+            self.assertEqual(self.router.db_for_write(City), "default")
+
+    def test_reads_outside_read_only_block_go_to_primary(self):
+        self.assertEqual(self.router.db_for_read(City), "default")
+
+    def test_read_only_reads_go_to_replica(self):
+        with read_only(self.request):
+            self.assertIn(self.router.db_for_read(City), ["replica_1", "replica_2"])
+
+    def test_reads_inside_transaction_go_to_primary(self):
+        with read_only(self.request), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(City), "default")
+
+    def test_pinned_user_reads_from_primary(self):
+        pin_to_primary(self.user.pk)
+
+        with read_only(self.request):
+            self.assertEqual(self.router.db_for_read(City), "default")
+
+    def test_unhealthy_replica_is_skipped(self):
+        self.is_replica_healthy.side_effect = lambda alias: alias == "replica_2"
+
+        with read_only(self.request):
+            self.assertEqual(self.router.db_for_read(City), "replica_2")
+
+    def test_falls_back_to_primary_without_healthy_replica(self):
+        self.is_replica_healthy.side_effect = lambda alias: False
+
+        with read_only(self.request):
+            self.assertEqual(self.router.db_for_read(City), "default")
+
+    def test_migrations_only_run_on_primary(self):
+        self.assertTrue(self.router.allow_migrate("default", "base"))
+        self.assertFalse(self.router.allow_migrate("replica_1", "base"))
+
+
+# Set up when DB_REPLICA_HOSTS is set, mirroring the test database
+HAS_TEST_REPLICA = "replica_1" in settings.DATABASES
+
+
+@skipUnless(HAS_TEST_REPLICA, "Needs the replica_1 test mirror")
+@override_settings(REPLICA_DATABASES=["replica_1"])
+class TestReplicaPinning(APITransactionTestCase):
+    # Unlike TestCase, tests are not wrapped in a transaction which would
+    # keep every read on the primary
+    databases = {"default", "replica_1"} if HAS_TEST_REPLICA else {"default"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="user1@gmail.com",
+            password="user@123",
+            first_name="user1",
+            last_name="A",
+            phone_number="9876543210",
+        )
+        res = self.client.post(
+            "/api/auth/login", {"email": self.user.email, "password": "user@123"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+        self.routed = []
+        db_for_read = PrimaryReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            alias = db_for_read(router, model, **hints)
+            self.routed.append(alias)
+            return alias
+
+        patcher = mock.patch.object(PrimaryReplicaRouter, "db_for_read", record)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_after_write_stay_on_primary(self):
+        res = self.client.get("/api/user/history")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("replica_1", self.routed)
+
+        res = self.client.patch("/api/user", {"first_name": "renamed"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.routed.clear()
+        res = self.client.get("/api/user/history")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.routed)
+        self.assertEqual(set(self.routed), {"default"})
+
+
+class TestScopedCacheThrottle(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        rates = {**api_settings.DEFAULT_THROTTLE_RATES, "listing": "2/min"}
+        patcher = mock.patch.object(api_settings, "DEFAULT_THROTTLE_RATES", rates)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_over_rate_are_rejected(self):
+        for _ in range(2):
+            res = self.client.get("/api/filters/cities")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get("/api/filters/cities")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(res["Retry-After"]), 0)
+        self.assertEqual(get_rejection_count("listing"), 1)
+
+    def test_previous_window_counts_while_it_overlaps(self):
+        window_end = (timezone.now().timestamp() // 60 + 1) * 60
+
+        with mock.patch.object(throttling.time, "time", return_value=window_end - 1):
+            for _ in range(2):
+                res = self.client.get("/api/filters/cities")
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        # A fixed window would allow 2 more requests right after its end
+        with mock.patch.object(throttling.time, "time", return_value=window_end + 1):
+            res = self.client.get("/api/filters/cities")
+            self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(int(res["Retry-After"]), 59)
+
+        with mock.patch.object(throttling.time, "time", return_value=window_end + 60):
+            res = self.client.get("/api/filters/cities")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_allowed_request_costs_one_cache_call(self):
+        self.client.get("/api/filters/cities")
+
+        with mock.patch.object(throttling, "cache", wraps=cache) as throttle_cache:
+            res = self.client.get("/api/filters/cities")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(throttle_cache.method_calls), 1)
+
+    def test_scopes_are_counted_separately(self):
+        for _ in range(2):
+            self.client.get("/api/filters/cities")
+
+        res = self.client.post("/api/auth/login", {})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestConditionalGet(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_unchanged_list_is_not_modified(self):
+        res = self.client.get("/api/filters/languages")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        etag = res["ETag"]
+
+        res = self.client.get("/api/filters/languages", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+        self.assertEqual(res["ETag"], etag)
+
+        # Other endpoints and query strings have their own ETag
+        res = self.client.get("/api/filters/genres", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Language.objects.create(name="Tamil")
+
+        res = self.client.get("/api/filters/languages", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [{"name": "tamil"}])
+        self.assertNotEqual(res["ETag"], etag)
+
+
+@override_settings(
+    MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_VARIANT_WIDTHS=[160, 320, 640, 1280]
+)
+class TestImageVariants(SimpleTestCase):
+    def make_image(self, width, height):
+        image_file = BytesIO()
+        Image.new("RGB", (width, height), "red").save(image_file, format="PNG")
+        image_file.seek(0)
+        return image_file
+
+    def test_variants_are_resized_without_upscaling(self):
+        variants = build_variants(self.make_image(800, 400), "movie_posters")
+
+        self.assertEqual(list(variants), ["160", "320", "640"])
+
+        with default_storage.open(variants["320"]) as variant_file:
+            variant = Image.open(variant_file)
+            self.assertEqual(variant.format, "WEBP")
+            self.assertEqual(variant.size, (320, 160))
+
+    def test_variants_are_named_after_content(self):
+        first = build_variants(self.make_image(200, 100), "movie_posters")
+        second = build_variants(self.make_image(200, 100), "movie_posters")
+
+        self.assertEqual(first, second)
+        self.assertTrue(first["160"].startswith("movie_posters/variants/"))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestMediaDelivery(SimpleTestCase):
+    def test_uploads_are_named_after_content(self):
+        first = default_storage.save("posters/leo.png", ContentFile(b"poster"))
+        second = default_storage.save("posters/leo.png", ContentFile(b"poster"))
+        other = default_storage.save("posters/leo.png", ContentFile(b"other"))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertRegex(first, r"^posters/leo\.[0-9a-f]{16}\.png$")
+
+    def test_hashed_looking_names_are_hashed(self):
+        stored = default_storage.save("posters/leo.png", ContentFile(b"poster"))
+        upload = default_storage.save(stored, ContentFile(b"other"))
+
+        self.assertNotEqual(upload, stored)
+        with default_storage.open(stored) as stored_file:
+            self.assertEqual(stored_file.read(), b"poster")
+        with default_storage.open(upload) as upload_file:
+            self.assertEqual(upload_file.read(), b"other")
+
+    def test_hashed_files_are_cached_forever(self):
+        name = default_storage.save("posters/leo.png", ContentFile(b"poster"))
+
+        res = self.client.get(f"/media/{name}")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("immutable", res["Cache-Control"])
+        self.assertEqual(b"".join(res.streaming_content), b"poster")
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    def test_accel_redirect_hands_file_to_web_server(self):
+        name = default_storage.save("posters/leo.png", ContentFile(b"poster"))
+
+        res = self.client.get(f"/media/{name}")
+        self.assertEqual(res["X-Accel-Redirect"], f"/protected-media/{name}")
+        self.assertEqual(res.content, b"")
+
+    def test_missing_file(self):
+        res = self.client.get("/media/posters/missing.png")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(OUTBOX_MAX_ATTEMPTS=2)
+class TestOutbox(TestCase):
+    def setUp(self):
+        self.delivered = []
+        self.failing_keys = set()
+
+        def handler(payload):
+            if payload["key"] in self.failing_keys:
+                raise RuntimeError("Handler failed")
+            self.delivered.append(payload["n"])
+
+        outbox.handles("test.event")(handler)
+        self.addCleanup(outbox._handlers["test.event"].remove, handler)
+
+    def publish(self, key, n):
+        return outbox.publish("test.event", key, {"key": key, "n": n})
+
+    def test_events_delivered_in_order(self):
+        for n in range(3):
+            self.publish("slot:1", n)
+
+        self.assertEqual(outbox.drain(batch_size=2), 3)
+        self.assertEqual(self.delivered, [0, 1, 2])
+        self.assertFalse(
+            OutboxEvent.objects.exclude(status=OutboxEvent.Status.DELIVERED).exists()
+        )
+
+    def test_failed_event_holds_back_its_key(self):
+        self.failing_keys.add("slot:1")
+        first = self.publish("slot:1", 0)
+        self.publish("slot:1", 1)
+        self.publish("slot:2", 2)
+
+        self.assertEqual(outbox.drain(), 1)
+        self.assertEqual(self.delivered, [2])
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, OutboxEvent.Status.PENDING)
+        self.assertEqual(first.attempts, 1)
+        self.assertGreater(first.available_at, timezone.now())
+
+        # Retried once due, in order
+        self.failing_keys.clear()
+        OutboxEvent.objects.filter(pk=first.pk).update(available_at=timezone.now())
+
+        self.assertEqual(outbox.drain(), 2)
+        self.assertEqual(self.delivered, [2, 0, 1])
+
+    def test_event_fails_after_max_attempts(self):
+        self.failing_keys.add("slot:1")
+        event = self.publish("slot:1", 0)
+
+        for _ in range(2):
+            OutboxEvent.objects.filter(pk=event.pk).update(available_at=timezone.now())
+            outbox.dispatch_batch()
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, OutboxEvent.Status.FAILED)
+        self.assertIn("Handler failed", event.last_error)
+
+    def test_old_delivered_events_are_purged(self):
+        self.failing_keys.add("slot:2")
+        for n in range(3):
+            self.publish("slot:1", n)
+        failed = self.publish("slot:2", 3)
+        outbox.drain()
+        OutboxEvent.objects.update(updated_at=timezone.now() - timedelta(days=8))
+
+        recent = self.publish("slot:1", 4)
+        outbox.drain()
+
+        self.assertEqual(outbox.purge_delivered(batch_size=2), 3)
+        self.assertCountEqual(
+            OutboxEvent.objects.values_list("id", flat=True), [failed.id, recent.id]
+        )
+
+
+task_calls = []
+
+
+@task(max_attempts=2)
+def record_task_call(value, fail=False):
+    if fail:
+        raise RuntimeError("Task failed")
+    task_calls.append(value)
+
+
+@override_settings(PERIODIC_TASKS={})
+class TestTaskQueue(TestCase):
+    def setUp(self):
+        task_calls.clear()
+
+    def test_enqueued_task_runs(self):
+        record_task_call.enqueue(1)
+        record_task_call.enqueue(2, run_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(taskqueue.work(burst=True), 1)
+        self.assertEqual(task_calls, [1])
+        self.assertEqual(
+            list(Task.objects.order_by("id").values_list("status", flat=True)),
+            [Task.Status.DONE, Task.Status.PENDING],
+        )
+
+    def test_failed_task_retried_with_backoff(self):
+        queued = record_task_call.enqueue(1, fail=True)
+
+        taskqueue.work(burst=True)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.Status.PENDING)
+        self.assertEqual(queued.attempts, 1)
+        self.assertGreater(queued.run_at, timezone.now())
+
+        Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        taskqueue.work(burst=True)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.Status.FAILED)
+        self.assertIn("Task failed", queued.last_error)
+
+    @override_settings(PERIODIC_TASKS={"apps.base.tests.record_task_call": 3600})
+    def test_periodic_task_enqueued_once_per_interval(self):
+        taskqueue.enqueue_periodic()
+        taskqueue.enqueue_periodic()
+
+        self.assertEqual(Task.objects.count(), 1)
+
+
+class TestORJSON(SimpleTestCase):
+    def test_renders_like_json_renderer(self):
+        data = {
+            "date_time": timezone.now(),
+            "release_date": timezone.localdate(),
+            "duration": timedelta(hours=2, minutes=30),
+            "price": Decimal("180.50"),
+            "name": "Caf\u00e9 \u2028",
+            "seats": [(1, 2), (1, 3)],
+            4: None,
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_parses_json(self):
+        body = BytesIO('{"name": "Caf\u00e9", "seats": [1, 2]}'.encode())
+        self.assertEqual(
+            ORJSONParser().parse(body), {"name": "Caf\u00e9", "seats": [1, 2]}
+        )
+
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"price": NaN}'))
@@ -0,0 +1,118 @@
+import logging
+import math
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+
+def rejection_count_key(scope):
+    return f"throttle:{scope}:rejected"
+
+
+def get_rejection_count(scope):
+    """
+    Returns the number of requests rejected for the scope so far.
+    """
+    return cache.get(rejection_count_key(scope), 0)
+
+
+# A window counter holds the previous window's count in its high bits
+COUNT_BITS = 32
+COUNT_MASK = (1 << COUNT_BITS) - 1
+
+
+class ScopedCacheThrottle(SimpleRateThrottle):
+    """
+    Sliding window rate limit per view scope, backed by the shared cache.
+
+    - Views opt in by setting `throttle_scope`, the rate is looked up in
+      `DEFAULT_THROTTLE_RATES` (e.g. "10/min")
+    - Authenticated requests are limited per user, anonymous ones per IP
+    - Requests are counted per fixed window, and the count of the previous
+      window is weighted by how much of it still overlaps the sliding
+      window, so a burst across a window boundary cannot double the rate
+    - The counter of a window also holds the final count of the previous
+      window, copied when the window starts, so a request costs a single
+      increment of the cache (plus a read and an add for the first request
+      of a window), unlike `SimpleRateThrottle` which reads and rewrites a
+      history list
+    - Rejected requests count towards the rate, get a `Retry-After`
+      header, and are logged and counted per scope
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        # Rate is determined by the view, see `allow_request`
+        pass
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None)
+        if not self.scope:
+            return True
+
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.num_requests, self.duration = self.parse_rate(rate)
+        if self.num_requests is None:
+            return True
+
+        self.now = time.time()
+        window = int(self.now // self.duration)
+        key = self.get_cache_key(request, view)
+        current_key = f"{key}:{window}"
+
+        try:
+            value = cache.incr(current_key)
+        except ValueError:
+            # Windows are kept while they are the current or the previous one
+            previous = cache.get(f"{key}:{window - 1}", 0) & COUNT_MASK
+            value = (previous << COUNT_BITS) + 1
+            if not cache.add(current_key, value, 2 * self.duration):
+                value = cache.incr(current_key)
+
+        self.count = value & COUNT_MASK
+        self.previous = value >> COUNT_BITS
+        overlap = 1 - (self.now % self.duration) / self.duration
+
+        if self.count + self.previous * overlap <= self.num_requests:
+            return True
+
+        self.throttle_failure_for(request)
+        return False
+
+    def throttle_failure_for(self, request):
+        logger.warning(
+            "Request throttled",
+            extra={"scope": self.scope, "path": request.path},
+        )
+
+        key = rejection_count_key(self.scope)
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+    def wait(self):
+        """
+        Seconds until the weighted count allows one more request.
+        """
+        elapsed = self.now % self.duration
+
+        if self.count < self.num_requests:
+            # Once enough of the previous window has slid out
+            fraction = 1 - (self.num_requests - self.count - 1) / self.previous
+            return max(math.ceil(fraction * self.duration - elapsed), 1)
+
+        # Once enough of the current window has slid out, in the next one
+        fraction = 1 - (self.num_requests - 1) / self.count
+        return math.ceil(self.duration - elapsed + fraction * self.duration)
@@ -1,11 +1,24 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.views import View
 from rest_framework import generics, permissions
 
+from apps.base.conditional import ConditionalGetMixin
 from apps.base.models import City, Genre, Language
 from apps.base.serializers import CitySerializer, GenreSerializer, LanguageSerializer
+from apps.base.storage import is_hashed_name
 
 
-class BaseListView(generics.ListAPIView):
+class BaseListView(ConditionalGetMixin, generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "listing"
 
 
 class LanguageListView(BaseListView):
@@ -15,6 +28,7 @@ class LanguageListView(BaseListView):
     Description:
         - Returns list of all languages
         - Cursor paginated
+        - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
 
     Response:
         200 OK
@@ -31,6 +45,7 @@ class LanguageListView(BaseListView):
 
     queryset = Language.objects.all()
     serializer_class = LanguageSerializer
+    etag_models = [Language]
     pagination_class = None
 
 
@@ -41,6 +56,7 @@ class GenreListView(BaseListView):
     Description:
         - Returns list of all genres
         - Cursor paginated
+        - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
 
     Response:
         200 OK
@@ -57,6 +73,7 @@ class GenreListView(BaseListView):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    etag_models = [Genre]
     pagination_class = None
 
 
@@ -67,6 +84,7 @@ class CityListView(BaseListView):
     Description:
         - Returns list of all cities
         - Cursor paginated
+        - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
 
     Response:
         200 OK
@@ -83,4 +101,58 @@ class CityListView(BaseListView):
 
     queryset = City.objects.all()
     serializer_class = CitySerializer
+    etag_models = [City]
     pagination_class = None
+
+
+class MediaFileView(View):
+    """
+    GET /media/<path>
+
+    Description:
+        - Serves uploaded media files
+        - With `MEDIA_ACCEL_REDIRECT_PREFIX` (nginx) or `MEDIA_SENDFILE_HEADER`
+          (apache/lighttpd) set, only headers are returned and the web server
+          sends the file
+        - Content hashed files are cached forever (`immutable`), others for
+          `MEDIA_CACHE_MAX_AGE` seconds
+
+    Errors:
+        404 Not Found:
+            - File not found
+    """
+
+    def get(self, request, path):
+        try:
+            full_path = default_storage.path(path)
+        except SuspiciousFileOperation:
+            raise Http404("File not found") from None
+
+        if not os.path.isfile(full_path):
+            raise Http404("File not found")
+
+        if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+            response = HttpResponse()
+            response["X-Accel-Redirect"] = (
+                settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + path
+            )
+        elif settings.MEDIA_SENDFILE_HEADER:
+            response = HttpResponse()
+            response[settings.MEDIA_SENDFILE_HEADER] = full_path
+        else:
+            response = FileResponse(default_storage.open(path))
+            response["Last-Modified"] = http_date(os.path.getmtime(full_path))
+
+        content_type, encoding = mimetypes.guess_type(full_path)
+        response["Content-Type"] = content_type or "application/octet-stream"
+
+        if is_hashed_name(path):
+            patch_cache_control(
+                response, public=True, max_age=60 * 60 * 24 * 365, immutable=True
+            )
+        else:
+            patch_cache_control(
+                response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+            )
+
+        return response
@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.slots.models import ArchivedSlot, Slot
+
+from .models import ArchivedBooking, ArchivedSeat, Booking, Seat
+from .partitions import ensure_partitions
+
+SLOT_FIELDS = [
+    "id",
+    "date_time",
+    "price",
+    "movie_id",
+    "cinema_id",
+    "language_id",
+    "created_at",
+    "updated_at",
+]
+BOOKING_FIELDS = ["id", "status", "user_id", "slot_id", "created_at", "updated_at"]
+SEAT_FIELDS = ["id", "row", "number", "booking_id", "created_at", "updated_at"]
+
+# Archived seats are partitioned by the local date of their show
+SHOW_TIME_FIELD = "booking__slot__date_time"
+
+
+def archive_cutoff():
+    """
+    Slots shown before this time are archived.
+    """
+    return timezone.now() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Moves up to `batch_size` slots shown before `cutoff`, with their
+    bookings and seats, to the archive tables in a single transaction.
+
+    Returns the number of slots archived.
+    """
+    with transaction.atomic():
+        slot_ids = list(
+            Slot.objects.select_for_update(skip_locked=True)
+            .filter(date_time__lt=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not slot_ids:
+            return 0
+
+        slots = Slot.objects.filter(id__in=slot_ids)
+        bookings = Booking.objects.filter(slot_id__in=slot_ids)
+        seats = Seat.objects.filter(booking__slot_id__in=slot_ids)
+
+        ArchivedSlot.objects.bulk_create(
+            ArchivedSlot(**slot) for slot in slots.values(*SLOT_FIELDS)
+        )
+        ArchivedBooking.objects.bulk_create(
+            (
+                ArchivedBooking(**booking)
+                for booking in bookings.values(*BOOKING_FIELDS)
+            ),
+            batch_size=batch_size,
+        )
+        ArchivedSeat.objects.bulk_create(
+            (
+                ArchivedSeat(
+                    show_date=timezone.localdate(seat.pop(SHOW_TIME_FIELD)), **seat
+                )
+                for seat in seats.values(*SEAT_FIELDS, SHOW_TIME_FIELD).iterator(
+                    chunk_size=batch_size
+                )
+            ),
+            batch_size=batch_size,
+        )
+
+        # Children first, each in a single DELETE
+        seats.delete()
+        bookings.delete()
+        slots.delete()
+
+    return len(slot_ids)
+
+
+def archive_slots(cutoff=None, batch_size=None):
+    """
+    Archives every slot shown before `cutoff` (defaults to
+    `ARCHIVE_AFTER_DAYS` ago), batch by batch.
+
+    Returns the number of slots archived.
+    """
+    cutoff = cutoff or archive_cutoff()
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    total = 0
+
+    # Partitions are created upfront, outside of the batch transactions
+    oldest = Slot.objects.filter(date_time__lt=cutoff).aggregate(
+        oldest=Min("date_time")
+    )["oldest"]
+    if oldest is not None:
+        ensure_partitions(timezone.localdate(oldest), timezone.localdate(cutoff))
+
+    while archived := archive_batch(cutoff, batch_size):
+        total += archived
+
+    return total
@@ -0,0 +1,137 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from functools import partial
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.base import outbox
+from apps.slots.capacity import release_seats
+from apps.slots.models import Slot
+from apps.slots.versions import bump_slot_versions
+
+from .models import Booking, Seat
+from .signals import seats_released
+
+# Bookings can be cancelled by users up to this long before the show
+CANCELLATION_WINDOW = timedelta(hours=4)
+
+
+def _cancel(bookings):
+    """
+    Cancels the active bookings among `bookings` (a queryset) in a single
+    conditional UPDATE, and releases their seats in the same transaction:
+    `seats_released` is sent and a "booking.cancelled" outbox event
+    published per slot, whose handlers update the sales rollups and seat
+    demand after the slot's earlier booking events. Cached seat counts and
+    the slot versions are released and bumped once the transaction
+    commits.
+
+    Returns the ids of the bookings cancelled.
+    """
+    booking_table = connection.ops.quote_name(Booking._meta.db_table)
+    subquery, params = bookings.values("id").order_by().query.sql_with_params()
+
+    # The status is checked again on the updated rows, so a booking is only
+    # cancelled (and its seats released) once under concurrent requests
+    sql = (
+        f"UPDATE {booking_table} SET status = %s, updated_at = %s "
+        f"WHERE status = %s AND id IN ({subquery}) "
+        "RETURNING id, slot_id"
+    )
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql,
+                [
+                    Booking.Status.CANCELLED,
+                    connection.ops.adapt_datetimefield_value(timezone.now()),
+                    Booking.Status.BOOKED,
+                    *params,
+                ],
+            )
+            cancelled = cursor.fetchall()
+
+        if not cancelled:
+            return []
+
+        booking_ids = defaultdict(list)
+        for booking_id, slot_id in cancelled:
+            booking_ids[slot_id].append(booking_id)
+
+        seats = defaultdict(list)
+        for slot_id, row, number in Seat.objects.filter(
+            booking_id__in=[booking_id for booking_id, _ in cancelled]
+        ).values_list("booking__slot_id", "row", "number"):
+            seats[slot_id].append((row, number))
+
+        prices = dict(
+            Slot.objects.filter(id__in=booking_ids).values_list("id", "price")
+        )
+
+        for slot_id, slot_booking_ids in booking_ids.items():
+            slot_seats = seats[slot_id]
+
+            seats_released.send(
+                sender=Booking,
+                slot_id=slot_id,
+                booking_ids=slot_booking_ids,
+                seats=slot_seats,
+            )
+            outbox.publish(
+                "booking.cancelled",
+                key=f"slot:{slot_id}",
+                payload={
+                    "slot_id": slot_id,
+                    "booking_ids": slot_booking_ids,
+                    "price": prices[slot_id],
+                    "seats": slot_seats,
+                },
+            )
+
+            transaction.on_commit(partial(release_seats, slot_id, len(slot_seats)))
+
+        # Not sent by the UPDATE
+        bump_slot_versions(list(booking_ids))
+
+    return [booking_id for booking_id, _ in cancelled]
+
+
+def cancel_booking(booking_id, user_id):
+    """
+    Cancels an active booking of a user, unless its show starts within
+    `CANCELLATION_WINDOW`.
+
+    Returns whether the booking was cancelled.
+    """
+    bookings = Booking.objects.filter(
+        id=booking_id,
+        user_id=user_id,
+        slot__date_time__gte=timezone.now() + CANCELLATION_WINDOW,
+    )
+    return bool(_cancel(bookings))
+
+
+def cancel_slot_bookings(slot_id):
+    """
+    Cancels every active booking of a slot, e.g. when the show is called
+    off. Returns the ids of the bookings cancelled.
+    """
+    return _cancel(Booking.objects.filter(slot_id=slot_id))
+
+
+def cancel_cinema_day_bookings(cinema_id, day):
+    """
+    Cancels every active booking of the shows of a cinema on a date.
+    Returns the ids of the bookings cancelled.
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min))
+
+    return _cancel(
+        Booking.objects.filter(
+            slot__cinema_id=cinema_id,
+            slot__date_time__gte=start,
+            slot__date_time__lt=start + timedelta(days=1),
+        )
+    )
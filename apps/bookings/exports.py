@@ -0,0 +1,137 @@
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import ArchivedSeat, Booking, Seat
+
+EXPORT_COLUMNS = [
+    "booking_id",
+    "booked_at",
+    "status",
+    "user_email",
+    "slot_id",
+    "show_time",
+    "movie",
+    "cinema",
+    "city",
+    "language",
+    "price",
+    "seat_count",
+    "total_price",
+    "seats",
+]
+
+# Rows fetched per round trip of the server side cursor
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_booking_rows(start_date, end_date):
+    """
+    Yields one row (ordered as `EXPORT_COLUMNS`) per booking made between
+    `start_date` and `end_date` (inclusive), in constant memory. Live
+    bookings come first, then archived ones.
+
+    Seats are read as flat tuples through a server side cursor, ordered by
+    booking, and folded into their booking's row on the fly.
+    """
+    start = timezone.make_aware(datetime.combine(start_date, time.min))
+    end = timezone.make_aware(datetime.combine(end_date, time.max))
+
+    # Archived seats share the relation names of live ones
+    for model in (Seat, ArchivedSeat):
+        yield from _iter_rows(model, start, end)
+
+
+def _iter_rows(seat_model, start, end):
+    seats = (
+        seat_model.objects.filter(booking__created_at__range=(start, end))
+        .order_by("booking_id", "row", "number")
+        .values_list(
+            "booking_id",
+            "booking__created_at",
+            "booking__status",
+            "booking__user__email",
+            "booking__slot_id",
+            "booking__slot__date_time",
+            "booking__slot__movie__name",
+            "booking__slot__cinema__name",
+            "booking__slot__cinema__city__name",
+            "booking__slot__language__name",
+            "booking__slot__price",
+            "row",
+            "number",
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    for _, booking_seats in groupby(seats, key=lambda seat: seat[0]):
+        # Seats of a single booking, so at most a few rows
+        booking_seats = list(booking_seats)
+
+        booking_id, booked_at, status, *slot, price, _, _ = booking_seats[0]
+        seat_labels = [f"{row}-{number}" for *_, row, number in booking_seats]
+
+        yield (
+            booking_id,
+            booked_at,
+            Booking.Status(status).name,
+            *slot,
+            price,
+            len(seat_labels),
+            len(seat_labels) * price,
+            " ".join(seat_labels),
+        )
+
+
+class Echo:
+    """
+    File-like object returning what is written, lets `csv.writer` produce
+    lines for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(
+            dict(zip(EXPORT_COLUMNS, row, strict=True)), cls=DjangoJSONEncoder
+        )
+        yield "\n"
+
+
+RENDERERS = {
+    "csv": (render_csv, "text/csv"),
+    "ndjson": (render_ndjson, "application/x-ndjson"),
+}
+
+
+def parse_export_range(start, end):
+    """
+    Parses the ISO dates (YYYY-MM-DD) bounding an export, both optional,
+    defaulting to yesterday.
+
+    Raises ValueError for malformed dates or an inverted range.
+    """
+    yesterday = timezone.localdate() - timedelta(days=1)
+
+    start_date = date.fromisoformat(start) if start else yesterday
+    end_date = date.fromisoformat(end) if end else max(start_date, yesterday)
+
+    if start_date > end_date:
+        raise ValueError("Start date must not be after end date")
+
+    return start_date, end_date
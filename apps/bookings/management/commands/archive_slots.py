@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.bookings.archive import archive_slots
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves slots shown more than --days ago, with their bookings and "
+        "seats, to the archive tables in batched transactions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        archived = archive_slots(cutoff, options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} slot(s)"))
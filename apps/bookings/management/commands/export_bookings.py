@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.bookings.exports import RENDERERS, iter_booking_rows, parse_export_range
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports the bookings made in a date range (defaults to yesterday) "
+        "as CSV or NDJSON, streamed in constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First booking date, YYYY-MM-DD")
+        parser.add_argument("--end", help="Last booking date, YYYY-MM-DD")
+        parser.add_argument("--format", choices=list(RENDERERS), default="csv")
+        parser.add_argument("--output", help="File to write, defaults to stdout")
+
+    def handle(self, *args, **options):
+        try:
+            start_date, end_date = parse_export_range(options["start"], options["end"])
+        except ValueError as e:
+            raise CommandError(e) from e
+
+        render, _ = RENDERERS[options["format"]]
+        rows = iter_booking_rows(start_date, end_date)
+
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(render(rows))
+        else:
+            for chunk in render(rows):
+                self.stdout.write(chunk, ending="")
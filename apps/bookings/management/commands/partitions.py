@@ -0,0 +1,63 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.bookings.partitions import (
+    detach_partition,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    next_month,
+)
+
+
+def parse_month(value):
+    try:
+        return date.fromisoformat(f"{value}-01")
+    except ValueError as error:
+        raise CommandError(f"Invalid month {value!r}, expected YYYY-MM") from error
+
+
+class Command(BaseCommand):
+    help = (
+        "Manages the monthly partitions of the archived seats (PostgreSQL "
+        "only): create the partitions from --from (defaults to the current "
+        "month) up to --months-ahead, detach the partition of a month, or "
+        "list the partitions."
+    )
+
+    def add_arguments(self, parser):
+        subcommands = parser.add_subparsers(dest="action", required=True)
+
+        create = subcommands.add_parser("create")
+        create.add_argument("--from", dest="start", type=parse_month)
+        create.add_argument("--months-ahead", type=int, default=3)
+
+        detach = subcommands.add_parser("detach")
+        detach.add_argument("month", type=parse_month)
+
+        subcommands.add_parser("list")
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            raise CommandError("Partitions are only supported on PostgreSQL")
+
+        if options["action"] == "list":
+            for name in list_partitions():
+                self.stdout.write(name)
+            return
+
+        if options["action"] == "detach":
+            name = detach_partition(options["month"])
+            self.stdout.write(self.style.SUCCESS(f"Detached {name}"))
+            return
+
+        start = month_start(timezone.localdate())
+        end = start
+        for _ in range(options["months_ahead"]):
+            end = next_month(end)
+
+        created = ensure_partitions(options["start"] or start, end)
+        self.stdout.write(self.style.SUCCESS(f"Ensured {len(created)} partition(s)"))
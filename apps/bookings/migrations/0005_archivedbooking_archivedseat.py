@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_alter_booking_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('status', models.IntegerField(choices=[(0, 'Cancelled'), (1, 'Booked')])),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedSeat',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('row', models.PositiveIntegerField()),
+                ('number', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+    ]
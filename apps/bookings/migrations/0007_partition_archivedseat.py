@@ -0,0 +1,125 @@
+# Generated by Django 6.0.1 on 2026-10-19 13:05
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# Months of partitions created up front, around the current month
+PARTITIONS_BACK = 24
+PARTITIONS_AHEAD = 3
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def create_partitioned_table(apps, schema_editor):
+    model = apps.get_model("bookings", "ArchivedSeat")
+
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.create_model(model)
+        return
+
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+
+    sql, params = schema_editor.table_sql(model)
+    schema_editor.execute(
+        f"{sql} PARTITION BY RANGE ({quote('show_date')})", params or None
+    )
+    schema_editor.deferred_sql.extend(schema_editor._model_indexes_sql(model))
+
+    schema_editor.execute(
+        f"CREATE TABLE {quote(table + '_default')} PARTITION OF {quote(table)} DEFAULT"
+    )
+
+    month = month_start(timezone.localdate())
+    for _ in range(PARTITIONS_BACK):
+        month = month_start(month - timedelta(days=1))
+
+    for _ in range(PARTITIONS_BACK + PARTITIONS_AHEAD + 1):
+        schema_editor.execute(
+            f"CREATE TABLE {quote(f'{table}_{month:%Y_%m}')} "
+            f"PARTITION OF {quote(table)} "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{next_month(month).isoformat()}')"
+        )
+        month = next_month(month)
+
+
+def drop_partitioned_table(apps, schema_editor):
+    # Dropping the parent drops its partitions
+    schema_editor.delete_model(apps.get_model("bookings", "ArchivedSeat"))
+
+
+def copy_archived_seats(apps, schema_editor):
+    LegacySeat = apps.get_model("bookings", "ArchivedSeatLegacy")
+    ArchivedSeat = apps.get_model("bookings", "ArchivedSeat")
+
+    seats = LegacySeat.objects.values(
+        "id",
+        "row",
+        "number",
+        "booking_id",
+        "created_at",
+        "updated_at",
+        "booking__slot__date_time",
+    )
+
+    ArchivedSeat.objects.bulk_create(
+        (
+            ArchivedSeat(
+                show_date=timezone.localdate(seat.pop("booking__slot__date_time")),
+                **seat,
+            )
+            for seat in seats.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_archivedbooking_slot_archivedbooking_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='ArchivedSeat',
+            new_name='ArchivedSeatLegacy',
+        ),
+        migrations.AlterField(
+            model_name='archivedseatlegacy',
+            name='booking',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='bookings.archivedbooking'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ArchivedSeat',
+                    fields=[
+                        ('pk', models.CompositePrimaryKey('id', 'show_date', blank=True, editable=False, primary_key=True, serialize=False)),
+                        ('id', models.BigIntegerField()),
+                        ('show_date', models.DateField()),
+                        ('row', models.PositiveIntegerField()),
+                        ('number', models.PositiveIntegerField()),
+                        ('created_at', models.DateTimeField()),
+                        ('updated_at', models.DateTimeField()),
+                        ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seats', to='bookings.archivedbooking')),
+                    ],
+                ),
+            ],
+        ),
+        migrations.RunPython(create_partitioned_table, drop_partitioned_table),
+        migrations.RunPython(copy_archived_seats, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='ArchivedSeatLegacy',
+        ),
+    ]
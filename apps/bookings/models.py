@@ -3,7 +3,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 
 from apps.base.models import TimeStampModel
-from apps.slots.models import Slot
+from apps.slots.models import ArchivedSlot, Slot
 
 
 class Booking(TimeStampModel):
@@ -82,3 +82,64 @@ class Seat(TimeStampModel):
 
     def __str__(self):
         return f"{self.row} - {self.number}"
+
+
+class ArchivedBooking(models.Model):
+    """
+    Booking of an archived slot, with its original id and timestamps.
+    Shares the attribute names of `Booking`, so it serializes the same.
+
+    Attributes:
+        status (int): Booking status (BOOKED or CANCELLED).
+        user (ForeignKey): User who made the booking.
+        slot (ForeignKey): Archived slot of the booking.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    status = models.IntegerField(choices=Booking.Status.choices)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_bookings",
+    )
+    slot = models.ForeignKey(
+        ArchivedSlot, on_delete=models.CASCADE, related_name="bookings"
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "-created_at", "-id"])]
+
+    def __str__(self):
+        return f"Archived booking #{self.id}"
+
+
+class ArchivedSeat(models.Model):
+    """
+    Seat of an archived booking, with its original id and timestamps.
+
+    On PostgreSQL the table is range partitioned by month of `show_date`
+    (see `apps.bookings.partitions`), which is part of the primary key as
+    partitioned tables require.
+
+    Attributes:
+        row (int): Seat row.
+        number (int): Seat number within the row.
+        show_date (date): Local date of the show, the partition key.
+        booking (ForeignKey): Archived booking reference.
+    """
+
+    pk = models.CompositePrimaryKey("id", "show_date")
+    id = models.BigIntegerField()
+    show_date = models.DateField()
+    row = models.PositiveIntegerField()
+    number = models.PositiveIntegerField()
+    booking = models.ForeignKey(
+        ArchivedBooking, on_delete=models.CASCADE, related_name="seats"
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.row} - {self.number}"
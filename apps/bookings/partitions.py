@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.db import connection
+
+from .models import ArchivedSeat
+
+# Monthly range partitions of the archived seats on PostgreSQL, named
+# `<table>_<YYYY>_<MM>`, plus a default partition catching any show date
+# without a partition yet
+
+
+def is_partitioned():
+    return connection.vendor == "postgresql"
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def partition_name(month):
+    return f"{ArchivedSeat._meta.db_table}_{month:%Y_%m}"
+
+
+def create_partition(month):
+    """
+    Creates the partition of the month of `month`, if missing.
+    """
+    month = month_start(month)
+    quote = connection.ops.quote_name
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote(partition_name(month))} "
+            f"PARTITION OF {quote(ArchivedSeat._meta.db_table)} "
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{next_month(month).isoformat()}')"
+        )
+
+    return partition_name(month)
+
+
+def ensure_partitions(start, end):
+    """
+    Creates the missing partitions of the months from `start` to `end`.
+    Call before inserting rows, a month cannot get its own partition once
+    its rows are in the default partition.
+    """
+    if not is_partitioned():
+        return []
+
+    month, created = month_start(start), []
+
+    while month <= end:
+        created.append(create_partition(month))
+        month = next_month(month)
+
+    return created
+
+
+def list_partitions():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s ORDER BY child.relname",
+            [ArchivedSeat._meta.db_table],
+        )
+        return [name for (name,) in cursor.fetchall()]
+
+
+def detach_partition(month):
+    """
+    Detaches the partition of a month, which becomes a standalone table
+    that can be dumped and dropped without touching the other months.
+    """
+    quote = connection.ops.quote_name
+    name = partition_name(month_start(month))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {quote(ArchivedSeat._meta.db_table)} "
+            f"DETACH PARTITION {quote(name)}"
+        )
+
+    return name
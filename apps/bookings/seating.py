@@ -0,0 +1,84 @@
+import heapq
+
+from .models import Booking, Seat
+
+FREE, TAKEN = 0, 1
+
+
+def occupancy_bitmap(slot_id, rows, seats_per_row):
+    """
+    Returns the seats of a slot as a row major bytearray, `TAKEN` for the
+    seats of active bookings, read in a single query.
+    """
+    bitmap = bytearray(rows * seats_per_row)
+
+    booked = Seat.objects.filter(
+        booking__slot_id=slot_id, booking__status=Booking.Status.BOOKED
+    ).values_list("row", "number")
+
+    for row, number in booked:
+        if 1 <= row <= rows and 1 <= number <= seats_per_row:
+            bitmap[(row - 1) * seats_per_row + number - 1] = TAKEN
+
+    return bitmap
+
+
+def _seat_score(row, number, rows, seats_per_row):
+    # Distance from the centre of the hall, rows and seats weighted equally
+    return (
+        abs(row - (rows + 1) / 2) / rows
+        + abs(number - (seats_per_row + 1) / 2) / seats_per_row
+    )
+
+
+def find_best_seats(bitmap, rows, seats_per_row, count):
+    """
+    Picks `count` free seats from an occupancy bitmap, as `(row, number)`
+    pairs.
+
+    The best contiguous block in a single row is preferred, the one whose
+    centre is closest to the centre of the hall. When no row has enough
+    contiguous free seats, the free seats closest to the centre are picked
+    instead. Runs in O(rows * seats_per_row).
+
+    Returns None when fewer than `count` seats are free.
+    """
+    best_block, best_score = None, None
+    centre_start = (seats_per_row - count) // 2
+
+    for row in range(1, rows + 1):
+        offset = (row - 1) * seats_per_row
+        number = 0
+
+        while number < seats_per_row:
+            if bitmap[offset + number] != FREE:
+                number += 1
+                continue
+
+            run_start = number
+            while number < seats_per_row and bitmap[offset + number] == FREE:
+                number += 1
+
+            # Within a free run, the block closest to the centre of the row
+            if number - run_start >= count:
+                start = min(max(centre_start, run_start), number - count)
+                score = _seat_score(row, start + (count + 1) / 2, rows, seats_per_row)
+
+                if best_score is None or score < best_score:
+                    best_block, best_score = (row, start), score
+
+    if best_block is not None:
+        row, start = best_block
+        return [(row, start + index + 1) for index in range(count)]
+
+    free_seats = (
+        (row, number)
+        for row in range(1, rows + 1)
+        for number in range(1, seats_per_row + 1)
+        if bitmap[(row - 1) * seats_per_row + number - 1] == FREE
+    )
+    seats = heapq.nsmallest(
+        count, free_seats, key=lambda seat: _seat_score(*seat, rows, seats_per_row)
+    )
+
+    return sorted(seats) if len(seats) == count else None
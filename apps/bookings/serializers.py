@@ -2,11 +2,15 @@ from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from django.utils import timezone
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
+from apps.base import outbox
+from apps.slots import waiting_room
+from apps.slots.capacity import get_remaining_seats, is_sold_out, reserve_seats
 from apps.slots.models import Slot
 
 from .models import Booking, Seat
+from .seating import find_best_seats, occupancy_bitmap
 
 
 class SeatSerializer(serializers.ModelSerializer):
@@ -81,6 +85,19 @@ class BookingCreateSerializer(serializers.Serializer):
     seats = SeatSerializer(many=True)
 
     def validate_slot_id(self, value):
+        request = self.context["request"]
+
+        admitted = waiting_room.has_admission(
+            value, request.user.id, request.headers.get("X-Queue-Token")
+        )
+        if not admitted:
+            raise PermissionDenied("Join the waiting room of this slot before booking")
+
+        # Sold out slots are rejected from the cached count, before the
+        # slot is even loaded
+        if is_sold_out(value):
+            raise serializers.ValidationError("Slot is sold out")
+
         try:
             slot = Slot.objects.get(id=value)
         except Slot.DoesNotExist:
@@ -91,28 +108,48 @@ class BookingCreateSerializer(serializers.Serializer):
 
         return value
 
+    def validate(self, attrs):
+        remaining_seats = get_remaining_seats(attrs["slot_id"])
+
+        if remaining_seats is not None and len(attrs["seats"]) > remaining_seats:
+            raise serializers.ValidationError(
+                {"seats": f"Only {remaining_seats} seats are available"}
+            )
+
+        return attrs
+
     def create(self, validated_data):
-        user = self.context["request"].user
+        user_id = self.context["request"].user.id
         slot_id = validated_data["slot_id"]
-        seats_data = validated_data["seats"]
 
         try:
             with transaction.atomic():
-                slot = Slot.objects.select_for_update().get(id=slot_id)
+                slot = (
+                    Slot.objects.select_for_update()
+                    .select_related("cinema")
+                    .get(id=slot_id)
+                )
 
                 booking = Booking.objects.create(
-                    user=user,
+                    user_id=user_id,
                     slot=slot,
                     status=Booking.Status.BOOKED,
                 )
 
-                for seat in seats_data:
-                    seat_obj = Seat(
-                        booking=booking,
-                        row=seat["row"],
-                        number=seat["number"],
-                    )
-                    seat_obj.save()
+                seats = self.create_seats(booking, validated_data)
+
+                transaction.on_commit(lambda: reserve_seats(slot_id, len(seats)))
+                outbox.publish(
+                    "booking.created",
+                    key=f"slot:{slot_id}",
+                    payload={
+                        "booking_id": booking.id,
+                        "slot_id": slot_id,
+                        "user_id": user_id,
+                        "price": slot.price,
+                        "seats": seats,
+                    },
+                )
 
                 return booking
 
@@ -120,3 +157,91 @@ class BookingCreateSerializer(serializers.Serializer):
             raise ValidationError(
                 {"detail": "Some seats are already booked. Please try again."}
             ) from err
+
+    def create_seats(self, booking, validated_data):
+        """
+        Creates the requested seats of a new booking, with the slot locked.
+        Returns them as `(row, number)` pairs.
+        """
+        seats = []
+
+        for seat in validated_data["seats"]:
+            seat_obj = Seat(
+                booking=booking,
+                row=seat["row"],
+                number=seat["number"],
+            )
+            seat_obj.save()
+            seats.append((seat_obj.row, seat_obj.number))
+
+        return seats
+
+
+class BestAvailableBookingSerializer(BookingCreateSerializer):
+    """
+    Serializer for booking the best available seats of a slot
+
+    Fields:
+        "slot_id": int,
+        "party_size": int,
+    """
+
+    seats = None
+    party_size = serializers.IntegerField(min_value=1, max_value=10)
+
+    def validate(self, attrs):
+        remaining_seats = get_remaining_seats(attrs["slot_id"])
+
+        if remaining_seats is not None and attrs["party_size"] > remaining_seats:
+            raise serializers.ValidationError(
+                {"party_size": f"Only {remaining_seats} seats are available"}
+            )
+
+        return attrs
+
+    def create_seats(self, booking, validated_data):
+        """
+        Picks the best free seats from the occupancy of the slot. The slot
+        is locked, so the seats stay free until the booking commits.
+        """
+        cinema = booking.slot.cinema
+        bitmap = occupancy_bitmap(booking.slot_id, cinema.rows, cinema.seats_per_row)
+        seats = find_best_seats(
+            bitmap, cinema.rows, cinema.seats_per_row, validated_data["party_size"]
+        )
+
+        if seats is None:
+            raise ValidationError({"party_size": "Not enough seats are available"})
+
+        Seat.objects.bulk_create(
+            Seat(booking=booking, row=row, number=number) for row, number in seats
+        )
+
+        return seats
+
+
+class BulkCancelSerializer(serializers.Serializer):
+    """
+    Serializer for bulk cancellation
+
+    Fields:
+        "slot_id": int,
+        or
+        "cinema_id": int,
+        "date": date
+    """
+
+    slot_id = serializers.IntegerField(required=False)
+    cinema_id = serializers.IntegerField(required=False)
+    date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if "slot_id" in attrs:
+            if "cinema_id" in attrs or "date" in attrs:
+                raise serializers.ValidationError(
+                    "Give either a slot or a cinema and date, not both"
+                )
+        elif "cinema_id" not in attrs or "date" not in attrs:
+            raise serializers.ValidationError("Give a slot or a cinema and date")
+
+        return attrs
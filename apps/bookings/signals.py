@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+
+from apps.slots.versions import bump_slot_versions
+
+from .models import Booking
+
+# Sent in the cancelling transaction, once per slot with released seats.
+# Arguments: slot_id, booking_ids, seats (list of (row, number) pairs)
+seats_released = Signal()
+
+
+# Bookings are deleted in bulk when archived, long after their slot, so
+# deletes are not tracked
+@receiver(post_save, sender=Booking, dispatch_uid="versions_booking_saved")
+def booking_saved(sender, instance, raw=False, **kwargs):
+    """
+    Bumps the versions of the slot of a booking, with its movie and cinema
+    listings, which show the seats available.
+    """
+    if not raw:
+        bump_slot_versions([instance.slot_id])
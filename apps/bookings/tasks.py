@@ -0,0 +1,12 @@
+from apps.base.taskqueue import task
+
+from .archive import archive_slots
+
+
+@task
+def archive_past_slots():
+    """
+    Archives the slots past the retention window, run periodically (see
+    `PERIODIC_TASKS`).
+    """
+    archive_slots()
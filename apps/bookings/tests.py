@@ -1,14 +1,25 @@
+import json
 from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from apps.base.models import City, Genre, Language
-from apps.bookings.models import Booking, Seat
+from apps.bookings.exports import iter_booking_rows
+from apps.bookings.models import ArchivedBooking, ArchivedSeat, Booking, Seat
+from apps.bookings.partitions import ensure_partitions, next_month, partition_name
+from apps.bookings.seating import FREE, TAKEN, find_best_seats
 from apps.cinemas.models import Cinema
 from apps.movies.models import Movie
+from apps.slots.capacity import remaining_seats_key
 from apps.slots.models import Slot
 
 User = get_user_model()
@@ -60,9 +71,13 @@ class TestBookingModel(APITestCase):
 
         cls.seat = Seat.objects.create(row=1, number=1, booking=cls.booking)
 
-    def authenticate(self):
+    def setUp(self):
+        cache.clear()
+
+    def authenticate(self, user=None):
+        user = user or self.user
         res = self.client.post(
-            "/api/auth/login", {"email": self.user.email, "password": "user@123"}
+            "/api/auth/login", {"email": user.email, "password": "user@123"}
         )
         access = res.data["access"]
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
@@ -92,3 +107,276 @@ class TestBookingModel(APITestCase):
 
         res = self.client.patch(f"/api/bookings/{self.booking.id}/cancel")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_booking_more_seats_than_available(self):
+        self.authenticate()
+
+        seats = [
+            {"row": row, "number": number}
+            for row in range(1, 11)
+            for number in range(1, 11)
+        ]
+        res = self.client.post(
+            "/api/bookings",
+            {"slot_id": self.slot.id, "seats": seats},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seats", res.data)
+
+    def test_booking_sold_out_slot(self):
+        self.authenticate()
+        cache.set(remaining_seats_key(self.slot.id), 0)
+
+        res = self.client.post(
+            "/api/bookings",
+            {"slot_id": self.slot.id, "seats": [{"row": 5, "number": 5}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("slot_id", res.data)
+
+    def test_export_bookings_csv(self):
+        staff = User.objects.create_user(
+            email="staff@gmail.com",
+            password="user@123",
+            first_name="staff",
+            last_name="A",
+            phone_number="9876543211",
+            is_staff=True,
+        )
+        self.authenticate(staff)
+
+        today = timezone.localdate()
+        res = self.client.get(f"/api/bookings/export?start={today}&end={today}")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("booking_id,"))
+        self.assertIn(self.user.email, lines[1])
+        self.assertTrue(lines[1].endswith(",1-1"))
+
+    def test_export_bookings_requires_staff(self):
+        self.authenticate()
+
+        res = self.client.get("/api/bookings/export")
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_bookings_command(self):
+        today = str(timezone.localdate())
+        out = StringIO()
+
+        call_command(
+            "export_bookings", start=today, end=today, format="ndjson", stdout=out
+        )
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["booking_id"], self.booking.id)
+        self.assertEqual(rows[0]["seat_count"], 1)
+        self.assertEqual(rows[0]["status"], "BOOKED")
+
+    def test_best_available_booking(self):
+        self.authenticate()
+
+        res = self.client.post(
+            "/api/bookings/best-available",
+            {"slot_id": self.slot.id, "party_size": 2},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        seats = [(seat["row"], seat["number"]) for seat in res.data["seats"]]
+        self.assertEqual(sorted(seats), [(5, 5), (5, 6)])
+
+        # The same seats are not picked twice
+        res = self.client.post(
+            "/api/bookings/best-available",
+            {"slot_id": self.slot.id, "party_size": 2},
+            format="json",
+        )
+        seats = [(seat["row"], seat["number"]) for seat in res.data["seats"]]
+        self.assertEqual(sorted(seats), [(6, 5), (6, 6)])
+
+    def test_booking_idempotency_key_replays_response(self):
+        self.authenticate()
+        data = {"slot_id": self.slot.id, "seats": [{"row": 3, "number": 3}]}
+
+        res = self.client.post(
+            "/api/bookings", data, format="json", HTTP_IDEMPOTENCY_KEY="key-1"
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            retry = self.client.post(
+                "/api/bookings", data, format="json", HTTP_IDEMPOTENCY_KEY="key-1"
+            )
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data["id"], res.data["id"])
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Booking.objects.filter(slot=self.slot).count(), 2)
+
+    def test_booking_idempotency_key_reused_for_other_request(self):
+        self.authenticate()
+
+        self.client.post(
+            "/api/bookings",
+            {"slot_id": self.slot.id, "seats": [{"row": 3, "number": 3}]},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="key-1",
+        )
+        res = self.client.post(
+            "/api/bookings",
+            {"slot_id": self.slot.id, "seats": [{"row": 3, "number": 4}]},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="key-1",
+        )
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_booking_failure_releases_idempotency_key(self):
+        self.authenticate()
+        data = {"slot_id": self.slot.id, "seats": [{"row": 1, "number": 1}]}
+
+        res = self.client.post(
+            "/api/bookings", data, format="json", HTTP_IDEMPOTENCY_KEY="key-1"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.booking.status = Booking.Status.CANCELLED
+        self.booking.save()
+
+        res = self.client.post(
+            "/api/bookings", data, format="json", HTTP_IDEMPOTENCY_KEY="key-1"
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_cancel_booking_twice(self):
+        self.authenticate()
+
+        res = self.client.patch(f"/api/bookings/{self.booking.id}/cancel")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.patch(f"/api/bookings/{self.booking.id}/cancel")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_booking_too_late(self):
+        self.authenticate()
+        Slot.objects.filter(pk=self.slot.pk).update(
+            date_time=timezone.now() + timedelta(hours=1)
+        )
+
+        res = self.client.patch(f"/api/bookings/{self.booking.id}/cancel")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, Booking.Status.BOOKED)
+
+    def test_bulk_cancel_slot_bookings(self):
+        other = Booking.objects.create(
+            slot=self.slot, user=self.user, status=Booking.Status.BOOKED
+        )
+        Seat.objects.create(row=2, number=2, booking=other)
+        cache.set(remaining_seats_key(self.slot.id), 98)
+
+        staff = User.objects.create_user(
+            email="staff@gmail.com",
+            password="user@123",
+            first_name="staff",
+            last_name="A",
+            phone_number="9876543211",
+            is_staff=True,
+        )
+        self.authenticate(staff)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                "/api/bookings/cancel", {"slot_id": self.slot.id}, format="json"
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["cancelled"], 2)
+        self.assertEqual(
+            sorted(res.data["booking_ids"]), sorted([self.booking.id, other.id])
+        )
+        self.assertFalse(
+            Booking.objects.filter(
+                slot=self.slot, status=Booking.Status.BOOKED
+            ).exists()
+        )
+        self.assertEqual(cache.get(remaining_seats_key(self.slot.id)), 100)
+
+    def test_archive_past_slots(self):
+        past_slot = Slot.objects.create(
+            date_time=timezone.localtime() + timedelta(days=2),
+            price=150,
+            movie=self.movie,
+            cinema=self.cinema,
+            language=self.language,
+        )
+        past_booking = Booking.objects.create(
+            slot=past_slot, user=self.user, status=Booking.Status.BOOKED
+        )
+        Seat.objects.create(row=3, number=4, booking=past_booking)
+        Slot.objects.filter(pk=past_slot.pk).update(
+            date_time=timezone.now() - timedelta(days=200)
+        )
+
+        call_command("archive_slots", stdout=StringIO())
+
+        self.assertFalse(Slot.objects.filter(pk=past_slot.pk).exists())
+        self.assertFalse(Booking.objects.filter(pk=past_booking.pk).exists())
+        self.assertTrue(Slot.objects.filter(pk=self.slot.pk).exists())
+
+        archived = ArchivedBooking.objects.get(pk=past_booking.pk)
+        self.assertEqual(archived.created_at, past_booking.created_at)
+        self.assertEqual(archived.slot.price, 150)
+        self.assertEqual(list(archived.seats.values_list("row", "number")), [(3, 4)])
+        self.assertEqual(
+            archived.seats.get().show_date,
+            timezone.localdate(timezone.now() - timedelta(days=200)),
+        )
+
+        # History continues from the live bookings into the archive
+        self.authenticate()
+        res = self.client.get("/api/user/history")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([b["id"] for b in res.data["results"]], [self.booking.id])
+        self.assertIn("archived=1", res.data["next"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([b["id"] for b in res.data["results"]], [past_booking.id])
+        self.assertEqual(res.data["results"][0]["total_price"], 150)
+
+        # So do exports
+        rows = list(iter_booking_rows(timezone.localdate(), timezone.localdate()))
+        self.assertEqual([row[0] for row in rows], [self.booking.id, past_booking.id])
+        self.assertEqual(rows[1][-1], "3-4")
+
+    @skipUnless(connection.vendor == "postgresql", "Partitioned on PostgreSQL only")
+    def test_archived_seats_partition_pruning(self):
+        month = timezone.localdate().replace(day=1)
+        ensure_partitions(month, month)
+
+        plan = ArchivedSeat.objects.filter(
+            show_date__gte=month, show_date__lt=next_month(month)
+        ).explain()
+
+        self.assertIn(partition_name(month), plan)
+        self.assertNotIn(partition_name(next_month(month)), plan)
+
+
+class TestSeatSelection(SimpleTestCase):
+    def test_prefers_centre_block(self):
+        bitmap = bytearray(5 * 6)
+        self.assertEqual(find_best_seats(bitmap, 5, 6, 3), [(3, 2), (3, 3), (3, 4)])
+
+    def test_block_shifted_around_taken_seats(self):
+        bitmap = bytearray(1 * 8)
+        bitmap[3] = TAKEN
+        self.assertEqual(find_best_seats(bitmap, 1, 8, 3), [(1, 5), (1, 6), (1, 7)])
+
+    def test_splits_across_rows_without_contiguous_block(self):
+        bitmap = bytearray([TAKEN, FREE, TAKEN, FREE, TAKEN, FREE, TAKEN, FREE])
+        self.assertEqual(find_best_seats(bitmap, 2, 4, 2), [(1, 2), (2, 2)])
+        self.assertIsNone(find_best_seats(bitmap, 2, 4, 5))
@@ -1,9 +1,22 @@
 from django.urls import path
 
-from .views import BookingCancelView, BookingCreateView
+from .views import (
+    BestAvailableBookingView,
+    BookingCancelView,
+    BookingCreateView,
+    BookingExportView,
+    BulkBookingCancelView,
+)
 
 urlpatterns = [
     path("bookings", BookingCreateView.as_view(), name="new_booking"),
+    path(
+        "bookings/best-available",
+        BestAvailableBookingView.as_view(),
+        name="best_available_booking",
+    ),
+    path("bookings/cancel", BulkBookingCancelView.as_view(), name="bulk_cancel"),
+    path("bookings/export", BookingExportView.as_view(), name="export_bookings"),
     path(
         "bookings/<int:pk>/cancel", BookingCancelView.as_view(), name="cancel_booking"
     ),
@@ -1,14 +1,26 @@
-from datetime import timedelta
-
-from django.utils import timezone
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from rest_framework.views import APIView
 
-from .models import Booking
+from apps.base.idempotency import idempotent
+
+from .cancellation import (
+    cancel_booking,
+    cancel_cinema_day_bookings,
+    cancel_slot_bookings,
+)
+from .exports import RENDERERS, iter_booking_rows, parse_export_range
+from .models import ArchivedBooking, Booking
 from .pagination import BookingCursorPagination
-from .serializers import BookingCreateSerializer, BookingSerializer
+from .serializers import (
+    BestAvailableBookingSerializer,
+    BookingCreateSerializer,
+    BookingSerializer,
+    BulkCancelSerializer,
+)
 
 
 class BookingCreateView(APIView):
@@ -21,6 +33,12 @@ class BookingCreateView(APIView):
     Permissions:
         - IsAuthenticated
 
+    Headers:
+        - X-Queue-Token: admission token from the slot's waiting room,
+          required while a waiting room is open for the slot
+        - Idempotency-Key: optional, retries with the same key and body
+          get the original response back instead of booking again
+
     Response:
         201 Created
         {
@@ -35,12 +53,25 @@ class BookingCreateView(APIView):
                 }
             ]
         }
+
+    Errors:
+        403 Forbidden:
+            - Not admitted through the slot's waiting room
+
+        409 Conflict:
+            - A request with the same Idempotency-Key is in progress
+
+        422 Unprocessable Entity:
+            - Idempotency-Key reused with a different body
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_scope = "booking"
+    serializer_class = BookingCreateSerializer
 
+    @idempotent
     def post(self, request):
-        serializer = BookingCreateSerializer(
+        serializer = self.serializer_class(
             data=request.data,
             context={"request": request},
         )
@@ -53,6 +84,48 @@ class BookingCreateView(APIView):
         )
 
 
+class BestAvailableBookingView(BookingCreateView):
+    """
+    API Endpoint for booking the best available seats of a slot, picked by
+    the server
+
+    Endpoint:
+        - POST /api/bookings/best-available
+
+    Permissions:
+        - IsAuthenticated
+
+    Headers:
+        - X-Queue-Token: admission token from the slot's waiting room,
+          required while a waiting room is open for the slot
+        - Idempotency-Key: optional, as for POST /api/bookings/
+
+    Request:
+        {
+            "slot_id": int,
+            "party_size": int (1 to 10)
+        }
+
+    Description:
+        - Books the free contiguous block of seats in a single row closest
+          to the centre of the hall, or the free seats closest to the
+          centre when no row has enough contiguous seats
+
+    Response:
+        201 Created
+        Same as POST /api/bookings/
+
+    Errors:
+        400 Bad Request:
+            - Not enough seats are available
+
+        403 Forbidden:
+            - Not admitted through the slot's waiting room
+    """
+
+    serializer_class = BestAvailableBookingSerializer
+
+
 class UserBookingListView(APIView):
     """
     API Endpoint for booking history of user
@@ -63,6 +136,11 @@ class UserBookingListView(APIView):
     Permissions:
         - IsAuthenticated
 
+    Description:
+        - Cursor paginated, newest first
+        - Bookings of slots past the retention window are archived, the
+          last page of live bookings links on to them (`archived=1`)
+
     Response:
         200 OK
         {
@@ -85,11 +163,15 @@ class UserBookingListView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_scope = "listing"
 
     def get(self, request):
+        archived = request.query_params.get("archived") == "1"
+        model = ArchivedBooking if archived else Booking
+
         bookings = (
-            Booking.objects.filter(user=request.user)
-            .select_related("slot")
+            model.objects.filter(user_id=request.user.id)
+            .select_related("slot__movie", "slot__cinema", "slot__language")
             .prefetch_related("seats")
             .order_by("-created_at")
         )
@@ -100,7 +182,18 @@ class UserBookingListView(APIView):
 
         serializer = BookingSerializer(paginated_qs, many=True)
 
-        return paginator.get_paginated_response(serializer.data)
+        response = paginator.get_paginated_response(serializer.data)
+
+        # Past the last live booking, continue with the archived ones
+        if (
+            not archived
+            and response.data["next"] is None
+            and ArchivedBooking.objects.filter(user_id=request.user.id).exists()
+        ):
+            url = remove_query_param(request.build_absolute_uri(), "cursor")
+            response.data["next"] = replace_query_param(url, "archived", "1")
+
+        return response
 
 
 class BookingCancelView(APIView):
@@ -135,35 +228,144 @@ class BookingCancelView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    throttle_scope = "booking"
 
     def patch(self, request, pk):
-        try:
-            booking = Booking.objects.get(
-                id=pk,
-                user=request.user,
-                status=Booking.Status.BOOKED,
+        if cancel_booking(pk, request.user.id):
+            return Response(
+                {"id": pk, "status": "CANCELLED"},
+                status=status.HTTP_200_OK,
             )
-        except Booking.DoesNotExist:
+
+        cancellable = Booking.objects.filter(
+            id=pk,
+            user_id=request.user.id,
+            status=Booking.Status.BOOKED,
+        ).exists()
+
+        if not cancellable:
             return Response(
                 {"detail": "Booking not found or cannot be cancelled"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        now = timezone.now()
-        slot_time = booking.slot.date_time
+        return Response(
+            {
+                "detail": "Bookings can only be cancelled at least 4 hours before showtime"
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class BulkBookingCancelView(APIView):
+    """
+    API Endpoint for cancelling every booking of a show or of a cinema's
+    shows on a date, e.g. when shows are called off
+
+    Endpoint:
+        - POST /api/bookings/cancel
+
+    Permissions:
+        - IsAdminUser
 
-        if slot_time - now < timedelta(hours=4):
+    Request:
+        {"slot_id": int}
+        or
+        {"cinema_id": int, "date": date}
+
+    Description:
+        - Bookings are cancelled regardless of the cancellation window
+        - Seats are released and sales rollups updated in the same
+          transaction
+
+    Response:
+        200 OK
+        {
+            "cancelled": int,
+            "booking_ids": [int]
+        }
+
+    Errors:
+        400 Bad Request:
+            - Neither a slot nor a cinema and date given
+
+        403 Forbidden:
+            - User is not staff
+    """
+
+    permission_classes = [IsAdminUser]
+    throttle_scope = "booking"
+
+    def post(self, request):
+        serializer = BulkCancelSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if "slot_id" in data:
+            booking_ids = cancel_slot_bookings(data["slot_id"])
+        else:
+            booking_ids = cancel_cinema_day_bookings(data["cinema_id"], data["date"])
+
+        return Response(
+            {"cancelled": len(booking_ids), "booking_ids": booking_ids},
+            status=status.HTTP_200_OK,
+        )
+
+
+class BookingExportView(APIView):
+    """
+    API Endpoint for exporting bookings made in a date range, streamed
+    row by row so large ranges never load into memory
+
+    Endpoint:
+        - GET /api/bookings/export?start=YYYY-MM-DD&end=YYYY-MM-DD&output=csv
+
+    Permissions:
+        - IsAdminUser
+
+    Query Params:
+        - start: first booking date (defaults to yesterday)
+        - end: last booking date, inclusive (defaults to start or yesterday)
+        - output: csv (default) or ndjson
+
+    Response:
+        200 OK
+        One row per booking: booking_id, booked_at, status, user_email,
+        slot_id, show_time, movie, cinema, city, language, price,
+        seat_count, total_price, seats
+
+    Errors:
+        400 Bad Request:
+            - Invalid date range or output format
+
+        403 Forbidden:
+            - User is not staff
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        output = request.query_params.get("output", "csv")
+        if output not in RENDERERS:
             return Response(
-                {
-                    "detail": "Bookings can only be cancelled at least 4 hours before showtime"
-                },
+                {"detail": f"Output must be one of: {', '.join(RENDERERS)}"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        booking.status = Booking.Status.CANCELLED
-        booking.save()
+        try:
+            start_date, end_date = parse_export_range(
+                request.query_params.get("start"),
+                request.query_params.get("end"),
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(
-            {"id": booking.id, "status": "CANCELLED"},
-            status=status.HTTP_200_OK,
+        render, content_type = RENDERERS[output]
+        filename = f"bookings_{start_date}_{end_date}.{output}"
+
+        response = StreamingHttpResponse(
+            render(iter_booking_rows(start_date, end_date)),
+            content_type=content_type,
         )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
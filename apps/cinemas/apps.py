@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class CinemasConfig(AppConfig):
     name = "apps.cinemas"
+
+    def ready(self):
+        from apps.base.conditional import track_versions
+
+        from .models import Cinema
+
+        track_versions(Cinema)
@@ -3,6 +3,7 @@ from django.db import models
 from django.utils.text import slugify
 
 from apps.base.models import City, TimeStampModel
+from apps.base.slugs import unique_slug
 
 
 class Cinema(TimeStampModel):
@@ -33,12 +34,7 @@ class Cinema(TimeStampModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             base = slugify(f"{self.name}-{self.city.name}")
-            slug = base
-            i = 1
-            while self.__class__.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base}-{i}"
-                i += 1
-            self.slug = slug
+            self.slug = unique_slug(self.__class__.objects.exclude(pk=self.pk), base)
         super().save(*args, **kwargs)
 
     class Meta:
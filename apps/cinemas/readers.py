@@ -0,0 +1,21 @@
+from apps.base.readers import ValuesReader
+
+
+class CinemaReader(ValuesReader):
+    """
+    `CinemaSerializer` representation of `values()` rows, the city name
+    is read in the same query.
+    """
+
+    fields = ("id", "name", "location", "rows", "seats_per_row", "city__name", "slug")
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "location": row["location"],
+            "rows": row["rows"],
+            "seats_per_row": row["seats_per_row"],
+            "city": {"name": row["city__name"]},
+            "slug": row["slug"],
+        }
@@ -90,6 +90,7 @@ class CinemaSlotSerializer(serializers.ModelSerializer):
                     "price": slot.price,
                     "language": slot.language.name,
                     "booked_seats_percentage": booked_seats_percentage,
+                    "is_sold_out": booked_seats >= total_seats,
                 }
             )
         return list(movie_map.values())
@@ -6,6 +6,7 @@ from rest_framework.test import APITestCase
 
 from apps.base.models import City, Genre, Language
 from apps.cinemas.models import Cinema
+from apps.cinemas.serializers import CinemaSerializer
 from apps.movies.models import Movie
 from apps.slots.models import Slot
 
@@ -53,6 +54,37 @@ class TestCinemaModel(APITestCase):
         self.assertIn("Test Cinema", cinema_names)
         self.assertNotIn("Random Cinema", cinema_names)
 
+    def test_cinema_list_matches_serializer(self):
+        res = self.client.get("/api/cinemas")
+        self.assertEqual(
+            res.json()["results"], CinemaSerializer([self.cinema], many=True).data
+        )
+
+    def test_cinema_list_pages(self):
+        Cinema.objects.bulk_create(
+            Cinema(
+                name=f"Cinema {number}",
+                location="location",
+                rows=10,
+                seats_per_row=10,
+                city=self.city,
+                slug=f"cinema-{number}",
+            )
+            for number in range(12)
+        )
+
+        res = self.client.get("/api/cinemas")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        names = [cinema["name"] for cinema in res.data["results"]]
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        names += [cinema["name"] for cinema in res.data["results"]]
+
+        self.assertIsNone(res.data["next"])
+        self.assertEqual(len(names), 13)
+        self.assertEqual(len(set(names)), 13)
+
     def test_cinema_details_and_active_slots(self):
         slug = self.cinema.slug
         res = self.client.get(f"/api/cinemas/{slug}/slots")
@@ -7,16 +7,22 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.permissions import AllowAny
 
+from apps.base.conditional import ConditionalGetMixin
+from apps.base.models import City, Language
 from apps.base.pagination import BaseCursorPagination
+from apps.base.readers import ValuesListMixin
 from apps.bookings.models import Booking
+from apps.movies.models import Movie
+from apps.slots.filters import filter_slots
 from apps.slots.models import Slot
 
 from .filters import CinemaFilter
 from .models import Cinema
+from .readers import CinemaReader
 from .serializers import CinemaSerializer, CinemaSlotSerializer
 
 
-class CinemaListView(ListAPIView):
+class CinemaListView(ConditionalGetMixin, ValuesListMixin, ListAPIView):
     """
     API endpoint for listing cinemas
 
@@ -30,6 +36,8 @@ class CinemaListView(ListAPIView):
     - Returns list of cinemas
     - Supports filtering by city
     - Cursor paginated
+    - Rows are serialized by `CinemaReader`, `CinemaSerializer` documents them
+    - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
 
     Response:
         200 OK
@@ -52,13 +60,16 @@ class CinemaListView(ListAPIView):
 
     queryset = Cinema.objects.all().select_related("city")
     serializer_class = CinemaSerializer
+    reader_class = CinemaReader
+    etag_models = [Cinema, City]
     permission_classes = [AllowAny]
+    throttle_scope = "listing"
     filter_backends = [DjangoFilterBackend]
     filterset_class = CinemaFilter
     pagination_class = BaseCursorPagination
 
 
-class CinemaDetailsView(RetrieveAPIView):
+class CinemaDetailsView(ConditionalGetMixin, RetrieveAPIView):
     """
     API Endpoint for retrieving details of a single cinema with slots
 
@@ -68,6 +79,14 @@ class CinemaDetailsView(RetrieveAPIView):
     Permissions:
         - Allowany
 
+    Description:
+    - Slots of `?date` (defaults to today)
+    - Slots can be filtered and ordered, see `SlotFilter`: `?min_price`,
+      `?max_price`, `?from_time`, `?to_time`, `?language`, `?min_available`
+      and `?ordering=time|price|availability`
+    - Movies are listed in the order of their first slot
+    - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
+
     Response:
         200 OK
         {
@@ -81,15 +100,24 @@ class CinemaDetailsView(RetrieveAPIView):
         }
 
     Errors:
+        400 Bad Request:
+            - Invalid slot filters
         404 Not Found:
             - Cinema Not Found
     """
 
     serializer_class = CinemaSlotSerializer
     permission_classes = [AllowAny]
+    throttle_scope = "listing"
+    etag_models = [Cinema, City, Movie, Language]
+    # Started slots drop out of today's listing
+    etag_period = 60
 
     lookup_field = "slug"
 
+    def get_etag_scopes(self, request):
+        return [f"cinema:{self.kwargs['slug']}"]
+
     def get_queryset(self):
         date = self.request.query_params.get("date")
         today = timezone.localdate()
@@ -130,6 +158,7 @@ class CinemaDetailsView(RetrieveAPIView):
             )
             .order_by("date_time")
         )
+        active_slots = filter_slots(self.request, active_slots, selced_date)
 
         return Cinema.objects.prefetch_related(
             Prefetch("slots", queryset=active_slots, to_attr="active_slots")
@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class MoviesConfig(AppConfig):
     name = "apps.movies"
+
+    def ready(self):
+        from apps.base.conditional import track_versions
+
+        from . import signals  # noqa: F401
+        from .models import Movie
+
+        track_versions(Movie)
@@ -1,8 +1,7 @@
 import django_filters
-from django.utils import timezone
 from django_filters import rest_framework as filters
 
-from .models import Movie
+from .models import Movie, NowShowing
 
 
 class CharInFilter(filters.BaseInFilter, filters.CharFilter):
@@ -12,22 +11,56 @@ class CharInFilter(filters.BaseInFilter, filters.CharFilter):
 
 
 class MovieFilter(filters.FilterSet):
-    language = CharInFilter(
-        field_name="language__name", lookup_expr="in", distinct=True
-    )
-    genre = CharInFilter(field_name="genre__name", lookup_expr="in", distinct=True)
+    """
+    The language, genre and city filters are combined into a single lookup
+    of the matching movie ids in `NowShowing`, without joins or DISTINCT
+    on the movies.
+    """
+
+    # Filter -> lookup on `NowShowing`
+    now_showing_lookups = {
+        "language": "language__name__in",
+        "genre": "genre__name__in",
+        "city": "city__name__iexact",
+    }
+
+    language = CharInFilter(method="filter_now_showing")
+    genre = CharInFilter(method="filter_now_showing")
 
     release_date = django_filters.DateFilter(
         field_name="release_date", lookup_expr="gte"
     )
 
-    city = filters.CharFilter(method="filter_by_city")
+    city = filters.CharFilter(method="filter_now_showing")
+
+    def filter_now_showing(self, queryset, name, value):
+        # Applied together in `filter_queryset`
+        return queryset
+
+    def clean_names(self, name):
+        # Language and genre names are stored in lower case
+        return [value.lower() for value in self.form.cleaned_data[name]]
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        lookups = {
+            lookup: self.clean_names(name)
+            if lookup.endswith("__in")
+            else self.form.cleaned_data[name]
+            for name, lookup in self.now_showing_lookups.items()
+            if self.form.cleaned_data.get(name)
+        }
+        if not lookups:
+            return queryset
+
+        # Rows without a city list every movie, showing or not
+        if "city__name__iexact" not in lookups:
+            lookups["city"] = None
 
-    def filter_by_city(self, queryset, name, value):
         return queryset.filter(
-            slots__date_time__gte=timezone.now(),
-            slots__cinema__city__name__iexact=value,
-        ).distinct()
+            id__in=NowShowing.objects.filter(**lookups).values("movie_id")
+        )
 
     class Meta:
         model = Movie
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.movies.now_showing import refresh_now_showing
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the now showing listing filter of every movie from the "
+        "upcoming slots, in batched transactions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.NOW_SHOWING_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_now_showing(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} movie(s)"))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_alter_movie_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='poster_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
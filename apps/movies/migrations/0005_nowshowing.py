@@ -0,0 +1,92 @@
+# Generated by Django 6.0.1 on 2026-10-19 13:06
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Min
+from django.utils import timezone
+
+
+def fill_now_showing(apps, schema_editor):
+    """
+    Builds the rows of every existing movie, as
+    `apps.movies.now_showing.build_rows` does with the current models.
+    """
+    Movie = apps.get_model("movies", "Movie")
+    NowShowing = apps.get_model("movies", "NowShowing")
+    Slot = apps.get_model("slots", "Slot")
+
+    languages, genres = defaultdict(list), defaultdict(list)
+    for tags, field in ((languages, "language"), (genres, "genre")):
+        through = Movie._meta.get_field(field).remote_field.through
+        for movie_id, tag_id in through.objects.values_list(
+            "movie_id", f"{field}_id"
+        ):
+            tags[movie_id].append(tag_id)
+
+    shows = defaultdict(dict)
+    upcoming = (
+        Slot.objects.filter(date_time__gte=timezone.now())
+        .order_by()
+        .values_list("movie_id", "cinema__city_id")
+        .annotate(next_show_at=Min("date_time"), min_price=Min("price"))
+    )
+    for movie_id, city_id, next_show_at, min_price in upcoming:
+        shows[movie_id][city_id] = (next_show_at, min_price)
+
+    rows = []
+    for movie_id in Movie.objects.values_list("pk", flat=True).iterator():
+        cities = shows[movie_id]
+        overall = (
+            (
+                min(next_show_at for next_show_at, _ in cities.values()),
+                min(min_price for _, min_price in cities.values()),
+            )
+            if cities
+            else (None, None)
+        )
+
+        for city_id, (next_show_at, min_price) in [(None, overall), *cities.items()]:
+            for language_id in languages[movie_id] or [None]:
+                for genre_id in genres[movie_id] or [None]:
+                    rows.append(
+                        NowShowing(
+                            movie_id=movie_id,
+                            city_id=city_id,
+                            language_id=language_id,
+                            genre_id=genre_id,
+                            next_show_at=next_show_at,
+                            min_price=min_price,
+                        )
+                    )
+
+    NowShowing.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_task'),
+        ('movies', '0004_movie_poster_variants'),
+        ('slots', '0004_slot_slots_slot_cinema__eb7ecb_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NowShowing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('next_show_at', models.DateTimeField(null=True)),
+                ('min_price', models.PositiveIntegerField(null=True)),
+                ('city', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='base.city')),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='base.genre')),
+                ('language', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='base.language')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='now_showing', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['city', 'language', 'genre', 'movie'], name='movies_nows_city_id_8538d1_idx'), models.Index(fields=['city', 'genre', 'movie'], name='movies_nows_city_id_e2edd8_idx')],
+            },
+        ),
+        migrations.RunPython(fill_now_showing, migrations.RunPython.noop),
+    ]
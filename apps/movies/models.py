@@ -1,7 +1,9 @@
 from django.db import models
 from django.utils.text import slugify
 
-from apps.base.models import Genre, Language, TimeStampModel
+from apps.base.images import schedule_image_variants
+from apps.base.models import City, Genre, Language, TimeStampModel
+from apps.base.slugs import unique_slug
 
 
 class Movie(TimeStampModel):
@@ -13,6 +15,7 @@ class Movie(TimeStampModel):
         description (str): Short description of the movie (optional).
         duration (timedelta): Length of the movie.
         poster (image): Movie poster image.
+        poster_variants (dict): Resized poster variants, width -> file name.
         release_date (date): Official release date of the movie.
         language (ManyToMany): Languages in which the movie is available.
         genre (ManyToMany): Genres the movie belongs to.
@@ -22,6 +25,7 @@ class Movie(TimeStampModel):
     description = models.CharField(max_length=500, blank=True)
     duration = models.DurationField()
     poster = models.ImageField(upload_to="movie_posters/")
+    poster_variants = models.JSONField(default=dict, blank=True, editable=False)
     release_date = models.DateField()
     language = models.ManyToManyField(Language, related_name="movies")
     genre = models.ManyToManyField(Genre, related_name="movies")
@@ -30,13 +34,58 @@ class Movie(TimeStampModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             base = slugify(self.name) or "movie"
-            slug = base
-            i = 1
-            while self.__class__.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base}-{i}"
-                i += 1
-            self.slug = slug
+            self.slug = unique_slug(self.__class__.objects.exclude(pk=self.pk), base)
+
+        # A newly uploaded poster is only written to storage on save
+        poster_uploaded = bool(self.poster) and not self.poster._committed
+        if poster_uploaded:
+            self.poster_variants = {}
+
         super().save(*args, **kwargs)
 
+        if poster_uploaded:
+            schedule_image_variants(self, "poster")
+
     def __str__(self):
         return self.name
+
+
+class NowShowing(models.Model):
+    """
+    Denormalized listing filter, maintained by `apps.movies.now_showing`.
+
+    One row per language and genre of a movie, for each city with upcoming
+    slots of the movie, plus one with no city for every movie whether
+    showing or not. Language and genre are null for movies without any.
+
+    Attributes:
+        movie (ForeignKey): Movie listed.
+        city (ForeignKey): City showing the movie, null across all cities.
+        language (ForeignKey): One of the movie's languages.
+        genre (ForeignKey): One of the movie's genres.
+        next_show_at (datetime): Start of the next slot, null if none.
+        min_price (int): Lowest price of the upcoming slots, null if none.
+    """
+
+    movie = models.ForeignKey(
+        Movie, on_delete=models.CASCADE, related_name="now_showing"
+    )
+    city = models.ForeignKey(
+        City, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    language = models.ForeignKey(
+        Language, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    genre = models.ForeignKey(
+        Genre, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    next_show_at = models.DateTimeField(null=True)
+    min_price = models.PositiveIntegerField(null=True)
+
+    class Meta:
+        # Any combination of the city, language and genre filters is a
+        # range scan of one of these, yielding movie ids
+        indexes = [
+            models.Index(fields=["city", "language", "genre", "movie"]),
+            models.Index(fields=["city", "genre", "movie"]),
+        ]
@@ -0,0 +1,109 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.base.conditional import bump_version
+from apps.slots.models import Slot
+
+from .models import Movie, NowShowing
+
+
+def movie_tags(relation, movie_ids):
+    tags = defaultdict(list)
+    links = relation.through.objects.filter(movie_id__in=movie_ids).values_list(
+        "movie_id", f"{relation.field.m2m_reverse_field_name()}_id"
+    )
+    for movie_id, tag_id in links:
+        tags[movie_id].append(tag_id)
+    return tags
+
+
+def build_rows(movie_ids, now):
+    """
+    Builds the `NowShowing` rows of movies from their upcoming slots.
+    """
+    languages = movie_tags(Movie.language, movie_ids)
+    genres = movie_tags(Movie.genre, movie_ids)
+
+    shows = defaultdict(dict)
+    upcoming = (
+        Slot.objects.filter(movie_id__in=movie_ids, date_time__gte=now)
+        .order_by()
+        .values_list("movie_id", "cinema__city_id")
+        .annotate(next_show_at=Min("date_time"), min_price=Min("price"))
+    )
+    for movie_id, city_id, next_show_at, min_price in upcoming:
+        shows[movie_id][city_id] = (next_show_at, min_price)
+
+    rows = []
+    for movie_id in movie_ids:
+        cities = shows[movie_id]
+        overall = (
+            (
+                min(next_show_at for next_show_at, _ in cities.values()),
+                min(min_price for _, min_price in cities.values()),
+            )
+            if cities
+            else (None, None)
+        )
+
+        for city_id, (next_show_at, min_price) in [(None, overall), *cities.items()]:
+            for language_id in languages[movie_id] or [None]:
+                for genre_id in genres[movie_id] or [None]:
+                    rows.append(
+                        NowShowing(
+                            movie_id=movie_id,
+                            city_id=city_id,
+                            language_id=language_id,
+                            genre_id=genre_id,
+                            next_show_at=next_show_at,
+                            min_price=min_price,
+                        )
+                    )
+
+    return rows
+
+
+def refresh_movies(movie_ids):
+    """
+    Replaces the `NowShowing` rows of movies in a single transaction, so
+    readers see either the previous or the new rows. Refreshes of the same
+    movie are serialized by locking its row.
+    """
+    with transaction.atomic():
+        movie_ids = list(
+            Movie.objects.select_for_update()
+            .filter(pk__in=movie_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        NowShowing.objects.filter(movie_id__in=movie_ids).delete()
+        NowShowing.objects.bulk_create(build_rows(movie_ids, timezone.now()))
+        bump_version(NowShowing)
+
+    return len(movie_ids)
+
+
+def refresh_now_showing(batch_size=None):
+    """
+    Refreshes the `NowShowing` rows of every movie, batch by batch, e.g.
+    to drop the slots that started since the last refresh.
+
+    Returns the number of movies refreshed.
+    """
+    batch_size = batch_size or settings.NOW_SHOWING_BATCH_SIZE
+    last_id, total = 0, 0
+
+    while movie_ids := list(
+        Movie.objects.filter(pk__gt=last_id)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    ):
+        total += refresh_movies(movie_ids)
+        last_id = movie_ids[-1]
+
+    return total
@@ -0,0 +1,45 @@
+from apps.base.readers import ValuesReader, format_duration, related_names
+
+from .models import Movie
+
+
+class MovieReader(ValuesReader):
+    """
+    `MovieSerializer` representation of `values()` rows.
+    """
+
+    fields = (
+        "id",
+        "name",
+        "description",
+        "duration",
+        "poster",
+        "poster_variants",
+        "release_date",
+        "slug",
+    )
+
+    poster_field = Movie._meta.get_field("poster")
+
+    def prepare(self, rows):
+        ids = [row["id"] for row in rows]
+        self.languages = related_names(Movie.language, ids)
+        self.genres = related_names(Movie.genre, ids)
+
+    def to_representation(self, row):
+        release_date = row["release_date"]
+
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "duration": format_duration(row["duration"]),
+            "poster": self.file_url(self.poster_field, row["poster"]),
+            "poster_srcset": self.srcset(
+                self.poster_field.storage, row["poster_variants"]
+            ),
+            "release_date": release_date.isoformat() if release_date else None,
+            "language": self.languages.get(row["id"], []),
+            "genre": self.genres.get(row["id"], []),
+            "slug": row["slug"],
+        }
@@ -1,6 +1,10 @@
 from rest_framework import serializers
 
-from apps.base.serializers import GenreSerializer, LanguageSerializer
+from apps.base.serializers import (
+    GenreSerializer,
+    ImageVariantsField,
+    LanguageSerializer,
+)
 
 from .models import Movie
 
@@ -15,6 +19,7 @@ class MovieSerializer(serializers.ModelSerializer):
         "description": string,
         "duration": time,
         "poster": string,
+        "poster_srcset": {width: string},
         "release_date": date,
         "language": [
             {
@@ -31,6 +36,7 @@ class MovieSerializer(serializers.ModelSerializer):
 
     language = LanguageSerializer(many=True)
     genre = GenreSerializer(many=True)
+    poster_srcset = ImageVariantsField(source="poster_variants")
 
     class Meta:
         model = Movie
@@ -40,6 +46,7 @@ class MovieSerializer(serializers.ModelSerializer):
             "description",
             "duration",
             "poster",
+            "poster_srcset",
             "release_date",
             "language",
             "genre",
@@ -57,11 +64,13 @@ class MovieSlotsPerCinemaSerializer(serializers.ModelSerializer):
         "description": string,
         "duration": time,
         "poster": string,
+        "poster_srcset": {width: string},
         "release_date": date,
         "slug": string,
         "cinemas": [cinema[slots]],
     """
 
+    poster_srcset = ImageVariantsField(source="poster_variants")
     cinemas = serializers.SerializerMethodField()
 
     class Meta:
@@ -72,6 +81,7 @@ class MovieSlotsPerCinemaSerializer(serializers.ModelSerializer):
             "description",
             "duration",
             "poster",
+            "poster_srcset",
             "release_date",
             "slug",
             "cinemas",
@@ -104,6 +114,7 @@ class MovieSlotsPerCinemaSerializer(serializers.ModelSerializer):
                     "price": slot.price,
                     "language": slot.language.name,
                     "booked_seats_percentage": booked_seats_percentage,
+                    "is_sold_out": booked_seats >= total_seats,
                 }
             )
 
@@ -0,0 +1,55 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.slots.models import Slot
+
+from .models import Movie
+from .now_showing import refresh_movies
+
+
+@receiver(post_save, sender=Slot, dispatch_uid="now_showing_slot_saved")
+def slot_changed(sender, instance, raw=False, **kwargs):
+    """
+    Refreshes the listing rows of a slot's movie, in the transaction
+    changing the slot.
+    """
+    if not raw:
+        refresh_movies([instance.movie_id])
+
+
+@receiver(post_delete, sender=Slot, dispatch_uid="now_showing_slot_deleted")
+def slot_deleted(sender, instance, **kwargs):
+    """
+    Refreshes the listing rows of a deleted upcoming slot's movie. Past
+    slots are not listed, so archiving them refreshes nothing.
+    """
+    if instance.date_time >= timezone.now():
+        refresh_movies([instance.movie_id])
+
+
+@receiver(
+    m2m_changed, sender=Movie.language.through, dispatch_uid="now_showing_language"
+)
+@receiver(m2m_changed, sender=Movie.genre.through, dispatch_uid="now_showing_genre")
+def movie_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Refreshes the listing rows of movies whose languages or genres changed.
+    Clearing a language or genre from all its movies is picked up by the
+    periodic refresh.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    movie_ids = pk_set if reverse else [instance.pk]
+    if movie_ids:
+        refresh_movies(movie_ids)
+
+
+@receiver(post_save, sender=Movie, dispatch_uid="now_showing_movie_created")
+def movie_created(sender, instance, created, raw=False, **kwargs):
+    """
+    Lists new movies, before they get languages, genres or slots.
+    """
+    if created and not raw:
+        refresh_movies([instance.pk])
@@ -0,0 +1,12 @@
+from apps.base.taskqueue import task
+
+from .now_showing import refresh_now_showing
+
+
+@task
+def refresh_now_showing_table():
+    """
+    Refreshes the now showing rows of every movie, run periodically (see
+    `PERIODIC_TASKS`).
+    """
+    refresh_now_showing()
@@ -1,12 +1,14 @@
 from datetime import timedelta
+from unittest import mock
 
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
 
 from apps.base.models import City, Genre, Language
 from apps.cinemas.models import Cinema
-from apps.movies.models import Movie
+from apps.movies.models import Movie, NowShowing
+from apps.movies.serializers import MovieSerializer
 from apps.slots.models import Slot
 
 
@@ -74,6 +76,76 @@ class TestMovieModel(APITestCase):
         self.assertIn("Movie Active", movie_names)
         self.assertNotIn("Different Language", movie_names)
 
+    def test_movie_list_matches_serializer(self):
+        self.movie_active.language.add(Language.objects.create(name="Tamil"))
+        Movie.objects.filter(pk=self.movie_active.pk).update(
+            poster="movie_posters/poster.jpg",
+            poster_variants={"160": "movie_posters/variants/poster.webp"},
+        )
+
+        res = self.client.get("/api/movies")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        request = APIRequestFactory().get("/api/movies")
+        movies = Movie.objects.order_by("-release_date", "-id")
+        expected = MovieSerializer(movies, many=True, context={"request": request}).data
+        self.assertEqual(res.json()["results"], expected)
+
+    def test_movie_list_filters_by_city_from_now_showing(self):
+        other_city = City.objects.create(name="Other city")
+        tamil = Language.objects.create(name="Tamil")
+        self.movie_inactive.language.add(tamil)
+
+        res = self.client.get("/api/movies?city=test city&language=English")
+        self.assertEqual(
+            [movie["name"] for movie in res.data["results"]], ["Movie Active"]
+        )
+
+        res = self.client.get("/api/movies?language=Tamil")
+        self.assertEqual(
+            [movie["name"] for movie in res.data["results"]], ["Movie InActive"]
+        )
+
+        # Maintained with the slots
+        slot = Slot.objects.create(
+            date_time=timezone.localtime() + timedelta(days=2),
+            price=150,
+            movie=self.movie_inactive,
+            cinema=Cinema.objects.create(
+                name="Other Cinema",
+                location="location",
+                rows=10,
+                seats_per_row=10,
+                city=other_city,
+            ),
+            language=tamil,
+        )
+        showing = NowShowing.objects.filter(
+            movie=self.movie_inactive, city=other_city
+        ).first()
+        self.assertEqual(showing.min_price, 150)
+
+        res = self.client.get("/api/movies?city=Other city")
+        self.assertEqual(
+            [movie["name"] for movie in res.data["results"]], ["Movie InActive"]
+        )
+
+        slot.delete()
+        res = self.client.get("/api/movies?city=Other city")
+        self.assertEqual(res.data["results"], [])
+
+    def test_deleting_past_slots_skips_now_showing(self):
+        past_slot = self.slot
+        Slot.objects.filter(pk=past_slot.pk).update(
+            date_time=timezone.localtime() - timedelta(days=2)
+        )
+        past_slot.refresh_from_db()
+
+        with mock.patch("apps.movies.signals.refresh_movies") as refresh_movies:
+            past_slot.delete()
+
+        refresh_movies.assert_not_called()
+
     def test_movie_details_success(self):
         slug = self.movie_active.slug
         res = self.client.get(f"/api/movies/{slug}")
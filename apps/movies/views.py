@@ -10,16 +10,22 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from apps.base.conditional import ConditionalGetMixin
+from apps.base.models import City, Genre, Language
+from apps.base.readers import ValuesListMixin
 from apps.bookings.models import Booking
+from apps.cinemas.models import Cinema
+from apps.slots.filters import filter_slots
 from apps.slots.models import Slot
 
 from .filters import MovieFilter
-from .models import Movie
+from .models import Movie, NowShowing
 from .pagination import MovieCursorPagination
+from .readers import MovieReader
 from .serializers import MovieSerializer, MovieSlotsPerCinemaSerializer
 
 
-class MovieViewSet(ReadOnlyModelViewSet):
+class MovieViewSet(ConditionalGetMixin, ValuesListMixin, ReadOnlyModelViewSet):
     """
     API endpoint for listing movies
 
@@ -33,6 +39,8 @@ class MovieViewSet(ReadOnlyModelViewSet):
     - Returns list of movies
     - Supports filtering by genre, language
     - Cursor paginated
+    - Rows are serialized by `MovieReader`, `MovieSerializer` documents them
+    - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
 
     Response:
         200 OK
@@ -70,7 +78,10 @@ class MovieViewSet(ReadOnlyModelViewSet):
     )
 
     serializer_class = MovieSerializer
+    reader_class = MovieReader
+    etag_models = [Movie, Language, Genre, NowShowing]
     permission_classes = [AllowAny]
+    throttle_scope = "listing"
     filter_backends = [DjangoFilterBackend]
     pagination_class = MovieCursorPagination
     lookup_field = "slug"
@@ -86,14 +97,12 @@ class MovieViewSet(ReadOnlyModelViewSet):
         latest = request.query_params.get("latest_movies")
 
         if latest == "true":
-            queryset = queryset[:5]
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            return Response(self.read(queryset[:5]))
 
         return super().list(request, *args, **kwargs)
 
 
-class MovieSlotsPerCinemaListView(RetrieveAPIView):
+class MovieSlotsPerCinemaListView(ConditionalGetMixin, RetrieveAPIView):
     """
     API Endpoint for retrieving slots for a single movie grouped by cinemas
 
@@ -103,6 +112,14 @@ class MovieSlotsPerCinemaListView(RetrieveAPIView):
     Permissions:
         - Allowany
 
+    Description:
+    - Slots of `?date` (defaults to today), optionally in `?city`
+    - Slots can be filtered and ordered, see `SlotFilter`: `?min_price`,
+      `?max_price`, `?from_time`, `?to_time`, `?language`, `?min_available`
+      and `?ordering=time|price|availability`
+    - Cinemas are listed in the order of their first slot
+    - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
+
     Response:
         200 OK
         {
@@ -116,12 +133,22 @@ class MovieSlotsPerCinemaListView(RetrieveAPIView):
             "cinemas": [slots]
         }
 
+    Errors:
+        400 Bad Request:
+            - Invalid slot filters
     """
 
     serializer_class = MovieSlotsPerCinemaSerializer
     permission_classes = [AllowAny]
+    throttle_scope = "listing"
+    etag_models = [Movie, Cinema, City, Language]
+    # Started slots drop out of today's listing
+    etag_period = 60
     lookup_field = "slug"
 
+    def get_etag_scopes(self, request):
+        return [f"movie:{self.kwargs['slug']}"]
+
     def get_queryset(self):
         date = self.request.query_params.get("date")
         today = timezone.localdate()
@@ -167,7 +194,9 @@ class MovieSlotsPerCinemaListView(RetrieveAPIView):
         if city:
             active_slots = active_slots.filter(cinema__city__name__iexact=city)
 
-        active_slots = active_slots.order_by("date_time")
+        active_slots = filter_slots(
+            self.request, active_slots.order_by("date_time"), selected_date
+        )
 
         return Movie.objects.prefetch_related(
             Prefetch(
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class SlotsConfig(AppConfig):
     name = "apps.slots"
+
+    def ready(self):
+        from . import signals  # noqa: F401
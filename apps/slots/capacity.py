@@ -0,0 +1,85 @@
+import contextlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.bookings.models import Booking
+
+from .models import Slot
+
+
+def remaining_seats_key(slot_id):
+    return f"slot:{slot_id}:remaining_seats"
+
+
+def count_remaining_seats(slot_id):
+    """
+    Counts the remaining seats of a slot from the database.
+
+    Returns None if the slot does not exist.
+    """
+    slot = (
+        Slot.objects.filter(pk=slot_id)
+        .annotate(
+            booked_seats=Count(
+                "bookings__seats",
+                filter=Q(bookings__status=Booking.Status.BOOKED),
+            )
+        )
+        .values("cinema__rows", "cinema__seats_per_row", "booked_seats")
+        .first()
+    )
+
+    if slot is None:
+        return None
+
+    total_seats = slot["cinema__rows"] * slot["cinema__seats_per_row"]
+    return max(total_seats - slot["booked_seats"], 0)
+
+
+def get_remaining_seats(slot_id):
+    """
+    Returns the cached remaining seats of a slot, counting them on a miss.
+    Returns None if the slot does not exist.
+
+    Used for admission control only, the database stays the source of
+    truth. A stale count at worst lets a request through to the locked
+    booking path, or rejects it until the count expires after
+    `SLOT_CAPACITY_CACHE_TIMEOUT` seconds.
+    """
+    key = remaining_seats_key(slot_id)
+    remaining = cache.get(key)
+
+    if remaining is None:
+        remaining = count_remaining_seats(slot_id)
+        if remaining is not None:
+            cache.add(key, remaining, settings.SLOT_CAPACITY_CACHE_TIMEOUT)
+
+    return remaining
+
+
+def is_sold_out(slot_id):
+    return get_remaining_seats(slot_id) == 0
+
+
+def _adjust_remaining_seats(slot_id, delta):
+    # Not cached counts are counted from the database on next access
+    with contextlib.suppress(ValueError):
+        cache.incr(remaining_seats_key(slot_id), delta)
+
+
+def reserve_seats(slot_id, count):
+    """
+    Takes booked seats off the cached count of a slot.
+    Call once the booking transaction has committed.
+    """
+    _adjust_remaining_seats(slot_id, -count)
+
+
+def release_seats(slot_id, count):
+    """
+    Gives cancelled seats back to the cached count of a slot.
+    Call once the cancellation has committed.
+    """
+    _adjust_remaining_seats(slot_id, count)
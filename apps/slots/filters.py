@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from django import forms
+from django.db.models import F
+from django.utils import timezone
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+
+from apps.movies.filters import CharInFilter
+
+from .models import Slot
+
+
+def total_seats():
+    return F("cinema__rows") * F("cinema__seats_per_row")
+
+
+class PercentFilter(filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class SlotFilter(filters.FilterSet):
+    """
+    Filters and orders the slots of a day, listed by the movie and cinema
+    slot endpoints. Expects slots annotated with their `booked_seats`.
+
+    - `min_price`, `max_price`: price range, inclusive
+    - `from_time`, `to_time`: show time window in the day (HH:MM), inclusive
+    - `language`: comma separated languages of the shows
+    - `min_available`: minimum percentage of free seats
+    - `ordering`: `time`, `price` or `availability` (free seats),
+      descending with a `-` prefix
+    """
+
+    min_price = filters.NumberFilter(field_name="price", lookup_expr="gte")
+    max_price = filters.NumberFilter(field_name="price", lookup_expr="lte")
+    from_time = filters.TimeFilter(method="filter_from_time")
+    to_time = filters.TimeFilter(method="filter_to_time")
+    language = CharInFilter(method="filter_language")
+    min_available = PercentFilter(
+        method="filter_min_available", min_value=0, max_value=100
+    )
+    ordering = filters.OrderingFilter(
+        fields=(
+            ("date_time", "time"),
+            ("price", "price"),
+            ("free_seats", "availability"),
+        )
+    )
+
+    class Meta:
+        model = Slot
+        fields = []
+
+    def __init__(self, *args, day, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.day = day
+
+    def filter_queryset(self, queryset):
+        queryset = queryset.alias(free_seats=total_seats() - F("booked_seats"))
+        return super().filter_queryset(queryset)
+
+    def day_time(self, value):
+        return timezone.make_aware(datetime.combine(self.day, value))
+
+    def filter_from_time(self, queryset, name, value):
+        return queryset.filter(date_time__gte=self.day_time(value))
+
+    def filter_to_time(self, queryset, name, value):
+        return queryset.filter(date_time__lte=self.day_time(value))
+
+    def filter_language(self, queryset, name, value):
+        # Language names are stored in lower case
+        return queryset.filter(language__name__in=[name.lower() for name in value])
+
+    def filter_min_available(self, queryset, name, value):
+        return queryset.alias(
+            spare_seats=F("free_seats") * 100 - total_seats() * value
+        ).filter(spare_seats__gte=0)
+
+
+def filter_slots(request, queryset, day):
+    """
+    Applies the `SlotFilter` query parameters of a request to the slots of
+    `day`, invalid parameters are a 400.
+    """
+    slot_filter = SlotFilter(
+        request.query_params, queryset=queryset, request=request, day=day
+    )
+    if not slot_filter.is_valid():
+        raise ValidationError(slot_filter.errors)
+
+    return slot_filter.qs
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.slots import waiting_room
+from apps.slots.models import Slot
+
+
+class Command(BaseCommand):
+    help = "Opens or closes the waiting room of high demand slots"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["open", "close"])
+        parser.add_argument("slot_ids", nargs="*", type=int)
+        parser.add_argument(
+            "--movie",
+            help="Slug of a movie, selects all its upcoming slots",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help="Users admitted per second, defaults to WAITING_ROOM_ADMIT_RATE",
+        )
+
+    def handle(self, *args, **options):
+        if not waiting_room.has_shared_cache():
+            raise CommandError(
+                "Waiting rooms are kept in the default cache, which is local to "
+                "this process: set CACHE_BACKEND to a shared cache (e.g. Redis "
+                "or Memcached)"
+            )
+
+        slots = Slot.objects.filter(date_time__gte=timezone.now())
+
+        if options["movie"]:
+            slots = slots.filter(movie__slug=options["movie"])
+        elif options["slot_ids"]:
+            slots = slots.filter(id__in=options["slot_ids"])
+        else:
+            raise CommandError("Pass slot ids or --movie")
+
+        slot_ids = list(slots.values_list("id", flat=True))
+
+        if options["action"] == "open":
+            for slot_id in slot_ids:
+                waiting_room.open_room(slot_id, options["rate"])
+            message = f"Opened waiting room for {len(slot_ids)} slot(s)"
+        else:
+            for slot_id in slot_ids:
+                waiting_room.close_room(slot_id)
+            message = f"Closed waiting room for {len(slot_ids)} slot(s)"
+
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 12:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_task'),
+        ('cinemas', '0003_cinema_slug'),
+        ('movies', '0004_movie_poster_variants'),
+        ('slots', '0002_remove_slot_end_time_slot_language'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSlot',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date_time', models.DateTimeField()),
+                ('price', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('cinema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cinemas.cinema')),
+                ('language', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='base.language')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+            ],
+        ),
+    ]
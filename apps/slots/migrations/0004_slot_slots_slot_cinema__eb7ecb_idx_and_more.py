@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_task'),
+        ('cinemas', '0003_cinema_slug'),
+        ('movies', '0004_movie_poster_variants'),
+        ('slots', '0003_archivedslot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(fields=['cinema', 'date_time'], name='slots_slot_cinema__eb7ecb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(fields=['movie', 'date_time'], name='slots_slot_movie_i_5a9423_idx'),
+        ),
+    ]
@@ -34,6 +34,11 @@ class Slot(TimeStampModel):
                 name="unique_slot_per_movie_cinema_date_time",
             )
         ]
+        # Slot listings scan a time range of a cinema's or movie's slots
+        indexes = [
+            models.Index(fields=["cinema", "date_time"]),
+            models.Index(fields=["movie", "date_time"]),
+        ]
 
     def clean(self):
         super().clean()
@@ -84,3 +89,31 @@ class Slot(TimeStampModel):
 
     def __str__(self):
         return f"{self.movie.name} - {self.date_time}"
+
+
+class ArchivedSlot(models.Model):
+    """
+    Slot moved out of the live table once past the retention window (see
+    `apps.bookings.archive`), with its original id and timestamps.
+
+    Attributes:
+        date_time (datetime): Date and time when the movie was shown.
+        price (int): Ticket price for the slot.
+        movie (ForeignKey): Movie shown.
+        cinema (ForeignKey): Cinema where the movie was shown.
+        language (ForeignKey): Language in which the movie was shown.
+        archived_at (datetime): When the slot was archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    date_time = models.DateTimeField()
+    price = models.PositiveIntegerField()
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="+")
+    cinema = models.ForeignKey(Cinema, on_delete=models.CASCADE, related_name="+")
+    language = models.ForeignKey(Language, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.movie.name} - {self.date_time}"
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.base.conditional import bump_version
+
+from .models import Slot
+from .versions import slot_scopes
+
+
+@receiver(post_save, sender=Slot, dispatch_uid="versions_slot_saved")
+def slot_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_version(*slot_scopes(instance))
+
+
+@receiver(post_delete, sender=Slot, dispatch_uid="versions_slot_deleted")
+def slot_deleted(sender, instance, **kwargs):
+    """
+    Bumps the versions of deleted upcoming slots. Past slots are no longer
+    listed, so archiving them bumps nothing.
+    """
+    if instance.date_time >= timezone.now():
+        bump_version(*slot_scopes(instance))
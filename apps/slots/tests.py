@@ -1,13 +1,19 @@
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from io import StringIO
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from apps.base.models import City, Genre, Language
+from apps.bookings.models import Booking, Seat
 from apps.cinemas.models import Cinema
 from apps.movies.models import Movie
+from apps.slots import waiting_room
 from apps.slots.models import Slot
 
 User = get_user_model()
@@ -53,6 +59,9 @@ class TestSlotModel(APITestCase):
             phone_number="9876543210",
         )
 
+    def setUp(self):
+        cache.clear()
+
     def authenticate(self):
         res = self.client.post(
             "/api/auth/login", {"email": self.user.email, "password": "user@123"}
@@ -78,3 +87,159 @@ class TestSlotModel(APITestCase):
         )
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.test_slot_booked_seats()
+
+    def test_booking_changes_only_its_slot_etag(self):
+        other_slot = Slot.objects.create(
+            date_time=self.slot.date_time + timedelta(hours=4),
+            price=200,
+            movie=self.movie,
+            cinema=self.cinema,
+            language=self.language,
+        )
+        etags = {
+            slot.id: self.client.get(f"/api/slots/{slot.id}")["ETag"]
+            for slot in (self.slot, other_slot)
+        }
+
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                "/api/bookings",
+                {"slot_id": self.slot.id, "seats": [{"row": 5, "number": 5}]},
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.get(
+            f"/api/slots/{self.slot.id}", HTTP_IF_NONE_MATCH=etags[self.slot.id]
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(
+            f"/api/slots/{other_slot.id}", HTTP_IF_NONE_MATCH=etags[other_slot.id]
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_waiting_room_command_needs_shared_cache(self):
+        with self.assertRaisesMessage(CommandError, "CACHE_BACKEND"):
+            call_command("waiting_room", "open", self.slot.id, stdout=StringIO())
+        self.assertIsNone(waiting_room.get_room(self.slot.id))
+
+        with mock.patch.object(waiting_room, "has_shared_cache", return_value=True):
+            call_command("waiting_room", "open", self.slot.id, stdout=StringIO())
+        self.assertIsNotNone(waiting_room.get_room(self.slot.id))
+
+    def test_waiting_room_gates_booking(self):
+        self.authenticate()
+        waiting_room.open_room(self.slot.id, admit_rate=1000)
+        booking = {"slot_id": self.slot.id, "seats": [{"row": 2, "number": 2}]}
+
+        res = self.client.post("/api/bookings", booking, format="json")
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        res = self.client.post(f"/api/slots/{self.slot.id}/queue")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["ticket"], 1)
+        self.assertTrue(res.data["admitted"])
+
+        res = self.client.post(
+            "/api/bookings",
+            booking,
+            format="json",
+            HTTP_X_QUEUE_TOKEN=res.data["token"],
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_waiting_room_token_single_use(self):
+        self.authenticate()
+        waiting_room.open_room(self.slot.id, admit_rate=1000)
+        token = self.client.post(f"/api/slots/{self.slot.id}/queue").data["token"]
+
+        for number, expected in (
+            (3, status.HTTP_201_CREATED),
+            (4, status.HTTP_403_FORBIDDEN),
+        ):
+            res = self.client.post(
+                "/api/bookings",
+                {"slot_id": self.slot.id, "seats": [{"row": 3, "number": number}]},
+                format="json",
+                HTTP_X_QUEUE_TOKEN=token,
+            )
+            self.assertEqual(res.status_code, expected)
+
+        res = self.client.get(f"/api/slots/{self.slot.id}/queue")
+        self.assertNotEqual(res.data["token"], token)
+
+    def test_waiting_room_queue_position(self):
+        self.authenticate()
+        room = waiting_room.open_room(self.slot.id, admit_rate=0.001)
+        waiting_room.join(room, user_id=0)
+
+        res = self.client.post(f"/api/slots/{self.slot.id}/queue")
+        self.assertEqual(res.data["ticket"], 2)
+        self.assertEqual(res.data["position"], 1)
+        self.assertFalse(res.data["admitted"])
+        self.assertIsNone(res.data["token"])
+
+        res = self.client.get(f"/api/slots/{self.slot.id}/queue")
+        self.assertEqual(res.data["ticket"], 2)
+
+    def test_waiting_room_idle_time_not_banked(self):
+        room = waiting_room.open_room(self.slot.id, admit_rate=0.001)
+        later = datetime.now().timestamp() + 60 * 60
+
+        with mock.patch.object(waiting_room.time, "time", return_value=later):
+            first = waiting_room.join(room, user_id=1)
+            second = waiting_room.join(room, user_id=2)
+
+        self.assertTrue(first["admitted"])
+        self.assertFalse(second["admitted"])
+        self.assertEqual(second["position"], 1)
+
+    def test_slot_filters_and_ordering(self):
+        day = timezone.localdate() + timedelta(days=3)
+        morning, evening = (
+            Slot.objects.create(
+                date_time=timezone.make_aware(datetime.combine(day, show_time)),
+                price=price,
+                movie=self.movie,
+                cinema=self.cinema,
+                language=self.language,
+            )
+            for show_time, price in ((time(10), 300), (time(20), 150))
+        )
+        booking = Booking.objects.create(
+            slot=morning, user=self.user, status=Booking.Status.BOOKED
+        )
+        Seat.objects.bulk_create(
+            Seat(booking=booking, row=row, number=1) for row in range(1, 7)
+        )
+
+        def slot_ids(**params):
+            res = self.client.get(
+                f"/api/movies/{self.movie.slug}/slots",
+                {"date": day.isoformat(), **params},
+            )
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return [slot["id"] for slot in res.data["cinemas"][0]["slots"]]
+
+        self.assertEqual(slot_ids(), [morning.id, evening.id])
+        self.assertEqual(slot_ids(ordering="price"), [evening.id, morning.id])
+        self.assertEqual(slot_ids(ordering="-availability"), [evening.id, morning.id])
+        self.assertEqual(slot_ids(max_price=200), [evening.id])
+        self.assertEqual(slot_ids(to_time="12:00"), [morning.id])
+        self.assertEqual(slot_ids(min_available=95), [evening.id])
+        self.assertEqual(slot_ids(language="English"), [morning.id, evening.id])
+
+        res = self.client.get(
+            f"/api/cinemas/{self.cinema.slug}/slots",
+            {"date": day.isoformat(), "from_time": "12:00"},
+        )
+        self.assertEqual(
+            [slot["id"] for slot in res.data["movies"][0]["slots"]], [evening.id]
+        )
+
+        res = self.client.get(
+            f"/api/cinemas/{self.cinema.slug}/slots", {"min_available": 150}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,8 @@
 from django.urls import path
 
-from .views import BookedSeats
+from .views import BookedSeats, SlotQueueView
 
-urlpatterns = [path("slots/<int:pk>", BookedSeats.as_view())]
+urlpatterns = [
+    path("slots/<int:pk>", BookedSeats.as_view()),
+    path("slots/<int:pk>/queue", SlotQueueView.as_view(), name="slot_queue"),
+]
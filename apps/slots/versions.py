@@ -0,0 +1,23 @@
+from apps.base.conditional import bump_version
+
+from .models import Slot
+
+
+def slot_scopes(slot):
+    """
+    Version scopes of a slot: its seat map, and the slot listings of its
+    movie and cinema (keyed by slug, as their URLs are).
+    """
+    return [f"slot:{slot.pk}", f"movie:{slot.movie.slug}", f"cinema:{slot.cinema.slug}"]
+
+
+def bump_slot_versions(slot_ids):
+    """
+    Bumps the version scopes of slots, e.g. when their bookings change.
+    """
+    slots = (
+        Slot.objects.filter(pk__in=slot_ids)
+        .select_related("movie", "cinema")
+        .only("movie__slug", "cinema__slug")
+    )
+    bump_version(*{scope for slot in slots for scope in slot_scopes(slot)})
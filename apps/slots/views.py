@@ -1,14 +1,21 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import status
 from rest_framework.generics import ListAPIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from apps.base.conditional import ConditionalGetMixin
 from apps.bookings.models import Booking, Seat
 from apps.bookings.serializers import SeatSerializer
+from apps.cinemas.models import Cinema
+from apps.movies.models import Movie
 
+from . import waiting_room
 from .models import Slot
 
 
-class BookedSeats(ListAPIView):
+class BookedSeats(ConditionalGetMixin, ListAPIView):
     """
     API endpoint for returning booked seats in a slot
 
@@ -18,6 +25,9 @@ class BookedSeats(ListAPIView):
     Permissions:
         - Allowany
 
+    Description:
+        - Returns an ETag, 304 Not Modified when `If-None-Match` matches it
+
     Response:
         200 OK
         {
@@ -30,9 +40,14 @@ class BookedSeats(ListAPIView):
     """
 
     permission_classes = [AllowAny]
+    throttle_scope = "seat_map"
     serializer_class = SeatSerializer
+    etag_models = [Cinema, Movie]
     pagination_class = None
 
+    def get_etag_scopes(self, request):
+        return [f"slot:{self.kwargs['pk']}"]
+
     def get_queryset(self):
         slot_id = self.kwargs.get("pk")
         return Seat.objects.filter(
@@ -60,3 +75,93 @@ class BookedSeats(ListAPIView):
                 "booked_seats": seats,
             }
         )
+
+
+class SlotQueueView(APIView):
+    """
+    API endpoint for the waiting room of a high demand slot
+
+    Endpoint:
+        - POST /api/slots/<int:pk>/queue (join the queue)
+        - GET /api/slots/<int:pk>/queue (queue position)
+
+    Permissions:
+        - IsAuthenticated
+
+    Description:
+        - Users are admitted in FIFO order at a configured rate, each
+          ticket is scheduled one interval after the previous one
+        - Once admitted, the response carries a single use token to be
+          sent in the `X-Queue-Token` header of POST /api/bookings, GET
+          returns a new one until the admission expires
+        - When no waiting room is open the slot can be booked directly
+
+    Response:
+        200 OK
+        {
+            "slot_id": int,
+            "waiting_room": bool,
+            "ticket": int,
+            "position": int,
+            "admitted": bool,
+            "wait_seconds": int,
+            "token": string | null
+        }
+
+    Errors:
+        401 Unauthorized:
+            - Authentication credentials were not provided
+            - Invalid or expired token
+
+        404 Not Found:
+            - Slot not found
+            - Not in the queue (GET)
+
+        503 Service Unavailable:
+            - The waiting room is busy, try again
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_scope = "booking"
+
+    def post(self, request, pk):
+        return self.queue_response(request, pk, join=True)
+
+    def get(self, request, pk):
+        return self.queue_response(request, pk, join=False)
+
+    def queue_response(self, request, pk, join):
+        slot = get_object_or_404(Slot.objects.only("id"), pk=pk)
+        room = waiting_room.get_room(slot.id)
+
+        if room is None:
+            return Response({"slot_id": slot.id, "waiting_room": False})
+
+        if join:
+            queue_status = waiting_room.join(room, request.user.id)
+        else:
+            queue_status = waiting_room.get_user_status(room, request.user.id)
+
+        if queue_status is None:
+            return Response(
+                {"detail": "Not in the queue for this slot"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        token = None
+        if queue_status["admitted"] and not queue_status["expired"]:
+            token = waiting_room.make_admission_token(
+                slot.id, room, request.user.id, queue_status
+            )
+
+        return Response(
+            {
+                "slot_id": slot.id,
+                "waiting_room": True,
+                "ticket": queue_status["ticket"],
+                "position": queue_status["position"],
+                "admitted": queue_status["admitted"],
+                "wait_seconds": queue_status["wait_seconds"],
+                "token": token,
+            }
+        )
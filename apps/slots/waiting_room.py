@@ -0,0 +1,222 @@
+import math
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+TOKEN_SALT = "apps.slots.waiting_room"
+
+# Seconds a user's ticket is remembered, outlives any realistic queue
+TICKET_TIMEOUT = 60 * 60 * 24
+
+# Seconds the admission schedule lock is held at most, and waited for
+SCHEDULE_LOCK_TIMEOUT = 5
+SCHEDULE_LOCK_WAIT = 2
+
+
+def has_shared_cache():
+    """
+    Returns whether the default cache is shared by every process, as room
+    state and queue tickets must be. Local memory and dummy caches are not.
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def room_key(slot_id):
+    return f"waiting_room:{slot_id}"
+
+
+def tail_key(room):
+    return f"waiting_room:{room['id']}:tail"
+
+
+def schedule_key(room):
+    return f"waiting_room:{room['id']}:schedule"
+
+
+def lock_key(room):
+    return f"waiting_room:{room['id']}:lock"
+
+
+def ticket_key(room, user_id):
+    return f"waiting_room:{room['id']}:user:{user_id}"
+
+
+def used_token_key(room, nonce):
+    return f"waiting_room:{room['id']}:used:{nonce}"
+
+
+class WaitingRoomBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The waiting room is busy, try again"
+
+
+def open_room(slot_id, admit_rate=None):
+    """
+    Opens the waiting room of a slot. From now on only users admitted
+    through the room can book the slot, at `admit_rate` users per second
+    (defaults to `WAITING_ROOM_ADMIT_RATE`).
+    """
+    room = {
+        "id": uuid.uuid4().hex,
+        "opened_at": time.time(),
+        "admit_rate": admit_rate or settings.WAITING_ROOM_ADMIT_RATE,
+    }
+    cache.set(tail_key(room), 0, None)
+    cache.set(room_key(slot_id), room, None)
+    return room
+
+
+def close_room(slot_id):
+    """
+    Closes the waiting room of a slot, bookings are no longer gated.
+    """
+    room = get_room(slot_id)
+    if room is not None:
+        cache.delete_many([room_key(slot_id), tail_key(room), schedule_key(room)])
+
+
+def get_room(slot_id):
+    return cache.get(room_key(slot_id))
+
+
+def get_status(room, ticket):
+    """
+    Returns the queue status of a ticket, admitted from its `admitted_at`
+    for `WAITING_ROOM_ADMISSION_TTL` seconds.
+    """
+    now = time.time()
+    admitted_at = ticket["admitted_at"]
+
+    return {
+        "ticket": ticket["number"],
+        "position": max(math.ceil((admitted_at - now) * room["admit_rate"]), 0),
+        "admitted": admitted_at <= now,
+        "expired": now > admitted_at + settings.WAITING_ROOM_ADMISSION_TTL,
+        "wait_seconds": max(math.ceil(admitted_at - now), 0),
+    }
+
+
+def _next_ticket(room):
+    """
+    Numbers a new ticket and schedules its admission one `1 / admit_rate`
+    interval after the previous ticket, or now if the room was idle, so
+    idle time never adds up to a burst of admissions.
+
+    The schedule is read and written under a short lock.
+    """
+    deadline = time.monotonic() + SCHEDULE_LOCK_WAIT
+    while not cache.add(lock_key(room), 1, SCHEDULE_LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            raise WaitingRoomBusy()
+        time.sleep(0.005)
+
+    try:
+        try:
+            number = cache.incr(tail_key(room))
+        except ValueError:
+            # Tail evicted from the cache, numbering restarts
+            cache.add(tail_key(room), 0, None)
+            number = cache.incr(tail_key(room))
+
+        now = time.time()
+        previous = cache.get(schedule_key(room))
+        admitted_at = (
+            now if previous is None else max(now, previous + 1 / room["admit_rate"])
+        )
+        cache.set(schedule_key(room), admitted_at, TICKET_TIMEOUT)
+    finally:
+        cache.delete(lock_key(room))
+
+    return {"number": number, "admitted_at": admitted_at}
+
+
+def join(room, user_id):
+    """
+    Puts the user in the queue of the room and returns their status.
+    Joining again returns the same ticket until its admission expires.
+    """
+    key = ticket_key(room, user_id)
+    ticket = cache.get(key)
+
+    if ticket is not None:
+        queue_status = get_status(room, ticket)
+        if not queue_status["expired"]:
+            return queue_status
+        cache.delete(key)
+
+    ticket = _next_ticket(room)
+    if not cache.add(key, ticket, TICKET_TIMEOUT):
+        # Joined concurrently by another request of the same user
+        ticket = cache.get(key)
+
+    return get_status(room, ticket)
+
+
+def get_user_status(room, user_id):
+    """
+    Returns the queue status of the user, None if they have not joined.
+    """
+    ticket = cache.get(ticket_key(room, user_id))
+    return None if ticket is None else get_status(room, ticket)
+
+
+def make_admission_token(slot_id, room, user_id, queue_status):
+    """
+    Signs a single use admission token for an admitted ticket, to be sent
+    in the `X-Queue-Token` header when booking.
+    """
+    return signing.dumps(
+        {
+            "slot": slot_id,
+            "room": room["id"],
+            "user": user_id,
+            "ticket": queue_status["ticket"],
+            "nonce": uuid.uuid4().hex,
+        },
+        salt=TOKEN_SALT,
+    )
+
+
+def has_admission(slot_id, user_id, token):
+    """
+    Returns whether the user may book the slot: either no waiting room is
+    open for it, or the token admits the user to the current room. A token
+    is used up by the first check, a new one is returned by the queue
+    endpoint until the admission expires.
+    """
+    room = get_room(slot_id)
+    if room is None:
+        return True
+
+    if not token:
+        return False
+
+    try:
+        payload = signing.loads(
+            token,
+            salt=TOKEN_SALT,
+            max_age=settings.WAITING_ROOM_ADMISSION_TTL,
+        )
+    except signing.BadSignature:
+        return False
+
+    if not (
+        payload.get("slot") == slot_id
+        and payload.get("room") == room["id"]
+        and payload.get("user") == user_id
+        and payload.get("nonce")
+    ):
+        return False
+
+    return cache.add(
+        used_token_key(room, payload["nonce"]),
+        True,
+        settings.WAITING_ROOM_ADMISSION_TTL,
+    )
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class ClaimsUser(TokenUser):
+    """
+    Lightweight user built from the claims of a validated access token,
+    see `UserRefreshToken`.
+
+    Attributes:
+        id (int): Id of the user.
+        is_active (bool): Whether the user was active when the token was issued.
+        is_staff (bool): Whether the user was staff when the token was issued.
+    """
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates requests from the signed claims of the access token,
+    without loading the user from the database.
+
+    `request.user` is a `ClaimsUser`, views needing the full `User` should
+    use `CachedUserJWTAuthentication` instead.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return user
+
+
+def cached_user_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def forget_cached_user(user_id):
+    cache.delete(cached_user_key(user_id))
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates requests with the full `User`, cached for
+    `AUTH_USER_CACHE_TIMEOUT` seconds.
+    """
+
+    def get_user(self, validated_token):
+        key = cached_user_key(validated_token.get(api_settings.USER_ID_CLAIM))
+        user = cache.get(key)
+
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        return user
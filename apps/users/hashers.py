@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count set by `PBKDF2_ITERATIONS`,
+    never below the count of the installed Django version.
+    """
+
+    iterations = max(
+        settings.PBKDF2_ITERATIONS, hashers.PBKDF2PasswordHasher.iterations
+    )
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id with costs set by `ARGON2_TIME_COST`, `ARGON2_MEMORY_COST`
+    (KiB) and `ARGON2_PARALLELISM`. Requires the `argon2-cffi` package.
+    """
+
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    Scrypt with the CPU/memory cost set by `SCRYPT_WORK_FACTOR`.
+    """
+
+    work_factor = settings.SCRYPT_WORK_FACTOR
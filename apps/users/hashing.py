@@ -0,0 +1,30 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+
+# Password hashing is deliberately slow, bounding the threads of a worker
+# that may hash at once keeps a burst of logins from starving other endpoints
+_hashing_slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_CONCURRENCY)
+
+
+@contextmanager
+def password_hashing_slot():
+    """
+    Runs the enclosed block, which hashes a password, once one of the
+    `PASSWORD_HASHING_CONCURRENCY` slots of this process is free.
+
+    Raises `Throttled` (429) when no slot frees up within
+    `PASSWORD_HASHING_TIMEOUT` seconds.
+    """
+    if not _hashing_slots.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+        raise Throttled(
+            wait=settings.PASSWORD_HASHING_TIMEOUT,
+            detail="Too many sign ins in progress, please try again shortly.",
+        )
+
+    try:
+        yield
+    finally:
+        _hashing_slots.release()
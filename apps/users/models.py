@@ -2,6 +2,7 @@ from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.core.validators import RegexValidator
 from django.db import models
 
+from apps.base.images import schedule_image_variants
 from apps.base.models import TimeStampModel
 from apps.users.managers import UserManager
 
@@ -21,6 +22,8 @@ class User(TimeStampModel, AbstractBaseUser, PermissionsMixin):
         first_name (str): User's first name.
         last_name (str): User's last name (optional).
         phone_number (str): Contact number (optional).
+        profile_picture (image): Profile picture (optional).
+        profile_picture_variants (dict): Resized variants, width -> file name.
         is_active (bool): Indicates whether the user account is active.
         is_staff (bool): Indicates whether the user can access Django admin.
 
@@ -38,6 +41,9 @@ class User(TimeStampModel, AbstractBaseUser, PermissionsMixin):
     profile_picture = models.ImageField(
         upload_to="profile_pictures", blank=True, null=True
     )
+    profile_picture_variants = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
@@ -50,6 +56,19 @@ class User(TimeStampModel, AbstractBaseUser, PermissionsMixin):
     # Fields required when creating a superuser
     REQUIRED_FIELDS = ["first_name"]
 
+    def save(self, *args, **kwargs):
+        # A newly uploaded picture is only written to storage on save
+        picture_uploaded = (
+            bool(self.profile_picture) and not self.profile_picture._committed
+        )
+        if picture_uploaded:
+            self.profile_picture_variants = {}
+
+        super().save(*args, **kwargs)
+
+        if picture_uploaded:
+            schedule_image_variants(self, "profile_picture")
+
     def __str__(self):
         """
         String representation of the user.
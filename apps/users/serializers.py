@@ -1,7 +1,14 @@
 from django.contrib.auth import authenticate
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
 
+from apps.base.serializers import ImageVariantsField
+
+from .hashing import password_hashing_slot
 from .models import User
+from .tokens import UserRefreshToken
 
 
 class UserRegisterSerializer(serializers.ModelSerializer):
@@ -52,7 +59,9 @@ class UserRegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop("confirm_password")
-        return User.objects.create_user(**validated_data)
+
+        with password_hashing_slot():
+            return User.objects.create_user(**validated_data)
 
 
 class LoginSerializer(serializers.Serializer):
@@ -71,7 +80,9 @@ class LoginSerializer(serializers.Serializer):
         email = attrs.get("email")
         password = attrs.get("password")
 
-        user = authenticate(email=email, password=password)
+        # Upgrades the stored hash when the hasher or its parameters changed
+        with password_hashing_slot():
+            user = authenticate(email=email, password=password)
 
         if not user or not user.is_active:
             raise serializers.ValidationError("Invalid credentials")
@@ -89,10 +100,66 @@ class UserProfileSerializer(serializers.ModelSerializer):
         "first_name": string,
         "last_name": string,
         "phone_number": string,
-        "password": string
+        "profile_picture": string,
+        "profile_picture_srcset": {width: string}
     """
 
+    profile_picture_srcset = ImageVariantsField(source="profile_picture_variants")
+
     class Meta:
         model = User
-        fields = ["email", "first_name", "last_name", "phone_number", "profile_picture"]
+        fields = [
+            "email",
+            "first_name",
+            "last_name",
+            "phone_number",
+            "profile_picture",
+            "profile_picture_srcset",
+        ]
         read_only_fields = ["email"]
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Serializer for token refresh
+
+    Re-reads the user claims embedded in the tokens, so changes to
+    `is_active` / `is_staff` reach access tokens within one access token
+    lifetime.
+
+    Fields:
+        "refresh": string,
+        "access": string
+    """
+
+    token_class = UserRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user = (
+            User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM))
+            .only("id", "is_active", "is_staff")
+            .first()
+        )
+
+        if not user or not user.is_active:
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        refresh.set_user_claims(user)
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data["refresh"] = str(refresh)
+
+        return data
@@ -0,0 +1,13 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from apps.base.taskqueue import task
+
+
+@task
+def purge_expired_tokens():
+    """
+    Deletes expired refresh tokens, run periodically (see `PERIODIC_TASKS`).
+    """
+    call_command("purge_tokens", stdout=StringIO())
@@ -1,6 +1,22 @@
-from django.contrib.auth import get_user_model
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model, hashers
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from apps.users.authentication import StatelessJWTAuthentication
+from apps.users.hashers import PBKDF2PasswordHasher
+from apps.users.tokens import UserRefreshToken
 
 User = get_user_model()
 
@@ -16,6 +32,9 @@ class TestUserAuth(APITestCase):
             phone_number="9876543210",
         )
 
+    def setUp(self):
+        cache.clear()
+
     # Register
 
     def test_register_success(self):
@@ -88,6 +107,33 @@ class TestUserAuth(APITestCase):
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "apps.users.hashers.ScryptPasswordHasher",
+            "apps.users.hashers.PBKDF2PasswordHasher",
+        ]
+    )
+    def test_login_upgrades_password_hash(self):
+        res = self.client.post(
+            "/api/auth/login",
+            {
+                "email": self.user.email,
+                "password": "user@123",
+            },
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertTrue(self.user.check_password("user@123"))
+
+    def test_pbkdf2_iterations_not_below_django(self):
+        self.assertGreaterEqual(
+            PBKDF2PasswordHasher.iterations,
+            hashers.PBKDF2PasswordHasher.iterations,
+        )
+
     # Helpers
 
     def authenticate(self):
@@ -130,6 +176,75 @@ class TestUserAuth(APITestCase):
         self.assertEqual(self.user.first_name, "Updated")
         self.assertEqual(self.user.phone_number, "9999999999")
 
+    def test_update_profile_keeps_changes_made_since_cached(self):
+        self.authenticate()
+        self.client.get("/api/user")
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+
+        res = self.client.patch("/api/user", {"first_name": "Updated"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Updated")
+        self.assertTrue(self.user.is_staff)
+
     def test_user_profile_requires_authentication(self):
         res = self.client.get("/api/auth/user")
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # Stateless authentication
+
+    def test_access_token_authenticates_without_query(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        authentication = StatelessJWTAuthentication()
+        token = authentication.get_validated_token(str(refresh.access_token))
+
+        with self.assertNumQueries(0):
+            user = authentication.get_user(token)
+
+        self.assertEqual(user.id, self.user.id)
+        self.assertTrue(user.is_active)
+        self.assertFalse(user.is_staff)
+
+    def test_inactive_user_claims_are_rejected(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        refresh["is_active"] = False
+        authentication = StatelessJWTAuthentication()
+        token = authentication.get_validated_token(str(refresh.access_token))
+
+        with self.assertRaises(AuthenticationFailed):
+            authentication.get_user(token)
+
+    # Token blacklist
+
+    def test_blacklisted_token_rejected_from_cache(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        refresh.blacklist()
+
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            UserRefreshToken(str(refresh))
+
+    def test_token_not_blacklisted_is_cached(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        UserRefreshToken(str(refresh))
+
+        with self.assertNumQueries(0):
+            UserRefreshToken(str(refresh))
+
+        refresh.blacklist()
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            UserRefreshToken(str(refresh))
+
+    def test_purge_tokens_deletes_expired_tokens(self):
+        expired = UserRefreshToken.for_user(self.user)
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired["jti"]).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        active = UserRefreshToken.for_user(self.user)
+
+        call_command("purge_tokens", batch_size=1, stdout=StringIO())
+
+        self.assertFalse(OutstandingToken.objects.filter(jti=expired["jti"]).exists())
+        self.assertFalse(BlacklistedToken.objects.exists())
+        self.assertTrue(OutstandingToken.objects.filter(jti=active["jti"]).exists())
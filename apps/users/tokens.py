@@ -0,0 +1,82 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+
+def blacklisted_key(jti):
+    return f"jwt:blacklisted:{jti}"
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token embedding the user claims needed to authenticate requests
+    without loading the user (see `StatelessJWTAuthentication`).
+
+    Claims are copied to the access tokens derived from it.
+
+    Blacklisted tokens are also kept in the cache until they expire, so
+    replayed tokens are rejected without a query. Tokens found not to be
+    blacklisted are cached as such for `TOKEN_BLACKLIST_CHECK_TIMEOUT`
+    seconds; blacklisting overwrites that entry, so with a shared cache a
+    blacklisted token is rejected at once. With
+    `TOKEN_BLACKLIST_TRUST_CACHE` (only safe with a shared, persistent
+    cache) tokens missing from the cache are not looked up in the
+    blacklist table at all.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    def set_user_claims(self, user):
+        self["is_active"] = user.is_active
+        self["is_staff"] = user.is_staff
+
+    def check_blacklist(self):
+        key = blacklisted_key(self.payload[api_settings.JTI_CLAIM])
+        blacklisted = cache.get(key)
+
+        if blacklisted:
+            raise TokenError("Token is blacklisted")
+
+        if blacklisted is None and not settings.TOKEN_BLACKLIST_TRUST_CACHE:
+            super().check_blacklist()
+            cache.add(key, False, settings.TOKEN_BLACKLIST_CHECK_TIMEOUT)
+
+    def outstand(self):
+        """
+        Adds the token to the outstanding token list, using the user id
+        claim instead of loading the user.
+        """
+        return OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults={
+                "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+                "created_at": self.current_time,
+                "token": str(self),
+                "expires_at": datetime_from_epoch(self.payload["exp"]),
+            },
+        )
+
+    def blacklist(self):
+        token, _ = self.outstand()
+        blacklisted = BlacklistedToken.objects.get_or_create(token=token)
+
+        timeout = self.payload["exp"] - int(time.time())
+        if timeout > 0:
+            cache.set(
+                blacklisted_key(self.payload[api_settings.JTI_CLAIM]), True, timeout
+            )
+
+        return blacklisted
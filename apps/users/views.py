@@ -1,13 +1,15 @@
 import contextlib
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from drf_spectacular.utils import extend_schema
 from rest_framework import permissions, response, status
 from rest_framework.views import APIView
-from rest_framework_simplejwt import exceptions, tokens, views
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt import exceptions, views
 
+from .authentication import CachedUserJWTAuthentication, forget_cached_user
 from .serializers import LoginSerializer, UserProfileSerializer, UserRegisterSerializer
+from .tokens import UserRefreshToken
 
 
 def is_mobile_client(req):
@@ -55,7 +57,7 @@ def blacklist_refresh_token(req, res):
 
     if refresh:
         with contextlib.suppress(Exception):
-            tokens.RefreshToken(refresh).blacklist()
+            UserRefreshToken(refresh).blacklist()
 
     if not is_mobile_client(req):
         is_prod = not settings.DEBUG
@@ -89,6 +91,7 @@ class RegisterAPIView(APIView):
     """
 
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "auth"
 
     @extend_schema(
         summary="Register a new user",
@@ -108,7 +111,7 @@ class RegisterAPIView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         res = response.Response(
             {
@@ -149,6 +152,7 @@ class LoginAPIView(APIView):
     """
 
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "auth"
 
     @extend_schema(
         summary="User login",
@@ -176,7 +180,7 @@ class LoginAPIView(APIView):
 
         user = serializer.validated_data["user"]
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
 
         res = response.Response(
             {
@@ -241,6 +245,8 @@ class UserProfileAPIView(APIView):
             - Invalid or expired token
     """
 
+    # Needs the full user, not only the token claims
+    authentication_classes = [CachedUserJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     @extend_schema(
@@ -268,13 +274,16 @@ class UserProfileAPIView(APIView):
         tags=["auth"],
     )
     def patch(self, request):
+        # The cached user may be stale, saving it would revert newer changes
+        user = get_user_model().objects.get(pk=request.user.pk)
         serializer = UserProfileSerializer(
-            request.user,
+            user,
             data=request.data,
             partial=True,
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        forget_cached_user(request.user.pk)
         return response.Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -341,6 +350,8 @@ class TokenRefreshView(views.TokenRefreshView):
             - Given refresh token is invalid, blacklisted or expired
     """
 
+    throttle_scope = "auth"
+
     def post(self, req, *args, **kwargs):
         """
         - Overrides post mixin for accessing refresh token from HttpOnly cookie
@@ -13,7 +13,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 from datetime import timedelta
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -51,6 +51,7 @@ INSTALLED_APPS = [
     "apps.cinemas",
     "apps.slots",
     "apps.bookings",
+    "apps.analytics",
 ]
 
 
@@ -66,6 +67,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.base.middleware.ReadOnlyRequestMiddleware",
 ]
 
 ROOT_URLCONF = "bookmyshow.urls"
@@ -91,17 +93,178 @@ WSGI_APPLICATION = "bookmyshow.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
+# Connections are either kept alive per worker thread (`DB_CONN_MAX_AGE`) or,
+# with `DB_POOL` enabled, handed out by psycopg's built-in connection pool.
+# Django does not allow persistent connections together with the pool.
+DB_POOL = config("DB_POOL", default=False, cast=bool)
+
+
+def database_config(host, port):
+    """
+    Builds a postgres connection config for the given host sharing the
+    credentials and connection management settings of the primary.
+    """
+
+    conn_max_age = 0 if DB_POOL else config("DB_CONN_MAX_AGE", default=60, cast=int)
+
+    database = {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": config("DB_NAME"),
         "USER": config("DB_USER"),
         "PASSWORD": config("DB_PASSWORD"),
-        "HOST": config("DB_HOST", default="localhost"),
-        "PORT": config("DB_PORT", default="5432"),
+        "HOST": host,
+        "PORT": port,
+        "CONN_MAX_AGE": conn_max_age,
+        "CONN_HEALTH_CHECKS": config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool),
+        "OPTIONS": {},
+    }
+
+    if DB_POOL:
+        database["OPTIONS"]["pool"] = {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            "timeout": config("DB_POOL_TIMEOUT", default=10, cast=int),
+        }
+
+    return database
+
+
+DATABASES = {
+    "default": database_config(
+        config("DB_HOST", default="localhost"), config("DB_PORT", default="5432")
+    ),
+}
+
+# Optional read replicas (comma separated hosts) used for read-only requests
+# by `PrimaryReplicaRouter`, registered as `replica_1`, `replica_2`, ...
+REPLICA_DATABASES = []
+
+for index, replica_host in enumerate(
+    config("DB_REPLICA_HOSTS", default="", cast=Csv()), start=1
+):
+    alias = f"replica_{index}"
+    DATABASES[alias] = database_config(
+        replica_host, config("DB_REPLICA_PORT", default="5432")
+    )
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    REPLICA_DATABASES.append(alias)
+
+# Seconds a user's reads stay on the primary after a successful write
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=10, cast=int)
+
+# Replicas lagging further behind than this are skipped
+REPLICA_MAX_LAG_SECONDS = config("REPLICA_MAX_LAG_SECONDS", default=5, cast=int)
+
+# Seconds between replica health checks, per worker process
+REPLICA_HEALTH_CHECK_INTERVAL = config(
+    "REPLICA_HEALTH_CHECK_INTERVAL", default=5, cast=int
+)
+
+DATABASE_ROUTERS = ["apps.base.routers.PrimaryReplicaRouter"]
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Shared between workers in production (e.g. redis), per process by default
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
     }
 }
 
+# Seconds a slot's remaining seat count is cached before being recounted
+SLOT_CAPACITY_CACHE_TIMEOUT = config(
+    "SLOT_CAPACITY_CACHE_TIMEOUT", default=300, cast=int
+)
+
+# Waiting room for high demand slots, users admitted to book per second
+WAITING_ROOM_ADMIT_RATE = config("WAITING_ROOM_ADMIT_RATE", default=5, cast=float)
+
+# Seconds an admitted user has to complete the booking
+WAITING_ROOM_ADMISSION_TTL = config("WAITING_ROOM_ADMISSION_TTL", default=300, cast=int)
+
+# Seconds the response to a request with an `Idempotency-Key` is replayed
+IDEMPOTENCY_KEY_TTL = config("IDEMPOTENCY_KEY_TTL", default=86400, cast=int)
+
+# Seconds a key stays locked while its first request is processed
+IDEMPOTENCY_LOCK_TIMEOUT = config("IDEMPOTENCY_LOCK_TIMEOUT", default=60, cast=int)
+
+# Transactional outbox, see `apps.base.outbox`
+OUTBOX_BATCH_SIZE = config("OUTBOX_BATCH_SIZE", default=100, cast=int)
+OUTBOX_MAX_ATTEMPTS = config("OUTBOX_MAX_ATTEMPTS", default=10, cast=int)
+OUTBOX_POLL_INTERVAL = config("OUTBOX_POLL_INTERVAL", default=1, cast=float)
+# Days delivered events are kept before `purge_outbox_events` deletes them
+OUTBOX_RETENTION_DAYS = config("OUTBOX_RETENTION_DAYS", default=7, cast=int)
+
+# Background tasks, see `apps.base.taskqueue` (manage.py run_workers)
+TASK_WORKER_CONCURRENCY = config("TASK_WORKER_CONCURRENCY", default=2, cast=int)
+TASK_POLL_INTERVAL = config("TASK_POLL_INTERVAL", default=1, cast=float)
+TASK_MAX_ATTEMPTS = config("TASK_MAX_ATTEMPTS", default=5, cast=int)
+# Seconds before the first retry of a failed task, doubled on every attempt
+TASK_RETRY_DELAY = config("TASK_RETRY_DELAY", default=10, cast=int)
+# Seconds after which a running task is considered lost with its worker
+TASK_TIMEOUT = config("TASK_TIMEOUT", default=600, cast=int)
+TASK_RETENTION_DAYS = config("TASK_RETENTION_DAYS", default=7, cast=int)
+TASK_HOUSEKEEPING_INTERVAL = 60
+
+# Task name -> interval in seconds
+PERIODIC_TASKS = {
+    "apps.users.tasks.purge_expired_tokens": 60 * 60,
+    "apps.base.tasks.purge_outbox_events": 60 * 60,
+    "apps.bookings.tasks.archive_past_slots": 60 * 60 * 24,
+    "apps.movies.tasks.refresh_now_showing_table": config(
+        "NOW_SHOWING_REFRESH_INTERVAL", default=5 * 60, cast=int
+    ),
+}
+
+# Movies per transaction when refreshing the now showing listing filter
+NOW_SHOWING_BATCH_SIZE = config("NOW_SHOWING_BATCH_SIZE", default=200, cast=int)
+
+# Slots shown more than this many days ago are moved, with their bookings
+# and seats, to the archive tables
+ARCHIVE_AFTER_DAYS = config("ARCHIVE_AFTER_DAYS", default=90, cast=int)
+ARCHIVE_BATCH_SIZE = config("ARCHIVE_BATCH_SIZE", default=500, cast=int)
+
+# Password hashing
+# https://docs.djangoproject.com/en/6.0/topics/auth/passwords/
+# New passwords are hashed with `PASSWORD_HASHER`, the other hashers only
+# verify existing hashes. Those are upgraded on the next successful login,
+# as are hashes made with different cost parameters.
+
+PASSWORD_HASHER = config("PASSWORD_HASHER", default="pbkdf2")
+
+PASSWORD_HASHER_CLASSES = {
+    "argon2": "apps.users.hashers.Argon2PasswordHasher",
+    "scrypt": "apps.users.hashers.ScryptPasswordHasher",
+    "pbkdf2": "apps.users.hashers.PBKDF2PasswordHasher",
+}
+
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(
+        hasher
+        for name, hasher in PASSWORD_HASHER_CLASSES.items()
+        if name != PASSWORD_HASHER
+    ),
+]
+
+# 0 keeps Django's iteration count, which also applies to any lower value
+PBKDF2_ITERATIONS = config("PBKDF2_ITERATIONS", default=0, cast=int)
+ARGON2_TIME_COST = config("ARGON2_TIME_COST", default=2, cast=int)
+ARGON2_MEMORY_COST = config("ARGON2_MEMORY_COST", default=102400, cast=int)
+ARGON2_PARALLELISM = config("ARGON2_PARALLELISM", default=8, cast=int)
+SCRYPT_WORK_FACTOR = config("SCRYPT_WORK_FACTOR", default=2**14, cast=int)
+
+# Threads per worker process allowed to hash passwords at once, and seconds
+# a login or registration waits for one of them before getting a 429
+PASSWORD_HASHING_CONCURRENCY = config(
+    "PASSWORD_HASHING_CONCURRENCY", default=2, cast=int
+)
+PASSWORD_HASHING_TIMEOUT = config("PASSWORD_HASHING_TIMEOUT", default=2, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -141,14 +304,55 @@ STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are stored under content hashed names, see `ContentHashedStorage`
+STORAGES = {
+    "default": {"BACKEND": "apps.base.storage.ContentHashedStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Media files are handed to the web server instead of being streamed by
+# Python when either is set: the internal nginx location MEDIA_ROOT is
+# aliased to (X-Accel-Redirect), or the header of apache/lighttpd
+# (e.g. X-Sendfile)
+MEDIA_ACCEL_REDIRECT_PREFIX = config("MEDIA_ACCEL_REDIRECT_PREFIX", default="")
+MEDIA_SENDFILE_HEADER = config("MEDIA_SENDFILE_HEADER", default="")
+
+# Seconds media files without a content hash in their name may be cached
+MEDIA_CACHE_MAX_AGE = config("MEDIA_CACHE_MAX_AGE", default=3600, cast=int)
+
+# Widths (px) of the WebP variants built in the background for uploaded
+# posters and profile pictures
+IMAGE_VARIANT_WIDTHS = config(
+    "IMAGE_VARIANT_WIDTHS", default="160,320,640", cast=Csv(int)
+)
+IMAGE_VARIANT_QUALITY = config("IMAGE_VARIANT_QUALITY", default=80, cast=int)
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication"
+        "apps.users.authentication.StatelessJWTAuthentication"
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson encoding and decoding, falling back to the stdlib without orjson
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.base.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.base.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_THROTTLE_CLASSES": ["apps.base.throttling.ScopedCacheThrottle"],
+    # Per user (or per IP when anonymous) rates of the `throttle_scope` of views
+    "DEFAULT_THROTTLE_RATES": {
+        "auth": config("THROTTLE_RATE_AUTH", default="10/min"),
+        "booking": config("THROTTLE_RATE_BOOKING", default="30/min"),
+        "seat_map": config("THROTTLE_RATE_SEAT_MAP", default="120/min"),
+        "listing": config("THROTTLE_RATE_LISTING", default="300/min"),
+    },
 }
 
 SIMPLE_JWT = {
@@ -157,8 +361,26 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_USER_CLASS": "apps.users.authentication.ClaimsUser",
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.TokenRefreshSerializer",
 }
 
+# Only consult the cache for blacklisted refresh tokens, skipping the
+# blacklist table. Requires a shared cache that does not evict entries.
+TOKEN_BLACKLIST_TRUST_CACHE = config(
+    "TOKEN_BLACKLIST_TRUST_CACHE", default=False, cast=bool
+)
+
+# Seconds a refresh token found not to be blacklisted is trusted from the
+# cache. With per-process caches, a token blacklisted meanwhile by another
+# process can be accepted for that long.
+TOKEN_BLACKLIST_CHECK_TIMEOUT = config(
+    "TOKEN_BLACKLIST_CHECK_TIMEOUT", default=30, cast=int
+)
+
+# Seconds the full user is cached for views using `CachedUserJWTAuthentication`
+AUTH_USER_CACHE_TIMEOUT = config("AUTH_USER_CACHE_TIMEOUT", default=60, cast=int)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "BookMyShow API",
     "DESCRIPTION": "API documentation for Movie Ticket Booking System",
@@ -16,15 +16,16 @@ Including another URLconf
 """
 
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
 
+from apps.base.views import MediaFileView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path(
@@ -47,11 +48,19 @@ urlpatterns = [
                 path("", include("apps.cinemas.urls")),
                 path("", include("apps.slots.urls")),
                 path("", include("apps.bookings.urls")),
+                path("", include("apps.analytics.urls")),
                 path("", include("apps.base.urls")),
             ]
         ),
     ),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# In production the web server should serve MEDIA_URL itself (or through
+# `MEDIA_ACCEL_REDIRECT_PREFIX`), this is the fallback
+urlpatterns += [
+    re_path(
+        rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$",
+        MediaFileView.as_view(),
+        name="media",
+    ),
+]